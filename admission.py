@@ -0,0 +1,186 @@
+"""
+Kabul kontrolü (admission control) - rota sınıfı başına eşzamanlılık sınırı,
+sınırlı bekleme kuyruğu ve aşımda hızlı 503 + Retry-After
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+
+# Rota sınıfları
+CLASS_READ = "read"        # Ucuz katalog/kullanıcı okumaları
+CLASS_WRITE = "write"      # Yerel yazmalar (silme, güncelleme, kayıt, okundu işaretleme)
+CLASS_LOOKUP = "lookup"    # Open Library sorgusu gerektiren eklemeler
+
+# Open Library sorgusu yapan ekleme / önbellek doldurma uç noktaları
+LOOKUP_PATHS = ("/books", "/admin/books", "/me/books", "/admin/authors/prefetch")
+
+# Sınırlandırılmayan yollar (sağlık kontrolü, statik dosyalar, dokümantasyon ve uzun
+# süre açık kalan SSE akışı; akış bir okuma slotunu bağlantı boyunca tutmamalıdır)
+EXEMPT_PATHS = ("/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/events")
+EXEMPT_PREFIXES = ("/static/", "/docs/")
+
+# FastAPI (pydantic) bool sorgu parametresi için doğru kabul ettiği değerler (büyük/küçük harf duyarsız)
+TRUE_VALUES = frozenset(("1", "true", "on", "yes", "t", "y"))
+
+
+def _query_flag(query_string: bytes, name: str) -> bool:
+    """Sorgu parametresini FastAPI'nin bool dönüşümüyle okur; tekrarlanırsa son değer geçerlidir"""
+    values = parse_qs(query_string.decode("latin-1"), keep_blank_values=True).get(name)
+    return bool(values) and values[-1].strip().lower() in TRUE_VALUES
+
+
+class RouteClassLimiter:
+    """Tek bir rota sınıfı için eşzamanlılık sınırı ve sınırlı FIFO bekleme kuyruğu
+
+    Yalnızca event loop içinden kullanılır; bu yüzden kilit gerekmez.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int,
+                 queue_timeout: float, retry_after: int):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self.admitted_count = 0
+        self.shed_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for fut in self._waiters if not fut.done())
+
+    async def acquire(self) -> bool:
+        """Slot alınabildiyse True; kuyruk dolu veya bekleme süresi dolduysa False"""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self.admitted_count += 1
+            return True
+        if self.queue_depth >= self.max_queue:
+            self.shed_count += 1
+            return False
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            # release() slotu doğrudan bu bekleyene devreder (in_flight değişmez)
+            await asyncio.wait_for(fut, self.queue_timeout)
+        except asyncio.TimeoutError:
+            # Süre dolmadan hemen önce devredilen slot kabul edilir
+            if not (fut.done() and not fut.cancelled()):
+                self.shed_count += 1
+                return False
+        except BaseException:
+            # Devredilen slotu almadan iptal edilen bekleyen slotu geri vermezse slot sızar
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+        finally:
+            try:
+                self._waiters.remove(fut)
+            except ValueError:
+                pass
+        self.admitted_count += 1
+        return True
+
+    def release(self):
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted_count,
+            "shed": self.shed_count,
+        }
+
+
+class AdmissionController:
+    """İstekleri rota sınıflarına ayırır ve her sınıfın limiter'ını yönetir"""
+
+    def __init__(self, limiters: Optional[Dict[str, RouteClassLimiter]] = None):
+        self.limiters = limiters or {
+            CLASS_READ: RouteClassLimiter(CLASS_READ, 64, 256, 1.0, 1),
+            CLASS_WRITE: RouteClassLimiter(CLASS_WRITE, 16, 64, 2.0, 2),
+            CLASS_LOOKUP: RouteClassLimiter(CLASS_LOOKUP, 8, 16, 2.0, 5),
+        }
+
+    @classmethod
+    def from_env(cls, prefix: str = "KUTUPHANE_ADMISSION_") -> 'AdmissionController':
+        """Ortam değişkenlerinden sınırları okur (ör. KUTUPHANE_ADMISSION_LOOKUP_CONCURRENCY=4)"""
+        controller = cls()
+        for name, limiter in controller.limiters.items():
+            key = prefix + name.upper() + "_"
+            try:
+                limiter.max_concurrent = max(1, int(os.environ.get(key + "CONCURRENCY", limiter.max_concurrent)))
+                limiter.max_queue = max(0, int(os.environ.get(key + "QUEUE", limiter.max_queue)))
+                limiter.queue_timeout = float(os.environ.get(key + "QUEUE_TIMEOUT", limiter.queue_timeout))
+            except ValueError:
+                pass
+        return controller
+
+    def classify(self, method: str, path: str, query_string: bytes = b"") -> Optional[str]:
+        """İsteğin rota sınıfını döndürür; sınırlandırılmayacaksa None"""
+        if path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+            return None
+        if method in ("GET", "HEAD"):
+            return CLASS_READ
+        if method == "POST" and path in LOOKUP_PATHS:
+            # async=true ile yalnızca kuyruğa yazılır; bu ucuz bir yerel yazmadır
+            if _query_flag(query_string, "async"):
+                return CLASS_WRITE
+            return CLASS_LOOKUP
+        return CLASS_WRITE
+
+    def snapshot(self) -> dict:
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware: sınıf limiti aşılırsa isteği işlemeden 503 döner"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.controller.classify(scope["method"], scope["path"], scope.get("query_string", b""))
+        limiter = self.controller.limiters.get(route_class) if route_class else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            await self._reject(send, limiter)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send, limiter: RouteClassLimiter):
+        body = ('{"detail":"Sunucu şu anda yoğun, lütfen daha sonra tekrar deneyin.",'
+                f'"route_class":"{limiter.name}"}}').encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(limiter.retry_after).encode()),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -2,27 +2,108 @@
 """
 Python 202 Bootcamp - Kütüphane Projesi
 Aşama 3: FastAPI ile Web Servisi
+
+Modül içe aktarılırken yalnızca uygulama ve rotalar kurulur; Library, UserManager ve iş
+kuyruğu ilk kullanımda ya da lifespan'de arka planda oluşturulur (bkz. lazy.py). Süreler
+python -m benchmarks.bench_startup ile ölçülür.
 """
 
-from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi import FastAPI, HTTPException, Header, Depends, Response, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from models import Library, UserManager
-import uvicorn
+from models import Library, UserManager, openlibrary_guard
+from storage import StorageProfile
+from jobs import JobQueue
+from admission import AdmissionController, AdmissionMiddleware
+from metrics import REGISTRY, MetricsMiddleware
+from tracing import SlowRequestLog, TracingMiddleware, traced_route_class
+from querylog import QUERY_LOG
+from memory import MemoryAccountant, SnapshotTracker, process_memory
+from profiling import RequestProfiler, ProfilingMiddleware, sample_stacks, collapsed_text
+from events import EventBroadcaster
+from export import EXPORTS, FORMATS, export_stream
+from importer import import_bytes_file
+from offline_index import OfflineIndex
+from isbn_validation import canonicalize
+from lazy import LazyComponent, warm_up
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from functools import partial
 import secrets
-from typing import Optional, Dict
+import hashlib
+import os
+import tempfile
+import time
+from typing import Optional, Dict, List, Tuple
+
+
+def _preload_httpx():
+    """İlk ISBN eklemesi httpx içe aktarımını beklemesin"""
+    import httpx  # noqa: F401
+
+
+def _start_job_queue():
+    _components["job_queue"].load().start()
+
+
+def _join(threads):
+    for thread in threads:
+        thread.join()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bileşenler arka planda ısıtılır, sunucu bu sırada bağlantı kabul eder. Kütüphane,
+    # kullanıcılar ve iş kuyruğu aynı veritabanına şema / göç yazdığından sırayla, httpx
+    # içe aktarımı onlarla paralel yürür. İş kuyruğu başlayınca yeniden başlatma öncesinden
+    # kalan bekleyen işleri işlemeye devam eder.
+    # KUTUPHANE_STARTUP_WAIT=1: ısıtma bitmeden istek kabul edilmez
+    warming = warm_up(
+        (_components["library"].load, _components["user_manager"].load, _start_job_queue),
+        (_preload_httpx,),
+    )
+    if os.environ.get("KUTUPHANE_STARTUP_WAIT") == "1":
+        await run_in_threadpool(_join, warming)
+    memory.start_monitor(float(os.environ.get("KUTUPHANE_MEMORY_CHECK_INTERVAL", "300")))
+    events.start()
+    yield
+    await events.stop()
+    memory.stop_monitor()
+    await run_in_threadpool(_join, warming)
+    if _components["job_queue"].loaded:
+        job_queue.stop()
 
 
 # FastAPI uygulamasını oluştur
 app = FastAPI(
     title="Kütüphane API",
     description="Python 202 Bootcamp Kütüphane Projesi - FastAPI ile Web Servisi",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Static dosyaları serve et
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# İsteğe bağlı cProfile profilleme (en içte; kurulmadıkça istek başına tek kontrol)
+request_profiler = RequestProfiler()
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+# Rota sınıfı başına eşzamanlılık sınırı; aşımda hızlı 503 + Retry-After
+admission = AdmissionController.from_env()
+app.add_middleware(AdmissionMiddleware, controller=admission)
+# Rota bazlı gecikme histogramları (en dışta; reddedilen istekler de ölçülür)
+app.add_middleware(MetricsMiddleware)
+# İstek başına span ağacı; eşiği aşan istekler JSONL yavaş istek günlüğüne yazılır
+# (KUTUPHANE_SLOW_REQUEST_MS, KUTUPHANE_SLOW_LOG, KUTUPHANE_TRACING=0 ile kapatılabilir)
+slow_log = SlowRequestLog.from_env()
+app.router.route_class = traced_route_class()
+app.add_middleware(TracingMiddleware, slow_log=slow_log, enabled=os.environ.get("KUTUPHANE_TRACING", "1") != "0",
+                   exclude_paths=("/events",))
+
+# Static dosyaları serve et (dizin ilk istekte denetlenir; içe aktarım çalışma dizinine bağlı değildir)
+app.mount("/static", StaticFiles(directory="static", check_dir=False), name="static")
+
+# Ekleme uç noktaları (ağ sorgusu) kontrol basamağını doğrular; okuma / silme uç noktaları
+# doğrulamadan önce kaydedilmiş kayıtlara erişilebilsin diye yalnızca uzunluğa bakar
+INVALID_ISBN_DETAIL = "Geçersiz ISBN formatı. ISBN 10 veya 13 haneli olmalı ve kontrol basamağı doğru olmalıdır."
 
 # Pydantic modelleri
 class ISBNRequest(BaseModel):
@@ -62,13 +143,155 @@ class BookUpdateRequest(BaseModel):
     title: Optional[str] = None
     author: Optional[str] = None
 
-# Library ve UserManager nesnelerini oluştur (varsayılan olarak SQLite kullan)
-library = Library(db_path="app.db")
-user_manager = UserManager(db_path="app.db")
+class AuthorPrefetchRequest(BaseModel):
+    keys: List[str]
+
+# Depolama profili KUTUPHANE_SQLITE_* ortam değişkenleri ile ayarlanabilir (WAL varsayılan)
+storage_profile = StorageProfile.from_env()
+# Veritabanı dosyası (testler geçici bir dosyaya yönlendirir)
+db_path = os.environ.get("KUTUPHANE_DB_PATH", "app.db")
+
+
+def _open_offline_index() -> Optional[OfflineIndex]:
+    # KUTUPHANE_OFFLINE_INDEX ile verilen döküm indeksi (bkz. offline_index.py) ağdan önce denenir
+    path = os.environ.get("KUTUPHANE_OFFLINE_INDEX")
+    return OfflineIndex.open(path) if path else None
+
+
+def _create_library(offline_index: LazyComponent) -> Library:
+    # Varsayılan olarak SQLite kullanılır; KUTUPHANE_CATALOG_STORE verilirse okuma yolları
+    # mmap'lenmiş sütun tabanlı katalogdan karşılanır
+    return Library(db_path=db_path, storage_profile=storage_profile,
+                   catalog_path=os.environ.get("KUTUPHANE_CATALOG_STORE") or None,
+                   offline_index=offline_index.load())
+
+
+def _create_user_manager(library: LazyComponent, offline_index: LazyComponent) -> UserManager:
+    # Kullanıcı listelerine eklenen ISBN'ler önce paylaşılan katalogdan çözülür
+    return UserManager(db_path=db_path, storage_profile=storage_profile, library=library,
+                       offline_index=offline_index.load())
+
+
+def _run_library_add_job(payload: dict) -> Optional[dict]:
+    book = library.add_book_by_isbn(payload["isbn"])
+    return book.to_dict() if book else None
+
+
+def _run_user_add_job(payload: dict) -> Optional[dict]:
+    return user_manager.add_book_to_user_by_isbn(payload["username"], payload["isbn"])
+
+
+def _create_job_queue(library: LazyComponent) -> JobQueue:
+    # ISBN ekleme işleri için kalıcı arka plan kuyruğu (?async=true ile kullanılır)
+    queue = JobQueue(library.storage, workers=int(os.environ.get("KUTUPHANE_JOB_WORKERS", "2")))
+    queue.register("library_add", _run_library_add_job)
+    queue.register("user_add", _run_user_add_job)
+    return queue
+
+
+# Bileşenler ilk erişimde oluşturulur. Fabrikalar vekilleri doğrudan alır; testlerde
+# api.library değiştirilse de kullanıcı yöneticisi ve iş kuyruğu asıl kataloğa bağlanır
+offline_index = LazyComponent("offline_index", _open_offline_index)
+library = LazyComponent("library", partial(_create_library, offline_index))
+user_manager = LazyComponent("user_manager", partial(_create_user_manager, library, offline_index))
+job_queue = LazyComponent("job_queue", partial(_create_job_queue, library))
+_components: Dict[str, LazyComponent] = {
+    "offline_index": offline_index,
+    "library": library,
+    "user_manager": user_manager,
+    "job_queue": job_queue,
+}
+
+# Katalog ve okuma listesi değişikliklerini SSE abonelerine iten yayıncı (GET /events)
+events = EventBroadcaster.from_env(library, user_manager)
 
 # Basit token yönetimi (in-memory). Üretim için JWT önerilir.
 active_tokens: Dict[str, str] = {}
 
+# SSE biletleri: bilet -> (kullanıcı, son geçerlilik). EventSource başlık gönderemediğinden
+# GET /events URL'sine oturum token'ı yerine tek kullanımlık, kısa ömürlü bilet yazılır
+SSE_TICKET_TTL = 30.0
+sse_tickets: Dict[str, Tuple[str, float]] = {}
+
+# Büyük bellek yapıları; KUTUPHANE_MEMORY_BUDGET_<YAPI>_MB ile bütçe tanımlanabilir
+memory = MemoryAccountant.from_env()
+# SQLite modunda kitaplar bellekte tutulmaz; katalog için mmap dosya boyutu raporlanır
+memory.register_measured("catalog", lambda: library.memory_usage())
+memory.register("users", lambda: user_manager.users)
+memory.register("metadata_cache", lambda: user_manager.resolver.cache._memory)
+memory.register("author_cache", lambda: library.authors._memory)
+memory.register("query_log", lambda: QUERY_LOG)
+memory.register("tokens", lambda: active_tokens)
+memory.register("sse_tickets", lambda: sse_tickets)
+memory_snapshots = SnapshotTracker()
+
+
+def _collect_runtime_metrics():
+    """/metrics isteği anında hesaplanan metrikler"""
+    stats = user_manager.resolver.stats
+    yield ("resolver_lookups_total", "counter", "ISBN çözümleme sayısı (karşılayan katmana göre)",
+           [({"tier": tier}, count) for tier, count in stats.items()])
+    served = stats["catalog"] + stats["cache"] + stats["offline"]
+    total = served + stats["network"] + stats["miss"]
+    yield ("resolver_local_hit_ratio", "gauge", "Ağa gitmeden (katalog + cache + çevrimdışı indeks) karşılanan isteklerin oranı",
+           [({}, served / total if total else 0.0)])
+    yield ("author_cache_lookups_total", "counter", "Yazar önbelleği sorguları (isabet / ıskalama)",
+           [({"result": result}, count) for result, count in library.authors.stats.items()])
+    snapshot = admission.snapshot()
+    yield ("admission_in_flight", "gauge", "Rota sınıfı başına işlenen istek sayısı",
+           [({"route_class": name}, s["in_flight"]) for name, s in snapshot.items()])
+    yield ("admission_queue_depth", "gauge", "Rota sınıfı başına bekleyen istek sayısı",
+           [({"route_class": name}, s["queue_depth"]) for name, s in snapshot.items()])
+    yield ("admission_shed_total", "counter", "Rota sınıfı başına 503 ile reddedilen istekler",
+           [({"route_class": name}, s["shed"]) for name, s in snapshot.items()])
+    breaker = openlibrary_guard.breaker.snapshot()
+    yield ("openlibrary_circuit_open", "gauge", "Open Library devre kesicisi açık mı (1) / değil mi (0)",
+           [({"state": breaker["state"]}, 0 if breaker["state"] == "closed" else 1)])
+    yield ("openlibrary_rejected_total", "counter", "Devre kesici tarafından reddedilen çağrılar",
+           [({}, breaker["rejected_count"])])
+    yield ("jobs", "gauge", "Arka plan işleri (duruma göre)",
+           [({"status": status}, count) for status, count in job_queue.counts().items()])
+
+
+REGISTRY.register_collector("api", _collect_runtime_metrics)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag ile eşleşiyor mu (zayıf karşılaştırma, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if cache_control.startswith("private"):
+        headers["Vary"] = "Authorization"
+    return Response(status_code=304, headers=headers)
+
+
+def _user_list_etag(username: str, suffix: str = "") -> str:
+    # Aynı tarayıcıda farklı kullanıcıların listeleri karışmasın diye kullanıcı özeti eklenir
+    user_key = hashlib.sha256(username.encode("utf-8")).hexdigest()[:12]
+    return f'"u{user_key}-{user_manager.list_version(username)}{suffix}"'
+
+
+def _set_user_cache_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
+
+
+def _accepted(job_id: str) -> JSONResponse:
+    """Kuyruğa alınan iş için 202 Accepted yanıtı"""
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "pending", "status_url": f"/jobs/{job_id}"},
+        headers={"Location": f"/jobs/{job_id}"},
+    )
+
 
 @app.get("/", tags=["Ana Sayfa"])
 async def root():
@@ -108,10 +331,20 @@ def require_admin(username: str = Depends(get_current_username)) -> str:
 
 
 @app.get("/books", response_model=list[BookResponse], tags=["Kitaplar"])
-async def get_books():
-    """Kütüphanedeki tüm kitapların listesini döndürür"""
+async def get_books(response: Response, if_none_match: Optional[str] = Header(default=None)):
+    """Kütüphanedeki tüm kitapların listesini döndürür
+
+    Katalog sürümünden türetilen ETag ile koşullu istek desteklenir; katalog
+    değişmediyse liste sorgulanmadan 304 döner.
+    """
     try:
-        books = library.get_books_as_dicts()
+        etag = f'"c{library.catalog_version()}"'
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag, "no-cache")
+        # Gövdeyle gönderilen ETag, gövdenin okunduğu kaynağın (katalog ya da SQLite) sürümüdür
+        version, books = library.books_snapshot()
+        response.headers["ETag"] = f'"c{version}"'
+        response.headers["Cache-Control"] = "no-cache"
         return books
     except Exception as e:
         raise HTTPException(
@@ -120,19 +353,31 @@ async def get_books():
         )
 
 
+@app.get("/books/changes", tags=["Kitaplar"])
+async def get_book_changes(since: int = Query(default=0, ge=0), limit: int = Query(default=1000, ge=1, le=10000)):
+    """Verilen katalog sürümünden sonraki eklemeleri, güncellemeleri ve silmeleri döndürür
+
+    Yerel katalog kopyası tutan istemciler tüm listeyi indirmek yerine son aldıkları
+    sürümle (GET /books ETag'i veya önceki yanıtın version alanı) eşitlenir.
+    reset=true ise GET /books ile tam eşitleme gerekir.
+    """
+    try:
+        return await run_in_threadpool(library.changes_since, since, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Değişiklikler listelenirken hata oluştu: {str(e)}")
+
+
 @app.post("/books", response_model=BookResponse, tags=["Kitaplar"])
-async def add_book(isbn_request: ISBNRequest):
-    """ISBN ile yeni kitap ekler"""
+async def add_book(isbn_request: ISBNRequest, async_mode: bool = Query(default=False, alias="async"),
+                   authorization: Optional[str] = Header(default=None)):
+    """ISBN ile yeni kitap ekler (async=true ile 202 ve iş kimliği döner; async için giriş gerekli)"""
     try:
         isbn = isbn_request.isbn.strip()
         # Kullanıcı tireli ISBN girse bile destekle
         
-        # ISBN formatını kontrol et
-        if not isbn or len(isbn.replace('-', '').replace(' ', '')) < 10:
-            raise HTTPException(
-                status_code=400,
-                detail="Geçersiz ISBN formatı. ISBN en az 10 karakter olmalıdır."
-            )
+        # ISBN formatını ve kontrol basamağını kontrol et (geçersiz ISBN ağa gönderilmez)
+        if canonicalize(isbn) is None:
+            raise HTTPException(status_code=400, detail=INVALID_ISBN_DETAIL)
         
         # Kitabın zaten var olup olmadığını kontrol et
         existing_book = library.find_book(isbn)
@@ -142,8 +387,14 @@ async def add_book(isbn_request: ISBNRequest):
                 detail=f"Bu ISBN ({isbn}) ile kitap zaten mevcut."
             )
         
+        if async_mode:
+            # İş durumu yalnızca işi gönderen kullanıcıya gösterilir; bu yüzden sahip gerekli
+            owner = get_current_username(authorization)
+            return _accepted(job_queue.enqueue("library_add", {"isbn": isbn, "username": owner}))
+        
         # Open Library API'den kitap bilgilerini çek ve ekle
-        book = library.add_book_by_isbn(isbn)
+        # (ağ çağrısı event loop'u bloklamasın diye thread havuzunda çalışır)
+        book = await run_in_threadpool(library.add_book_by_isbn, isbn)
         
         if book:
             return book.to_dict()
@@ -231,27 +482,251 @@ async def get_book(isbn: str):
         )
 
 
+@app.get("/authors/{name}/books", response_model=list[BookResponse], tags=["Kitaplar"])
+async def get_author_books(name: str):
+    """Yazarın katalogdaki kitaplarını başlık sırasıyla döndürür (tam ad eşleşmesi)"""
+    if not name.strip():
+        raise HTTPException(status_code=400, detail="Yazar adı boş olamaz.")
+    books = await run_in_threadpool(library.books_by_author, name)
+    if not books:
+        raise HTTPException(status_code=404, detail=f"{name.strip()} adlı yazarın kitabı bulunamadı.")
+    return [book.to_dict() for book in books]
+
+
 @app.get("/health", tags=["Sistem"])
 async def health_check():
     """API sağlık kontrolü"""
+    index = offline_index.load()
     return {
         "status": "healthy",
         "message": "Kütüphane API çalışıyor",
-        "total_books": len(library.list_books())
+        "total_books": library.count_books(),
+        # Open Library devre kesici durumu (closed / open / half_open)
+        "open_library": openlibrary_guard.snapshot(),
+        # Rota sınıfı başına aktif istek, kuyruk derinliği ve reddedilen istek sayıları
+        "admission": admission.snapshot(),
+        # Sütun tabanlı katalog okuma yollarını karşılıyor mu (eskiyse SQLite'a döner, arka planda tazelenir)
+        "catalog_store": library.catalog_status(),
+        # Çevrimdışı Open Library indeksi (KUTUPHANE_OFFLINE_INDEX)
+        "offline_index": index.status() if index is not None else None,
+        # Açık SSE bağlantıları ve yavaş okuma nedeniyle kapatılanlar
+        "events": events.snapshot(),
+        # Bileşen oluşturma süreleri (saniye; henüz oluşturulmadıysa null)
+        "startup": {name: component.load_seconds for name, component in _components.items()}
     }
 
 
+@app.post("/events/ticket", tags=["Sistem"])
+async def event_ticket(username: str = Depends(get_current_username)):
+    """GET /events için tek kullanımlık, kısa ömürlü (SSE_TICKET_TTL sn) bilet verir
+
+    Oturum token'ı URL'de taşınırsa erişim ve proxy günlüklerine yazılır; bilet yalnızca
+    bir akış açmaya yarar ve kullanıldığı anda geçersiz olur.
+    """
+    now = time.monotonic()
+    for expired in [t for t, (_, expires) in sse_tickets.items() if expires <= now]:
+        sse_tickets.pop(expired, None)
+    ticket = secrets.token_urlsafe(24)
+    sse_tickets[ticket] = (username, now + SSE_TICKET_TTL)
+    return {"ticket": ticket, "expires_in": SSE_TICKET_TTL}
+
+
+@app.get("/events", tags=["Sistem"])
+async def event_stream(since: Optional[int] = Query(default=None, ge=0), ticket: Optional[str] = None,
+                       last_event_id: Optional[str] = Header(default=None)):
+    """Katalog ve okuma listesi değişikliklerini Server-Sent Events olarak iter
+
+    EventSource başlık gönderemediğinden kullanıcı olayları için POST /events/ticket
+    ile alınan tek kullanımlık bilet sorgu parametresi ile verilir. Yeniden bağlanmada
+    Last-Event-ID başlığındaki katalog sürümünden itibaren kaçırılan değişiklikler
+    tekrar gönderilir.
+    """
+    username = None
+    if ticket:
+        username, expires = sse_tickets.pop(ticket, (None, 0.0))
+        if not username or expires <= time.monotonic():
+            raise HTTPException(status_code=401, detail="Geçersiz veya süresi dolmuş bilet")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if events.subscriber_count >= events.max_subscribers:
+        raise HTTPException(status_code=503, detail="Çok fazla açık olay bağlantısı", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        events.stream(username, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Sistem"])
+async def metrics():
+    """Prometheus metin formatında metrikler"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/admin/slow-requests", tags=["Admin"])
+async def admin_slow_requests(limit: int = 20, username: str = Depends(require_admin)):
+    """Yavaş istek günlüğündeki son kayıtlar (span ağaçları ile)"""
+    return {"threshold_ms": slow_log.threshold_ms, "requests": slow_log.tail(limit)}
+
+
+@app.get("/admin/queries", tags=["Admin"])
+async def admin_queries(top: int = 10, username: str = Depends(require_admin)):
+    """Toplam süreye göre en pahalı SQL ifadeleri ve eşiği aşan sorgular (EXPLAIN QUERY PLAN ile)"""
+    return {
+        "slow_threshold_ms": QUERY_LOG.slow_threshold_ms,
+        "top": QUERY_LOG.top(top),
+        "slow": QUERY_LOG.slow(),
+    }
+
+
+@app.post("/admin/profile/requests", tags=["Admin"])
+async def admin_profile_requests_start(count: int = Query(default=10, ge=1, le=1000),
+                                       username: str = Depends(require_admin)):
+    """Sonraki N isteği cProfile ile profillemeye başlar (önceki sonuç silinir)
+
+    Event loop thread'i ve isteğin thread havuzu işleri profillenir; istek beklerken
+    loop'ta çalışan başka isteklerin kodu da rapora girebilir (yanıttaki scope alanı).
+    """
+    request_profiler.arm(count)
+    return request_profiler.status()
+
+
+@app.get("/admin/profile/requests", tags=["Admin"])
+async def admin_profile_requests_result(format: str = Query(default="text", pattern="^(text|pstats)$"),
+                                        sort: str = Query(default="cumulative", pattern="^(cumulative|tottime|calls|ncalls)$"),
+                                        limit: int = Query(default=50, ge=1, le=500),
+                                        username: str = Depends(require_admin)):
+    """Profil sonucu: durum + metin rapor ya da pstats dosyası (format=pstats)"""
+    if format == "pstats":
+        data = request_profiler.pstats_bytes()
+        if not data:
+            raise HTTPException(status_code=404, detail="Henüz profil verisi yok")
+        return Response(content=data, media_type="application/octet-stream",
+                        headers={"Content-Disposition": 'attachment; filename="requests.pstats"'})
+    return {**request_profiler.status(), "report": request_profiler.text_report(sort, limit)}
+
+
+@app.get("/admin/profile/sample", response_class=PlainTextResponse, tags=["Admin"])
+async def admin_profile_sample(seconds: float = Query(default=5.0, gt=0, le=60),
+                               interval_ms: float = Query(default=5.0, ge=1, le=1000),
+                               username: str = Depends(require_admin)):
+    """Süreci N saniye örnekler; flamegraph için collapsed-stack metni döner"""
+    # Örnekleyici ayrı thread'de çalışır; olay döngüsü bu sırada trafiğe hizmet vermeye devam eder
+    counts = await run_in_threadpool(sample_stacks, seconds, interval_ms / 1000.0)
+    return PlainTextResponse(collapsed_text(counts))
+
+
+@app.get("/admin/memory", tags=["Admin"])
+async def admin_memory(username: str = Depends(require_admin)):
+    """Süreç RSS değeri ve büyük yapıların boyut tahminleri (bütçeleri ile)"""
+    structures = await run_in_threadpool(memory.measure)
+    return {
+        "process": process_memory(),
+        "structures": structures,
+        "tracemalloc": memory_snapshots.tracing,
+    }
+
+
+@app.post("/admin/memory/snapshot", tags=["Admin"])
+async def admin_memory_snapshot(limit: int = Query(default=20, ge=1, le=200),
+                                username: str = Depends(require_admin)):
+    """tracemalloc anlık görüntüsü; ilk çağrı izlemeyi başlatır, sonrakiler öncekiyle farkı döndürür"""
+    return await run_in_threadpool(memory_snapshots.snapshot, limit)
+
+
+@app.delete("/admin/memory/snapshot", tags=["Admin"])
+async def admin_memory_snapshot_stop(username: str = Depends(require_admin)):
+    """tracemalloc izlemesini kapatır"""
+    memory_snapshots.stop()
+    return {"tracemalloc": False}
+
+
+@app.post("/admin/catalog/rebuild", tags=["Admin"])
+async def admin_catalog_rebuild(username: str = Depends(require_admin)):
+    """Sütun tabanlı katalog dosyasını books tablosundan yeniden üretir"""
+    if not library.catalog_path:
+        raise HTTPException(status_code=409, detail="Sütun tabanlı katalog etkin değil (KUTUPHANE_CATALOG_STORE)")
+    catalog = await run_in_threadpool(library.rebuild_catalog)
+    if catalog is None:
+        raise HTTPException(status_code=500, detail="Katalog oluşturulamadı")
+    return {"books": len(catalog), "version": catalog.version, "bytes": catalog.nbytes}
+
+
+@app.post("/admin/books/changes/compact", tags=["Admin"])
+async def admin_compact_book_changes(retain: int = Query(default=10000, ge=0),
+                                     username: str = Depends(require_admin)):
+    """Son `retain` katalog sürümünden eski silme kayıtlarını (mezar taşları) temizler"""
+    return await run_in_threadpool(library.compact_changes, retain)
+
+
+@app.post("/admin/authors/prefetch", tags=["Admin"])
+async def admin_prefetch_authors(payload: AuthorPrefetchRequest, username: str = Depends(require_admin)):
+    """Open Library yazar anahtarlarını (/authors/OL..A) yazar önbelleğine toplu olarak yükler"""
+    if len(payload.keys) > 1000:
+        raise HTTPException(status_code=400, detail="Tek istekte en fazla 1000 yazar anahtarı gönderilebilir.")
+    return await run_in_threadpool(library.prefetch_authors, payload.keys)
+
+
+@app.get("/admin/export/{table}", tags=["Admin"])
+async def admin_export(table: str, format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+                       chunk_size: int = Query(default=1000, ge=1, le=50000),
+                       username: str = Depends(require_admin)):
+    """books, users veya user_books tablosunu NDJSON / CSV olarak akış halinde dışa aktarır
+
+    Satırlar ayrı bir salt-okunur bağlantıdaki imleçten parça parça okunur; yanıt
+    tamamı bellekte oluşturulmadan gönderilir.
+    """
+    if table not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen tablo: {table}")
+    storage = library.storage if table == "books" else user_manager.storage
+    if storage is None:
+        raise HTTPException(status_code=409, detail="Dışa aktarım yalnızca SQLite modunda desteklenir")
+    return StreamingResponse(
+        export_stream(storage, table, format, chunk_size),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
+
+
+@app.post("/admin/import", tags=["Admin"])
+async def admin_import(request: Request, format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+                       dry_run: bool = Query(default=False), batch_size: int = Query(default=100_000, ge=1000),
+                       username: str = Depends(require_admin)):
+    """İstek gövdesindeki CSV / NDJSON dosyasını Open Library'ye gitmeden kataloğa aktarır
+
+    Gövde bellekte tutulmadan geçici dosyaya yazılır, içe aktarım thread havuzunda çalışır.
+    """
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            report = await run_in_threadpool(import_bytes_file, library, spool, format,
+                                             batch_size=batch_size, dry_run=dry_run)
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Dosya UTF-8 olarak okunamadı")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    events.wake()
+    return report
+
+
 # Admin: Kütüphane kitap işlemleri (yetki gerekli)
 @app.post("/admin/books", response_model=BookResponse, tags=["Admin"])
-async def admin_add_book(isbn_request: ISBNRequest, username: str = Depends(require_admin)):
+async def admin_add_book(isbn_request: ISBNRequest, username: str = Depends(require_admin),
+                         async_mode: bool = Query(default=False, alias="async")):
     try:
         isbn = isbn_request.isbn.strip()
-        if not isbn or len(isbn.replace('-', '').replace(' ', '')) < 10:
-            raise HTTPException(status_code=400, detail="Geçersiz ISBN formatı. ISBN en az 10 karakter olmalıdır.")
+        if canonicalize(isbn) is None:
+            raise HTTPException(status_code=400, detail=INVALID_ISBN_DETAIL)
         existing_book = library.find_book(isbn)
         if existing_book:
             raise HTTPException(status_code=409, detail=f"Bu ISBN ({isbn}) ile kitap zaten mevcut.")
-        book = library.add_book_by_isbn(isbn)
+        if async_mode:
+            return _accepted(job_queue.enqueue("library_add", {"isbn": isbn, "username": username}))
+        book = await run_in_threadpool(library.add_book_by_isbn, isbn)
         if book:
             return book.to_dict()
         else:
@@ -293,6 +768,23 @@ async def admin_update_book(isbn: str, payload: BookUpdateRequest, username: str
         raise HTTPException(status_code=500, detail=f"Kitap güncellenirken beklenmeyen hata oluştu: {str(e)}")
 
 
+@app.get("/jobs/{job_id}", tags=["Sistem"])
+async def get_job(job_id: str, username: str = Depends(get_current_username)):
+    """Arka plan işinin durumunu döndürür (pending / running / done / failed)"""
+    job = job_queue.get(job_id)
+    # Başka kullanıcının işi de "bulunamadı" döner; iş kimliklerinin varlığı sızdırılmaz
+    if not job or job["payload"].get("username") != username:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "attempts": job["attempts"],
+    }
+
+
 # Kimlik Doğrulama
 @app.post("/auth/login", response_model=LoginResponse, tags=["Kimlik"])
 async def login(payload: LoginRequest):
@@ -337,27 +829,43 @@ async def get_current_user_info(username: str = Depends(get_current_username)):
 
 # Kullanıcı Kitap Listesi
 @app.get("/me/books", response_model=list[UserBookResponse], tags=["Kullanıcı"])
-async def me_list_books(username: str = Depends(get_current_username)):
+async def me_list_books(response: Response, username: str = Depends(get_current_username),
+                        if_none_match: Optional[str] = Header(default=None)):
     try:
+        etag = _user_list_etag(username)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag, "private, no-cache")
+        _set_user_cache_headers(response, etag)
         return user_manager.list_user_books(username)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Kullanıcı kitapları listelenirken hata: {e}")
 
 @app.get("/me/books/read", response_model=list[UserBookResponse], tags=["Kullanıcı"])
-async def me_list_read_books(username: str = Depends(get_current_username)):
+async def me_list_read_books(response: Response, username: str = Depends(get_current_username),
+                             if_none_match: Optional[str] = Header(default=None)):
     try:
+        etag = _user_list_etag(username, "r")
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag, "private, no-cache")
+        _set_user_cache_headers(response, etag)
         return user_manager.list_user_read_books(username)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Okunan kitaplar listelenirken hata: {e}")
 
 @app.post("/me/books", response_model=UserBookResponse, tags=["Kullanıcı"])
-async def me_add_book(payload: UserBookRequest, username: str = Depends(get_current_username)):
+async def me_add_book(payload: UserBookRequest, response: Response, username: str = Depends(get_current_username),
+                      async_mode: bool = Query(default=False, alias="async")):
     isbn = payload.isbn.strip()
-    if not isbn or len(isbn.replace('-', '').replace(' ', '')) < 10:
-        raise HTTPException(status_code=400, detail="Geçersiz ISBN formatı. ISBN en az 10 karakter olmalıdır.")
-    added = user_manager.add_book_to_user_by_isbn(username, isbn)
+    if canonicalize(isbn) is None:
+        raise HTTPException(status_code=400, detail=INVALID_ISBN_DETAIL)
+    if async_mode:
+        return _accepted(job_queue.enqueue("user_add", {"username": username, "isbn": isbn}))
+    added = await run_in_threadpool(user_manager.add_book_to_user_by_isbn, username, isbn)
     if not added:
         raise HTTPException(status_code=404, detail="Kitap bulunamadı veya zaten mevcut")
+    # Kitap bilgisinin hangi katmandan geldiği (catalog / cache / offline / network)
+    if added.get("source"):
+        response.headers["X-Book-Source"] = added["source"]
     return added
 
 @app.delete("/me/books/{isbn}", tags=["Kullanıcı"])
@@ -385,4 +893,5 @@ async def me_mark_unread(isbn: str, username: str = Depends(get_current_username
 
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
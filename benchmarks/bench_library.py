@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Library / UserManager performans ölçümleri (JSON ve SQLite modları)
+
+Sentetik kataloglar (varsayılan 1k ve 100k kitap) ve büyük okuma listesine sahip bir
+kullanıcı üzerinde temel işlemleri zamanlar. Sonuçlar JSON olarak yazılabilir; eşik
+dosyası ve/veya önceki bir çalıştırma ile karşılaştırılarak gerileme tespit edilir.
+
+Kullanım:
+    python -m benchmarks.bench_library --sizes 1000,100000 --output sonuc.json
+    python -m benchmarks.bench_library --sizes 1000000 --backends sqlite
+    python -m benchmarks.bench_library --baseline onceki.json --max-regression 0.25
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from models import Book, Library, User, UserBook, UserManager
+
+
+BENCH_USER = "okur"
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+
+def _isbn(i: int) -> str:
+    return str(9780000000000 + i)
+
+
+def _catalog_rows(size: int):
+    for i in range(size):
+        yield (f"Kitap Başlığı {i:07d}", f"Yazar {i % 5000}", _isbn(i))
+
+
+def _seed_json(workdir: str, size: int, reading_list: int):
+    with open(os.path.join(workdir, "library.json"), "w", encoding="utf-8") as f:
+        json.dump([{"title": t, "author": a, "isbn": i} for t, a, i in _catalog_rows(size)], f, ensure_ascii=False)
+    books = [UserBook(Book(t, a, i)) for t, a, i in _catalog_rows(reading_list)]
+    user = User(BENCH_USER, "-", books=books)
+    with open(os.path.join(workdir, "users.json"), "w", encoding="utf-8") as f:
+        json.dump([user.to_dict()], f, ensure_ascii=False)
+
+
+def _seed_sqlite(workdir: str, size: int, reading_list: int):
+    db_path = os.path.join(workdir, "app.db")
+    # Tablolar uygulamanın kendi şeması ile oluşturulur, satırlar toplu eklenir
+    library = Library(os.path.join(workdir, "library.json"), db_path=db_path)
+    users = UserManager(os.path.join(workdir, "users.json"), db_path=db_path)
+    with library._get_conn() as conn:
+        conn.executemany("INSERT INTO books (title, author, isbn) VALUES (?, ?, ?)", _catalog_rows(size))
+        conn.execute("INSERT INTO users (username, password_hash, role) VALUES (?, '-', 'user')", (BENCH_USER,))
+        conn.executemany(
+            "INSERT INTO user_books (username, title, author, isbn, is_read) VALUES (?, ?, ?, ?, 0)",
+            ((BENCH_USER, t, a, i) for t, a, i in _catalog_rows(reading_list)),
+        )
+    library.storage.close()
+    users.storage.close()
+
+
+def _open(backend: str, workdir: str):
+    if backend == "sqlite":
+        db_path = os.path.join(workdir, "app.db")
+        return (Library(os.path.join(workdir, "library.json"), db_path=db_path),
+                UserManager(os.path.join(workdir, "users.json"), db_path=db_path))
+    return (Library(os.path.join(workdir, "library.json")),
+            UserManager(os.path.join(workdir, "users.json")))
+
+
+def _time(fn: Callable[[int], object], iterations: int) -> dict:
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def bench_backend(backend: str, size: int, iterations: int = 50, write_iterations: int = 10,
+                  heavy_iterations: int = 3, reading_list: Optional[int] = None, seed: int = 42) -> List[dict]:
+    """Tek bir depolama modu ve katalog boyutu için tüm işlemleri zamanlar"""
+    reading_list = reading_list if reading_list is not None else min(size, 10_000)
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+    try:
+        (_seed_sqlite if backend == "sqlite" else _seed_json)(workdir, size, reading_list)
+        started = time.perf_counter()
+        library, users = _open(backend, workdir)
+        load_ms = (time.perf_counter() - started) * 1000.0
+
+        existing = [_isbn(rng.randrange(size)) for _ in range(max(iterations, write_iterations))]
+        reading = [_isbn(rng.randrange(reading_list)) for _ in range(iterations)] if reading_list else []
+        added = [_isbn(size + i) for i in range(write_iterations)]
+
+        ops: Dict[str, dict] = {
+            "add_book": _time(lambda i: library.add_book(Book(f"Yeni Kitap {i}", "Yeni Yazar", added[i])),
+                              write_iterations),
+            "update_book": _time(lambda i: library.update_book(existing[i], title=f"Güncel Başlık {i}"),
+                                 write_iterations),
+            "find_book": _time(lambda i: library.find_book(existing[i]), iterations),
+            "list_books": _time(lambda i: library.list_books(), heavy_iterations),
+            "remove_book": _time(lambda i: library.remove_book(added[i]), write_iterations),
+            "list_user_books": _time(lambda i: users.list_user_books(BENCH_USER), heavy_iterations),
+        }
+        if reading:
+            ops["mark_user_book_read"] = _time(
+                lambda i: users.mark_user_book_read(BENCH_USER, reading[i], is_read=i % 2 == 0), iterations)
+
+        if library.storage:
+            library.storage.close()
+        if users.storage:
+            users.storage.close()
+        results = [{"backend": backend, "size": size, "op": "load", "iterations": 1,
+                    "mean_ms": round(load_ms, 4), "median_ms": round(load_ms, 4),
+                    "p95_ms": round(load_ms, 4), "max_ms": round(load_ms, 4)}]
+        results.extend({"backend": backend, "size": size, "op": op, **stats} for op, stats in ops.items())
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run(sizes=(1000, 100_000), backends=("json", "sqlite"), **kwargs) -> dict:
+    results = []
+    for size in sizes:
+        for backend in backends:
+            results.extend(bench_backend(backend, size, **kwargs))
+    return {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "created_at": time.time(),
+        "results": results,
+    }
+
+
+def _key(entry: dict) -> str:
+    return f"{entry['backend']}/{entry['op']}/{entry['size']}"
+
+
+def check_regressions(report: dict, thresholds: Optional[dict] = None, baseline: Optional[dict] = None,
+                      max_regression: float = 0.25) -> List[str]:
+    """Eşikleri aşan veya önceki çalıştırmaya göre yavaşlayan işlemleri döndürür
+
+    thresholds: {"sqlite/find_book/1000": {"median_ms": 1.0}, ...} (mutlak sınırlar)
+    baseline: önceki run() çıktısı; median_ms değeri max_regression oranından fazla
+    artan işlemler gerileme sayılır.
+    """
+    failures = []
+    previous = {_key(e): e for e in (baseline or {}).get("results", [])}
+    for entry in report["results"]:
+        key = _key(entry)
+        for metric, limit in (thresholds or {}).get(key, {}).items():
+            if entry.get(metric, 0) > limit:
+                failures.append(f"{key}: {metric}={entry[metric]} > eşik {limit}")
+        before = previous.get(key)
+        # Çok kısa işlemlerde ölçüm gürültüsü oranı bozar; 0.05 ms altı karşılaştırılmaz
+        if before and before["median_ms"] >= 0.05 and entry["median_ms"] > before["median_ms"] * (1 + max_regression):
+            failures.append(f"{key}: median_ms {before['median_ms']} -> {entry['median_ms']} "
+                            f"(%{(entry['median_ms'] / before['median_ms'] - 1) * 100:.0f})")
+    return failures
+
+
+def _print_table(report: dict):
+    print(f"{'mod':<7} {'boyut':>9} {'işlem':<20} {'median ms':>11} {'p95 ms':>11} {'n':>4}")
+    for e in report["results"]:
+        print(f"{e['backend']:<7} {e['size']:>9} {e['op']:<20} {e['median_ms']:>11.3f} {e['p95_ms']:>11.3f} {e['iterations']:>4}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Library / UserManager performans ölçümleri")
+    parser.add_argument("--sizes", default="1000,100000", help="Virgülle ayrılmış katalog boyutları (ör. 1000,100000,1000000)")
+    parser.add_argument("--backends", default="json,sqlite")
+    parser.add_argument("--iterations", type=int, default=50, help="Hafif işlemler için tekrar sayısı")
+    parser.add_argument("--write-iterations", type=int, default=10, help="Ekleme/güncelleme/silme tekrar sayısı")
+    parser.add_argument("--heavy-iterations", type=int, default=3, help="Tam listeleme tekrar sayısı")
+    parser.add_argument("--reading-list", type=int, default=None, help="Kullanıcı okuma listesi boyutu (varsayılan min(boyut, 10000))")
+    parser.add_argument("--output", help="Sonuçları JSON dosyasına yaz")
+    parser.add_argument("--json", action="store_true", help="Sonuçları stdout'a JSON olarak yaz")
+    parser.add_argument("--thresholds", default=None, help=f"Mutlak eşik dosyası (örn. {DEFAULT_THRESHOLDS})")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="İzin verilen median artış oranı")
+    args = parser.parse_args(argv)
+
+    report = run(
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        backends=[b for b in args.backends.split(",") if b],
+        iterations=args.iterations,
+        write_iterations=args.write_iterations,
+        heavy_iterations=args.heavy_iterations,
+        reading_list=args.reading_list,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_table(report)
+
+    thresholds = None
+    if args.thresholds:
+        with open(args.thresholds, "r", encoding="utf-8") as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = check_regressions(report, thresholds, baseline, args.max_regression)
+    for failure in failures:
+        print(f"GERİLEME: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Bellek karşılaştırması: kitap başına bayt (eski __dict__ tabanlı sınıflar vs __slots__)
+
+Kullanım:
+    python -m benchmarks.bench_memory [--books 100000] [--authors 2000] [--json]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable, List
+
+from models import Book, UserBook
+
+
+class LegacyBook:
+    """Önceki Book temsili (örnek başına __dict__)"""
+
+    def __init__(self, title: str, author: str, isbn: str):
+        self.title = title
+        self.author = author
+        self.isbn = isbn
+
+
+class LegacyUserBook:
+    """Önceki UserBook temsili (__dict__ tabanlı; __dict__ tabanlı bir Book nesnesini sarar)"""
+
+    def __init__(self, book: LegacyBook, is_read: bool = False):
+        self.book = book
+        self.is_read = is_read
+
+
+def _records(count: int, authors: int) -> List[dict]:
+    # JSON'dan yükleme gibi: her kayıt kendi yazar string'ine sahip olur
+    data = [
+        {"title": f"Kitap Başlığı {i}", "author": f"Yazar Adı Soyadı {i % authors}", "isbn": f"{9780000000000 + i}"}
+        for i in range(count)
+    ]
+    return json.loads(json.dumps(data))
+
+
+def _measure(count: int, authors: int, build: Callable[[dict], object]) -> int:
+    """Kayıtlar bırakıldıktan sonra nesne listesinin tuttuğu bellek (bayt)
+
+    Başlık/ISBN string'leri iki temsilde de aynıdır; fark nesne yükünden ve
+    yazar string'lerinin kayıt başına kopyalanmasından gelir.
+    """
+    gc.collect()
+    tracemalloc.start()
+    records = _records(count, authors)
+    objects = [build(r) for r in records]
+    del records
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return retained
+
+
+def _legacy_book(data: dict) -> LegacyBook:
+    return LegacyBook(data["title"], data["author"], data["isbn"])
+
+
+def run(count: int = 100_000, authors: int = 2000) -> dict:
+    builders = {
+        "book_legacy": _legacy_book,
+        "book_compact": Book.from_dict,
+        "user_book_legacy": lambda r: LegacyUserBook(_legacy_book(r)),
+        "user_book_compact": UserBook.from_dict,
+    }
+    results = {"books": count, "authors": authors, "bytes_per_book": {}}
+    for key, build in builders.items():
+        results["bytes_per_book"][key] = round(_measure(count, authors, build) / count, 1)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kitap başına bellek kullanımı karşılaştırması")
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--authors", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="Makine tarafından okunabilir çıktı")
+    args = parser.parse_args(argv)
+
+    results = run(args.books, args.authors)
+    if args.json:
+        print(json.dumps(results))
+        return
+    per_book = results["bytes_per_book"]
+    print(f"{results['books']} kitap, {results['authors']} farklı yazar")
+    print(f"Book      : {per_book['book_legacy']:>8} -> {per_book['book_compact']:>8} bayt/kitap")
+    print(f"UserBook  : {per_book['user_book_legacy']:>8} -> {per_book['user_book_compact']:>8} bayt/kitap")
+
+
+if __name__ == "__main__":
+    main()
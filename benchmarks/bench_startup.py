@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+API süreci başlangıç ölçümleri - içe aktarma, lifespan ve ilk istek süreleri
+
+Her çalıştırma mevcut bir veritabanı bulunan geçici dizinde temiz bir alt süreçte yapılır
+(işçi süreçlerinin ölçeklenirken yaşadığı durum):
+- import_ms        : `import api`
+- ready_ms         : lifespan başlangıcı (işçinin bağlantı kabul etmeye başlaması)
+- first_request_ms : hazır olduktan sonraki ilk GET /health yanıtı (bileşen oluşturma dahil)
+Ek bir çalıştırma `-X importtime` ile yapılır; en pahalı modüller ve api'nin doğrudan
+içe aktardıkları kümülatif süreye göre raporlanır. Bütçe dosyası verilirse medyan süreler
+ve içe aktarımda yüklenmemesi gereken modüller denetlenir; aşımda çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.bench_startup --runs 5 --books 100000
+    python -m benchmarks.bench_startup --wait    # KUTUPHANE_STARTUP_WAIT=1 ile karşılaştırma
+    python -m benchmarks.bench_startup --budget benchmarks/startup_budget.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.bench_library import _seed_sqlite
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(os.path.dirname(__file__), "startup_budget.json")
+PHASES = ("import_ms", "ready_ms", "first_request_ms", "total_ms")
+# İçe aktarma sırasında yüklenip yüklenmediği raporlanan ağır modüller
+WATCHED_MODULES = ("httpx", "httpcore", "uvicorn")
+
+# Alt süreçte çalışan ölçüm betiği; son satırda JSON yazar
+_CHILD = r"""
+import asyncio, json, os, sys, time
+wal_before = os.path.exists("app.db-wal")
+started = time.perf_counter()
+import api
+imported = time.perf_counter()
+loaded = [name for name in WATCHED if name in sys.modules]
+db_opened = (os.path.exists("app.db-wal") and not wal_before) or any(c.loaded for c in api._components.values())
+
+
+async def get(path):
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1),
+             "server": ("bench", 80)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await api.app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def main():
+    async with api.app.router.lifespan_context(api.app):
+        ready = time.perf_counter()
+        status = await get("/health")
+        first = time.perf_counter()
+    return ready, first, status
+
+
+ready, first, status = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000.0,
+    "ready_ms": (ready - imported) * 1000.0,
+    "first_request_ms": (first - ready) * 1000.0,
+    "total_ms": (first - started) * 1000.0,
+    "status": status,
+    "watched_modules": loaded,
+    "db_opened_on_import": db_opened,
+    "components": {name: c.load_seconds for name, c in api._components.items()},
+}))
+"""
+
+
+def _child_env(wait: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (REPO_ROOT, env.get("PYTHONPATH")) if p)
+    env.pop("KUTUPHANE_STARTUP_WAIT", None)
+    if wait:
+        env["KUTUPHANE_STARTUP_WAIT"] = "1"
+    return env
+
+
+def _run_child(workdir: str, env: Dict[str, str], importtime: bool = False):
+    """Tek bir ölçüm süreci çalıştırır; (sonuç, importtime satırları) döndürür"""
+    script = f"WATCHED = {WATCHED_MODULES!r}\n{_CHILD}"
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", script]
+    proc = subprocess.run(args, cwd=workdir, env=env, capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Başlangıç ölçümü başarısız:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr.splitlines()
+
+
+def parse_importtime(lines: List[str]) -> List[dict]:
+    """`-X importtime` satırlarını {module, depth, self_ms, cumulative_ms} listesine çevirir"""
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        entries.append({
+            "module": name.strip(),
+            # Ad sütunu bir boşlukla başlar, her iç içe seviye iki boşluk ekler
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(parts[0]) / 1000.0,
+            "cumulative_ms": int(parts[1]) / 1000.0,
+        })
+    return entries
+
+
+def summarize_importtime(entries: List[dict], module: str = "api", top: int = 15) -> dict:
+    """Modülün toplam içe aktarma süresi, doğrudan içe aktardıkları ve en pahalı modüller"""
+    root = next((i for i, e in enumerate(entries) if e["module"] == module and e["depth"] == 0), None)
+    if root is None:
+        return {"cumulative_ms": None, "direct": [], "top": []}
+    # Alt modüller üst modülden önce yazılır; kökün alt ağacı ondan önceki kesintisiz derin satırlardır
+    start = root
+    while start > 0 and entries[start - 1]["depth"] > 0:
+        start -= 1
+    subtree = entries[start:root]
+    fields = ("module", "self_ms", "cumulative_ms")
+    direct = sorted((e for e in subtree if e["depth"] == 1), key=lambda e: e["cumulative_ms"], reverse=True)
+    heaviest = sorted(subtree, key=lambda e: e["self_ms"], reverse=True)
+    return {
+        "cumulative_ms": entries[root]["cumulative_ms"],
+        "self_ms": entries[root]["self_ms"],
+        "direct": [{k: e[k] for k in fields} for e in direct[:top]],
+        "top_self": [{k: e[k] for k in fields} for e in heaviest[:top]],
+    }
+
+
+def _stats(samples: List[float]) -> dict:
+    return {
+        "median": round(statistics.median(samples), 2),
+        "min": round(min(samples), 2),
+        "max": round(max(samples), 2),
+    }
+
+
+def run(runs: int = 5, books: int = 1000, wait: bool = False) -> dict:
+    """Başlangıcı `runs` kez ölçer ve bir kez -X importtime ile modül dökümü alır"""
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        _seed_sqlite(workdir, books, reading_list=0)
+        env = _child_env(wait)
+        # İlk süreç .pyc dosyalarını derler; ölçüme katılmaz
+        _run_child(workdir, env)
+        samples = [_run_child(workdir, env)[0] for _ in range(max(1, runs))]
+        _, lines = _run_child(workdir, env, importtime=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    last = samples[-1]
+    return {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "created_at": time.time(),
+        "books": books,
+        "runs": len(samples),
+        "wait": wait,
+        **{phase: _stats([s[phase] for s in samples]) for phase in PHASES},
+        "status": last["status"],
+        "watched_modules": last["watched_modules"],
+        "db_opened_on_import": last["db_opened_on_import"],
+        "components": last["components"],
+        "importtime": summarize_importtime(parse_importtime(lines)),
+    }
+
+
+def check_budget(report: dict, budget: dict) -> List[str]:
+    """Bütçeyi aşan ölçümleri döndürür
+
+    budget: {"import_ms": 1000, "first_request_ms": 1500, "forbidden_modules": ["httpx"],
+             "db_opened_on_import": false}; süreler medyana uygulanır.
+    """
+    failures = []
+    for phase in PHASES:
+        limit = budget.get(phase)
+        if limit is not None and report[phase]["median"] > limit:
+            failures.append(f"{phase}: median {report[phase]['median']} ms > bütçe {limit} ms")
+    loaded = sorted(set(report["watched_modules"]) & set(budget.get("forbidden_modules", ())))
+    if loaded:
+        failures.append(f"import api şu modülleri yüklüyor: {', '.join(loaded)}")
+    if budget.get("db_opened_on_import") is False and report["db_opened_on_import"]:
+        failures.append("import api veritabanını açıyor")
+    if report["status"] != 200:
+        failures.append(f"GET /health durum kodu {report['status']}")
+    return failures
+
+
+def _print_report(report: dict):
+    print(f"{'aşama':<18} {'median ms':>10} {'min ms':>10} {'max ms':>10}")
+    for phase in PHASES:
+        s = report[phase]
+        print(f"{phase:<18} {s['median']:>10.1f} {s['min']:>10.1f} {s['max']:>10.1f}")
+    print(f"içe aktarımda yüklenen izlenen modüller: {', '.join(report['watched_modules']) or '-'}")
+    imports = report["importtime"]
+    if imports["cumulative_ms"] is not None:
+        print(f"\n-X importtime: api {imports['cumulative_ms']:.1f} ms (kendi {imports['self_ms']:.1f} ms)")
+        for e in imports["direct"]:
+            print(f"  {e['module']:<30} {e['cumulative_ms']:>9.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API süreci başlangıç (import / lifespan / ilk istek) ölçümleri")
+    parser.add_argument("--runs", type=int, default=5, help="Ölçüm süreci sayısı")
+    parser.add_argument("--books", type=int, default=1000, help="Hazır veritabanındaki kitap sayısı")
+    parser.add_argument("--wait", action="store_true", help="KUTUPHANE_STARTUP_WAIT=1 (ısıtma bitmeden istek alma)")
+    parser.add_argument("--output", help="Sonuçları JSON dosyasına yaz")
+    parser.add_argument("--json", action="store_true", help="Sonuçları stdout'a JSON olarak yaz")
+    parser.add_argument("--budget", default=None, help=f"Bütçe dosyası (örn. {DEFAULT_BUDGET})")
+    args = parser.parse_args(argv)
+
+    report = run(runs=args.runs, books=args.books, wait=args.wait)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_report(report)
+
+    failures: List[str] = []
+    if args.budget:
+        with open(args.budget, "r", encoding="utf-8") as f:
+            failures = check_budget(report, json.load(f))
+    for failure in failures:
+        print(f"BÜTÇE AŞIMI: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+HTTP yük testi - uçtan uca verim (istek/sn) ve gecikme yüzdelikleri
+
+Senaryolar artan eşzamanlılık seviyelerinde sabit süre boyunca çalıştırılır:
+- get_books : GET /books
+- me_books  : GET /me/books (giriş yapmış kullanıcı)
+- login     : POST /auth/login
+- add_isbn  : POST /me/books (her istekte yeni ISBN; dış çağrı yolu)
+
+--spawn verilirse yerel Open Library taklit sunucusu ve çok işçili bir uvicorn
+geçici bir çalışma dizininde başlatılır; aksi halde --url ile verilen sunucu kullanılır.
+
+Token deposu süreç içi olduğundan her sanal kullanıcı tek bir keep-alive bağlantı
+kullanır; böylece giriş yaptığı işçi süreciyle konuşmaya devam eder.
+
+Kullanım:
+    python -m benchmarks.loadtest --spawn --workers 4 --concurrency 1,8,32,64 --duration 10
+    python -m benchmarks.loadtest --spawn --stub-latency-ms 150 --stub-error-rate 0.1 \\
+        --scenarios add_isbn --server-env KUTUPHANE_OPENLIBRARY_RATE=100
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --scenarios get_books --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+
+SCENARIOS = ("get_books", "me_books", "login", "add_isbn")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_isbn13(rng: random.Random) -> str:
+    """Geçerli kontrol basamaklı rastgele bir ISBN-13 (979 öneki; gerçek kitaplarla çakışmaz)"""
+    digits = [9, 7, 9] + [rng.randrange(10) for _ in range(9)]
+    check = (10 - sum(d * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10
+    return "".join(map(str, digits)) + str(check)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(scenario: str, concurrency: int, latencies: List[float], statuses: Dict[str, int],
+              elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    total = sum(statuses.values())
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000.0, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000.0, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000.0, 3),
+        "max_ms": round(latencies[-1] * 1000.0, 3) if latencies else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+    }
+
+
+async def _virtual_user(index: int, scenario: str, base_url: str, deadline: float, latencies: List[float],
+                        statuses: Dict[str, int], credentials: tuple, rng: random.Random,
+                        transport: Optional[httpx.AsyncBaseTransport]):
+    limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0, transport=transport) as client:
+        headers = {}
+        if scenario in ("me_books", "add_isbn"):
+            response = await client.post("/auth/login", json={"username": credentials[0], "password": credentials[1]})
+            if response.status_code != 200:
+                statuses[f"login_{response.status_code}"] = statuses.get(f"login_{response.status_code}", 0) + 1
+                return
+            headers["Authorization"] = f"Bearer {response.json()['token']}"
+
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if scenario == "get_books":
+                    response = await client.get("/books")
+                elif scenario == "me_books":
+                    response = await client.get("/me/books", headers=headers)
+                elif scenario == "login":
+                    response = await client.post("/auth/login", json={"username": credentials[0], "password": credentials[1]})
+                else:
+                    response = await client.post("/me/books", json={"isbn": random_isbn13(rng)}, headers=headers)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+
+async def run_step(base_url: str, scenario: str, concurrency: int, duration: float,
+                   credentials: tuple = ("demo", "demo123"), seed: int = 0,
+                   transport: Optional[httpx.AsyncBaseTransport] = None) -> dict:
+    """Bir senaryoyu verilen eşzamanlılıkta `duration` saniye çalıştırır"""
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Bilinmeyen senaryo: {scenario}")
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _virtual_user(i, scenario, base_url, deadline, latencies, statuses, credentials,
+                      random.Random(seed * 100_003 + i), transport)
+        for i in range(concurrency)
+    ))
+    return summarize(scenario, concurrency, latencies, statuses, time.perf_counter() - started)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Sunucu hazır olmadı: {url}")
+
+
+@contextmanager
+def spawn_stack(workers: int = 2, stub_args: Optional[List[str]] = None,
+                server_env: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Taklit Open Library + uvicorn (geçici çalışma dizininde) başlatır; API adresini verir"""
+    workdir = tempfile.mkdtemp(prefix="loadtest_")
+    os.symlink(os.path.join(REPO_ROOT, "static"), os.path.join(workdir, "static"))
+    stub_port, api_port = _free_port(), _free_port()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["KUTUPHANE_OPENLIBRARY_URL"] = f"http://127.0.0.1:{stub_port}"
+    env.update(server_env or {})
+    processes = []
+    try:
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.openlibrary_stub", "--port", str(stub_port), *(stub_args or [])],
+            cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL,
+        ))
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(api_port),
+             "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+            cwd=workdir, env=env,
+        ))
+        base_url = f"http://127.0.0.1:{api_port}"
+        _wait_ready(base_url + "/health")
+        yield base_url
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run(base_url: str, scenarios=SCENARIOS, concurrency_levels=(1, 8, 32), duration: float = 5.0,
+        credentials: tuple = ("demo", "demo123")) -> List[dict]:
+    results = []
+    for scenario in scenarios:
+        for seed, concurrency in enumerate(concurrency_levels):
+            results.append(asyncio.run(run_step(base_url, scenario, concurrency, duration, credentials, seed)))
+    return results
+
+
+def _print_table(results: List[dict]):
+    print(f"{'senaryo':<10} {'eşz.':>5} {'istek':>7} {'istek/sn':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'hata':>6}")
+    for r in results:
+        print(f"{r['scenario']:<10} {r['concurrency']:>5} {r['requests']:>7} {r['throughput_rps']:>9.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['errors']:>6}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kütüphane API yük testi")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Çalışan API adresi (ör. http://127.0.0.1:8000)")
+    target.add_argument("--spawn", action="store_true", help="Taklit Open Library + uvicorn başlat")
+    parser.add_argument("--workers", type=int, default=2, help="--spawn ile uvicorn işçi sayısı")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32", help="Virgülle ayrılmış eşzamanlılık seviyeleri")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seviye başına süre (sn)")
+    parser.add_argument("--username", default="demo")
+    parser.add_argument("--password", default="demo123")
+    parser.add_argument("--stub-latency-ms", type=float, default=50.0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--stub-not-found-rate", type=float, default=0.0)
+    parser.add_argument("--server-env", action="append", default=[], help="Sunucuya geçirilecek KEY=VALUE (tekrarlanabilir)")
+    parser.add_argument("--output", help="Sonuçları JSON dosyasına yaz")
+    parser.add_argument("--json", action="store_true", help="Sonuçları stdout'a JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+    credentials = (args.username, args.password)
+    if args.spawn:
+        stub_args = ["--latency-ms", str(args.stub_latency_ms), "--jitter-ms", str(args.stub_jitter_ms),
+                     "--error-rate", str(args.stub_error_rate), "--not-found-rate", str(args.stub_not_found_rate),
+                     "--seed", "1"]
+        server_env = dict(item.split("=", 1) for item in args.server_env)
+        with spawn_stack(args.workers, stub_args, server_env) as base_url:
+            results = run(base_url, scenarios, levels, args.duration, credentials)
+    else:
+        results = run(args.url, scenarios, levels, args.duration, credentials)
+
+    report = {"workers": args.workers if args.spawn else None, "created_at": time.time(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_table(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
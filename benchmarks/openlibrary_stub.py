@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Yerel Open Library taklit sunucusu - dış çağrı yollarını çevrimdışı ve tekrarlanabilir
+biçimde yük altında test etmek için
+
+/isbn/{isbn}.json ve /authors/{key}.json uçlarını taklit eder; gecikme, hata ve
+bulunamadı oranları ayarlanabilir. Uygulama KUTUPHANE_OPENLIBRARY_URL ile yönlendirilir.
+
+Kullanım:
+    python -m benchmarks.openlibrary_stub --port 9080 --latency-ms 120 --jitter-ms 40 --error-rate 0.05
+    KUTUPHANE_OPENLIBRARY_URL=http://127.0.0.1:9080 uvicorn api:app
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+_ISBN_PATH = re.compile(r"^/isbn/([0-9Xx]+)\.json$")
+_AUTHOR_PATH = re.compile(r"^/authors/(OL\d+A)\.json$")
+
+
+class StubConfig:
+    """Taklit sunucunun davranış ayarları"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 not_found_rate: float = 0.0, error_status: int = 503, authors: int = 1000,
+                 seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.not_found_rate = not_found_rate
+        self.error_status = error_status
+        self.authors = authors
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def _draw(self) -> tuple:
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+            return delay / 1000.0, self._random.random(), self._random.random()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors}
+
+
+def _author_key(isbn: str, authors: int) -> str:
+    # Aynı ISBN her zaman aynı yazara eşlenir (tekrarlanabilir sonuçlar)
+    return f"OL{int(isbn.rstrip('Xx') or 0) % authors + 1}A"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "OpenLibraryStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        config: StubConfig = self.server.config
+        delay, error_roll, not_found_roll = config._draw()
+        if delay:
+            time.sleep(delay)
+        if error_roll < config.error_rate:
+            with config._lock:
+                config.errors += 1
+            self._send(config.error_status, {"error": "stub hatası"})
+            return
+        match = _ISBN_PATH.match(self.path)
+        if match:
+            isbn = match.group(1).upper()
+            if not_found_roll < config.not_found_rate:
+                self._send(404, {"error": "notfound"})
+                return
+            self._send(200, {
+                "title": f"Taklit Kitap {isbn}",
+                "authors": [{"key": f"/authors/{_author_key(isbn, config.authors)}"}],
+                "isbn_13": [isbn],
+            })
+            return
+        match = _AUTHOR_PATH.match(self.path)
+        if match:
+            self._send(200, {"name": f"Taklit Yazar {match.group(1)}", "key": f"/authors/{match.group(1)}"})
+            return
+        self._send(404, {"error": "notfound"})
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None) -> ThreadingHTTPServer:
+    """Taklit sunucuyu oluşturur (port=0 boş bir port seçer; adres server.server_address)"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.config = config or StubConfig()
+    return server
+
+
+def start_in_thread(config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+    """Sunucuyu arka plan thread'inde başlatır; (server, base_url) döndürür"""
+    server = make_server(host, port, config)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05},
+                              name="openlibrary-stub", daemon=True)
+    thread.start()
+    return server, f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yerel Open Library taklit sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9080)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Ortalama yanıt gecikmesi")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Gecikmeye eklenen ± rastgele sapma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Hata döndürülen isteklerin oranı (0-1)")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="404 döndürülen ISBN isteklerinin oranı")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.not_found_rate,
+                        args.error_status, seed=args.seed)
+    server = make_server(args.host, args.port, config)
+    print(f"Open Library taklit sunucusu: http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
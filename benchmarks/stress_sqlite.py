@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+SQLite yazma yolları için eşzamanlılık stres testi
+
+Aynı veritabanı dosyası üzerinde N thread ya da süreç karışık yazma işlemleri yapar:
+- mark  : kullanıcıların kitapları okundu/okunmadı işaretlemesi
+- add   : admin'in kataloğa kitap eklemesi
+- user_add : kullanıcının katalogdan listesine kitap eklemesi
+- register : yeni kullanıcı kaydı
+
+Kilit bekleme süreleri, "database is locked" hataları, kayıp güncellemeler (onaylanan
+yazmanın son durumda görünmemesi) ve verim raporlanır. --ci ile herhangi bir hata veya
+kayıp güncellemede çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.stress_sqlite --workers 8 --ops 200
+    python -m benchmarks.stress_sqlite --mode processes --workers 4 --ops 300 --ci
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from models import Book, Library, UserManager
+
+
+KINDS = ("mark", "add", "user_add", "register")
+DEFAULT_WEIGHTS = {"mark": 5, "add": 2, "user_add": 2, "register": 1}
+CATALOG_SIZE = 500
+READING_LIST = 50
+
+
+def _catalog_isbn(i: int) -> str:
+    return str(9780000000000 + i)
+
+
+def _open(db_path: str):
+    workdir = os.path.dirname(db_path)
+    library = Library(os.path.join(workdir, "library.json"), db_path=db_path)
+    users = UserManager(os.path.join(workdir, "users.json"), db_path=db_path, library=library)
+    return library, users
+
+
+def seed(db_path: str, workers: int):
+    """Katalog ve her işçi için okuma listesi olan bir kullanıcı oluşturur"""
+    library, users = _open(db_path)
+    with library._get_conn() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO books (title, author, isbn) VALUES (?, ?, ?)",
+            ((f"Kitap {i}", f"Yazar {i % 50}", _catalog_isbn(i)) for i in range(CATALOG_SIZE)),
+        )
+    for w in range(workers):
+        username = f"stres_{w}"
+        users.create_user(username, "parola")
+        with users._get_conn() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO user_books (username, isbn, title, author, is_read) VALUES (?, ?, ?, ?, 0)",
+                ((username, _catalog_isbn(i), f"Kitap {i}", f"Yazar {i % 50}") for i in range(READING_LIST)),
+            )
+    library.storage.close()
+    users.storage.close()
+
+
+def _classify(error: BaseException) -> str:
+    if isinstance(error, sqlite3.OperationalError) and "locked" in str(error):
+        return "locked"
+    if isinstance(error, sqlite3.OperationalError) and "busy" in str(error):
+        return "locked"
+    return "other"
+
+
+def run_worker(worker: int, db_path: str, ops: int, weights: Dict[str, int], seed_value: int,
+               shared: Optional[tuple] = None) -> dict:
+    """Bir işçinin işlemlerini çalıştırır; beklenen son durum ve hataları döndürür
+
+    shared verilirse (thread modu) aynı Library / UserManager örnekleri kullanılır,
+    aksi halde (süreç modu) işçi kendi bağlantılarını açar.
+    """
+    rng = random.Random(seed_value * 7919 + worker)
+    library, users = shared or _open(db_path)
+    username = f"stres_{worker}"
+    kinds = [k for k in KINDS for _ in range(weights.get(k, 0))]
+    result = {
+        "worker": worker,
+        "counts": {k: 0 for k in KINDS},
+        "latencies": {k: [] for k in KINDS},
+        "errors": {"locked": 0, "other": 0},
+        "error_samples": [],
+        "marks": {},
+        "added": [],
+        "user_added": [],
+        "registered": [],
+    }
+    # Katalog dışındaki (user_add için) kitaplar: işçiye özel ISBN aralığı
+    candidate = CATALOG_SIZE + worker * 100_000
+    result["started_at"] = time.time()
+    for i in range(ops):
+        kind = rng.choice(kinds)
+        started = time.perf_counter()
+        try:
+            if kind == "mark":
+                isbn = _catalog_isbn(rng.randrange(READING_LIST))
+                value = rng.random() < 0.5
+                if users.mark_user_book_read(username, isbn, is_read=value) is not None:
+                    result["marks"][isbn] = value
+            elif kind == "add":
+                isbn = str(9790000000000 + worker * 1_000_000 + i)
+                if library.add_book(Book(f"Stres Kitap {worker}-{i}", f"Stres Yazar {worker}", isbn)):
+                    result["added"].append(isbn)
+            elif kind == "user_add":
+                # Önce kataloğa eklenir; kullanıcı ekleme katalog katmanından çözülür (ağ yok)
+                isbn = str(9790000000000 + worker * 1_000_000 + 500_000 + candidate)
+                candidate += 1
+                library.add_book(Book(f"Liste Kitabı {isbn}", "Liste Yazarı", isbn))
+                if users.add_book_to_user_by_isbn(username, isbn):
+                    result["user_added"].append(isbn)
+            else:
+                new_user = f"kayit_{worker}_{i}"
+                if users.create_user(new_user, "parola"):
+                    result["registered"].append(new_user)
+        except Exception as e:
+            category = _classify(e)
+            result["errors"][category] += 1
+            if len(result["error_samples"]) < 5:
+                result["error_samples"].append(f"{kind}: {type(e).__name__}: {e}")
+            continue
+        finally:
+            result["latencies"][kind].append(time.perf_counter() - started)
+        result["counts"][kind] += 1
+    result["finished_at"] = time.time()
+    if shared is None:
+        result["lock"] = [library.storage.lock_stats(), users.storage.lock_stats()]
+        library.storage.close()
+        users.storage.close()
+    return result
+
+
+def _process_entry(args):
+    return run_worker(*args)
+
+
+def verify(db_path: str, results: List[dict]) -> List[str]:
+    """Onaylanan yazmaların son durumda görünüp görünmediğini kontrol eder"""
+    lost = []
+    with sqlite3.connect(db_path) as conn:
+        books = {row[0] for row in conn.execute("SELECT isbn FROM books")}
+        users = {row[0] for row in conn.execute("SELECT username FROM users")}
+        user_books = {}
+        for username, isbn, is_read in conn.execute("SELECT username, isbn, is_read FROM user_books"):
+            user_books[(username, isbn)] = bool(is_read)
+    for r in results:
+        username = f"stres_{r['worker']}"
+        for isbn, value in r["marks"].items():
+            if user_books.get((username, isbn)) != value:
+                lost.append(f"mark {username}/{isbn}: beklenen {value}, bulunan {user_books.get((username, isbn))}")
+        lost.extend(f"add {isbn}: katalogda yok" for isbn in r["added"] if isbn not in books)
+        lost.extend(f"user_add {username}/{isbn}: listede yok" for isbn in r["user_added"]
+                    if (username, isbn) not in user_books)
+        lost.extend(f"register {u}: kullanıcı yok" for u in r["registered"] if u not in users)
+    return lost
+
+
+def _percentile_ms(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(fraction * (len(values) - 1)))] * 1000.0, 3)
+
+
+def run(workers: int = 4, ops: int = 200, mode: str = "threads", weights: Optional[Dict[str, int]] = None,
+        seed_value: int = 1, workdir: Optional[str] = None) -> dict:
+    weights = weights or DEFAULT_WEIGHTS
+    own_dir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="stress_sqlite_")
+    db_path = os.path.join(workdir, "app.db")
+    try:
+        seed(db_path, workers)
+        if mode == "threads":
+            # Sunucudaki gibi: tüm thread'ler aynı Library / UserManager örneklerini paylaşır
+            library, users = _open(db_path)
+            results: List[Optional[dict]] = [None] * workers
+
+            def target(w):
+                results[w] = run_worker(w, db_path, ops, weights, seed_value, (library, users))
+
+            threads = [threading.Thread(target=target, args=(w,)) for w in range(workers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            lock = [library.storage.lock_stats(), users.storage.lock_stats()]
+            library.storage.close()
+            users.storage.close()
+        else:
+            # Uvicorn işçileri gibi: her süreç kendi bağlantılarını açar
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(workers) as pool:
+                results = pool.map(_process_entry, [(w, db_path, ops, weights, seed_value) for w in range(workers)])
+            lock = [stats for r in results for stats in r.pop("lock")]
+
+        # Süreç başlatma süresi dahil edilmez: ilk işlemin başından son işlemin sonuna
+        elapsed = max(r["finished_at"] for r in results) - min(r["started_at"] for r in results)
+        lost = verify(db_path, results)
+        total_ops = sum(sum(r["counts"].values()) for r in results)
+        report = {
+            "mode": mode,
+            "workers": workers,
+            "ops_per_worker": ops,
+            "duration_s": round(elapsed, 3),
+            "ops_completed": total_ops,
+            "throughput_ops_s": round(total_ops / elapsed, 1) if elapsed else 0.0,
+            "by_kind": {},
+            "errors": {
+                "locked": sum(r["errors"]["locked"] for r in results),
+                "other": sum(r["errors"]["other"] for r in results),
+            },
+            "error_samples": [s for r in results for s in r["error_samples"]][:10],
+            "lost_updates": len(lost),
+            "lost_samples": lost[:10],
+            "lock_wait": {
+                "writes": sum(s["writes"] for s in lock),
+                "total_s": round(sum(s["wait_total_s"] for s in lock), 6),
+                "max_ms": max((s["wait_max_ms"] for s in lock), default=0.0),
+            },
+        }
+        for kind in KINDS:
+            latencies = [v for r in results for v in r["latencies"][kind]]
+            report["by_kind"][kind] = {
+                "count": sum(r["counts"][kind] for r in results),
+                "p50_ms": _percentile_ms(latencies, 0.50),
+                "p99_ms": _percentile_ms(latencies, 0.99),
+            }
+        return report
+    finally:
+        if own_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def failed(report: dict) -> bool:
+    """CI modu için: herhangi bir hata veya kayıp güncelleme var mı"""
+    return bool(report["errors"]["locked"] or report["errors"]["other"] or report["lost_updates"])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SQLite yazma yolları eşzamanlılık stres testi")
+    parser.add_argument("--mode", choices=("threads", "processes"), default="threads")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200, help="İşçi başına işlem sayısı")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ci", action="store_true", help="Herhangi bir hata veya kayıp güncellemede çıkış kodu 1")
+    parser.add_argument("--json", action="store_true", help="Raporu JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    report = run(args.workers, args.ops, args.mode, seed_value=args.seed)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"{report['mode']} x {report['workers']}: {report['ops_completed']} işlem, "
+              f"{report['throughput_ops_s']} işlem/sn, {report['duration_s']} sn")
+        for kind, stats in report["by_kind"].items():
+            print(f"  {kind:<9} {stats['count']:>6}  p50 {stats['p50_ms']:>8.2f} ms  p99 {stats['p99_ms']:>8.2f} ms")
+        print(f"  kilit bekleme: toplam {report['lock_wait']['total_s']} sn, en uzun {report['lock_wait']['max_ms']} ms")
+        print(f"  hatalar: locked={report['errors']['locked']} diğer={report['errors']['other']}, "
+              f"kayıp güncelleme={report['lost_updates']}")
+        for sample in report["error_samples"] + report["lost_samples"]:
+            print(f"    {sample}")
+    if args.ci and failed(report):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
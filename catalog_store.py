@@ -0,0 +1,228 @@
+"""
+Sütun tabanlı, salt-okunur katalog deposu - çok büyük kataloglar için
+
+Kitaplar satır nesneleri yerine bitişik sütunlarda tutulur:
+- ISBN'ler sıralı, paketlenmiş 64-bit tamsayılar (ikili arama ile erişim)
+- Başlıklar tek bir UTF-8 bloğu + ofset dizisi
+- Yazarlar tekilleştirilmiş sözlük (yazar kimliği sütunu + ofset dizisi + blok)
+- Başlığa göre sıralı satır dizini (listeleme için)
+
+Dosya olarak kaydedilebilir ve mmap ile açılır; açılış maliyeti satır sayısından bağımsızdır.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"KTPCAT01"
+# magic, bayt sırası (1 = little), kitap sayısı, katalog sürümü, yazar sayısı
+_HEADER = struct.Struct("<8sIQQQ")
+_SECTIONS = ("isbn_codes", "title_offsets", "titles", "author_ids", "author_offsets", "authors", "title_order")
+_SECTION_TABLE = struct.Struct("<" + "QQ" * len(_SECTIONS))
+_TYPECODES = {
+    "isbn_codes": "Q",
+    "title_offsets": "Q",
+    "author_ids": "I",
+    "author_offsets": "Q",
+    "title_order": "I",
+}
+
+
+def encode_isbn(isbn: str) -> Optional[int]:
+    """Normalize ISBN'i sıralanabilir bir tamsayıya paketler (paketlenemiyorsa None)
+
+    Düzen: rakamlar << 5 | uzunluk << 1 | sondaki 'X'. Baştaki sıfırlar uzunluk
+    sayesinde korunur; dönüşüm kayıpsızdır.
+    """
+    has_x = isbn.endswith("X")
+    digits = isbn[:-1] if has_x else isbn
+    if not digits.isdigit() or not digits.isascii() or len(isbn) > 15:
+        return None
+    return (int(digits) << 5) | (len(isbn) << 1) | int(has_x)
+
+
+def decode_isbn(code: int) -> str:
+    length = (code >> 1) & 0xF
+    has_x = code & 1
+    digits = str(code >> 5).zfill(length - has_x)
+    return digits + "X" if has_x else digits
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class ColumnarCatalog:
+    """Sütun tabanlı katalog; satırlar ISBN koduna göre sıralıdır"""
+
+    def __init__(self, isbn_codes, title_offsets, titles, author_ids, author_offsets, authors,
+                 title_order, version: int = 0, mapping: Optional[mmap.mmap] = None):
+        self._isbn_codes = isbn_codes
+        self._title_offsets = title_offsets
+        self._titles = titles
+        self._author_ids = author_ids
+        self._author_offsets = author_offsets
+        self._authors = authors
+        self._title_order = title_order
+        self.version = version
+        self._mapping = mapping
+        self._author_cache: dict = {}
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, str, str]], version: int = 0) -> 'ColumnarCatalog':
+        """(title, author, isbn) satırlarından bellekte katalog oluşturur
+
+        Paketlenemeyen bir ISBN varsa ValueError fırlatır.
+        """
+        entries = []
+        for title, author, isbn in rows:
+            code = encode_isbn(isbn)
+            if code is None:
+                raise ValueError(f"ISBN sütun deposuna paketlenemiyor: {isbn!r}")
+            entries.append((code, title, author))
+        entries.sort(key=lambda entry: entry[0])
+
+        isbn_codes = array("Q")
+        title_offsets = array("Q", [0])
+        titles = bytearray()
+        author_ids = array("I")
+        author_index: dict = {}
+        author_offsets = array("Q", [0])
+        authors = bytearray()
+        for code, title, author in entries:
+            isbn_codes.append(code)
+            titles += title.encode("utf-8")
+            title_offsets.append(len(titles))
+            author_id = author_index.get(author)
+            if author_id is None:
+                author_id = author_index[author] = len(author_index)
+                authors += author.encode("utf-8")
+                author_offsets.append(len(authors))
+            author_ids.append(author_id)
+        # SQLite'ın ORDER BY title (BINARY) sırası Python str sırası ile aynıdır
+        order = sorted(range(len(entries)), key=lambda i: (entries[i][1], entries[i][0]))
+        return cls(isbn_codes, title_offsets, bytes(titles), author_ids, author_offsets,
+                   bytes(authors), array("I", order), version)
+
+    @classmethod
+    def open(cls, path: str) -> 'ColumnarCatalog':
+        """Kaydedilmiş katalog dosyasını mmap ile açar (satırlar ayrıştırılmaz)"""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, byteorder, count, version, _ = _HEADER.unpack_from(mapping, 0)
+            if magic != MAGIC:
+                raise ValueError("Geçersiz katalog dosyası")
+            if byteorder != (1 if sys.byteorder == "little" else 0):
+                raise ValueError("Katalog dosyası farklı bayt sırası ile oluşturulmuş")
+            table = _SECTION_TABLE.unpack_from(mapping, _HEADER.size)
+            view = memoryview(mapping)
+            sections = {}
+            for i, name in enumerate(_SECTIONS):
+                offset, length = table[2 * i], table[2 * i + 1]
+                section = view[offset:offset + length]
+                typecode = _TYPECODES.get(name)
+                sections[name] = section.cast(typecode) if typecode else section
+        except Exception:
+            mapping.close()
+            raise
+        if len(sections["isbn_codes"]) != count:
+            raise ValueError("Katalog dosyası bozuk")
+        return cls(version=version, mapping=mapping, **sections)
+
+    def save(self, path: str):
+        """Katalogu dosyaya yazar (geçici dosya + atomik yer değiştirme)"""
+        payloads = [
+            self._isbn_codes, self._title_offsets, self._titles, self._author_ids,
+            self._author_offsets, self._authors, self._title_order,
+        ]
+        payloads = [memoryview(p).cast("B") for p in payloads]
+        offset = _align(_HEADER.size + _SECTION_TABLE.size)
+        table = []
+        for payload in payloads:
+            table.extend((offset, len(payload)))
+            offset = _align(offset + len(payload))
+
+        # Aynı yolu yeniden oluşturan süreçler birbirinin geçici dosyasına yazmasın diye benzersiz ad
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, 1 if sys.byteorder == "little" else 0, len(self),
+                                     self.version, len(self._author_offsets) - 1))
+                f.write(_SECTION_TABLE.pack(*table))
+                for i, payload in enumerate(payloads):
+                    f.write(b"\0" * (table[2 * i] - f.tell()))
+                    f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def __len__(self) -> int:
+        return len(self._isbn_codes)
+
+    @property
+    def nbytes(self) -> int:
+        """Sütunların toplam boyutu (bayt)"""
+        return sum(memoryview(p).nbytes for p in (
+            self._isbn_codes, self._title_offsets, self._titles, self._author_ids,
+            self._author_offsets, self._authors, self._title_order,
+        ))
+
+    def _author(self, author_id: int) -> str:
+        author = self._author_cache.get(author_id)
+        if author is None:
+            start, end = self._author_offsets[author_id], self._author_offsets[author_id + 1]
+            author = sys.intern(str(self._authors[start:end], "utf-8"))
+            self._author_cache[author_id] = author
+        return author
+
+    def row(self, index: int) -> Tuple[str, str, str]:
+        """ISBN sırasındaki `index` numaralı satır: (title, author, isbn)"""
+        start, end = self._title_offsets[index], self._title_offsets[index + 1]
+        return (
+            str(self._titles[start:end], "utf-8"),
+            self._author(self._author_ids[index]),
+            decode_isbn(self._isbn_codes[index]),
+        )
+
+    def find(self, isbn: str) -> Optional[Tuple[str, str, str]]:
+        """ISBN ile ikili arama; bulunamazsa None"""
+        code = encode_isbn(isbn)
+        if code is None:
+            return None
+        index = bisect_left(self._isbn_codes, code)
+        if index < len(self._isbn_codes) and self._isbn_codes[index] == code:
+            return self.row(index)
+        return None
+
+    def iter_by_title(self) -> Iterator[Tuple[str, str, str]]:
+        """Satırları başlık sırasıyla döndürür"""
+        for index in self._title_order:
+            yield self.row(index)
+
+    def to_dicts(self) -> List[dict]:
+        """Başlık sırasıyla kitap sözlükleri (API yanıtı için)"""
+        return [{"title": title, "author": author, "isbn": isbn} for title, author, isbn in self.iter_by_title()]
+
+    def close(self):
+        """mmap'i serbest bırakır (yalnızca başka bir thread kullanmıyorsa çağrılmalı)"""
+        if self._mapping is None:
+            return
+        for name in ("_isbn_codes", "_title_offsets", "_titles", "_author_ids",
+                     "_author_offsets", "_authors", "_title_order"):
+            view = getattr(self, name)
+            setattr(self, name, array("Q"))
+            view.release()
+        self._mapping.close()
+        self._mapping = None
@@ -0,0 +1,264 @@
+"""
+Server-Sent Events yayını - katalog ve kullanıcı listesi değişikliklerinin tarayıcılara
+itilmesi
+
+İşçi süreç başına tek bir izleyici görev, katalog sürümünü (catalog_state) ve abone
+kullanıcıların liste sürümlerini (user_list_versions) aralıklarla okur; değişiklikleri bir
+kez kodlar ve abonelerin kuyruklarına dağıtır. Bağlantılar kendi kuyruklarında bekler,
+bu yüzden binlerce boşta bağlantı veritabanına ek yük getirmez. Değişiklikler veritabanından
+okunduğundan diğer uvicorn işçilerindeki yazmalar da yayınlanır.
+
+Olaylar:
+- book  : {"version", "op": insert|update|delete, "isbn", "title", "author"} (id: katalog sürümü)
+- reset : {"version"} - istemci kataloğu GET /books ile yeniden yüklemelidir
+- list  : {"version", "books": [...]} - yalnızca ilgili kullanıcının bağlantılarına
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Dict, Optional, Set
+
+
+_CLOSE = None
+
+
+def encode_event(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """Tek bir SSE olayını kodlar"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class Subscriber:
+    """Tek bir SSE bağlantısı: sınırlı kuyruk ve gördüğü son katalog sürümü"""
+
+    __slots__ = ("username", "queue", "catalog_version", "list_version", "dropped")
+
+    def __init__(self, username: Optional[str], catalog_version: int, list_version: int, queue_size: int):
+        self.username = username
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.catalog_version = catalog_version
+        self.list_version = list_version
+        self.dropped = False
+
+
+class EventBroadcaster:
+    """Değişiklikleri tek bir izleyici görevle okuyup tüm abonelere dağıtır
+
+    Yalnızca event loop içinden kullanılır (wake() hariç); veritabanı okumaları
+    thread havuzunda yapılır.
+    """
+
+    def __init__(self, library, user_manager, poll_interval: float = 1.0, heartbeat: float = 15.0,
+                 queue_size: int = 256, max_subscribers: int = 10000, batch_size: int = 1000):
+        self.library = library
+        self.user_manager = user_manager
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.batch_size = batch_size
+        self._subscribers: Set[Subscriber] = set()
+        self._by_user: Dict[str, Set[Subscriber]] = {}
+        self._catalog_version: Optional[int] = None
+        self._list_versions: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.events_sent = 0
+        self.dropped_count = 0
+
+    @classmethod
+    def from_env(cls, library, user_manager, prefix: str = "KUTUPHANE_EVENTS_") -> 'EventBroadcaster':
+        """Ortam değişkenlerinden ayarları okur (ör. KUTUPHANE_EVENTS_POLL_INTERVAL=0.5)"""
+        broadcaster = cls(library, user_manager)
+        try:
+            broadcaster.poll_interval = float(os.environ.get(prefix + "POLL_INTERVAL", broadcaster.poll_interval))
+            broadcaster.heartbeat = float(os.environ.get(prefix + "HEARTBEAT", broadcaster.heartbeat))
+            broadcaster.queue_size = int(os.environ.get(prefix + "QUEUE", broadcaster.queue_size))
+            broadcaster.max_subscribers = int(os.environ.get(prefix + "MAX_SUBSCRIBERS", broadcaster.max_subscribers))
+        except ValueError:
+            pass
+        return broadcaster
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def start(self):
+        """İzleyici görevi çalışan event loop üzerinde başlatır"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for subscriber in list(self._subscribers):
+            self._drop(subscriber)
+
+    def wake(self):
+        """Bir sonraki yoklamayı beklemeden kontrol yapılmasını ister (thread-safe)"""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _subscribe(self, subscriber: Subscriber):
+        self._subscribers.add(subscriber)
+        if subscriber.username:
+            self._by_user.setdefault(subscriber.username, set()).add(subscriber)
+
+    def _unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        if not self._subscribers:
+            # Abone yokken yoklama yapılmaz; taban sürüm bir sonraki abonelikte yeniden belirlenir
+            self._catalog_version = None
+        if subscriber.username:
+            users = self._by_user.get(subscriber.username)
+            if users is not None:
+                users.discard(subscriber)
+                if not users:
+                    del self._by_user[subscriber.username]
+                    self._list_versions.pop(subscriber.username, None)
+
+    def _drop(self, subscriber: Subscriber):
+        """Yavaş okuyan bağlantıyı kapatır; istemci Last-Event-ID ile yeniden bağlanır"""
+        subscriber.dropped = True
+        while True:
+            try:
+                subscriber.queue.put_nowait(_CLOSE)
+                return
+            except asyncio.QueueFull:
+                subscriber.queue.get_nowait()
+
+    def _publish(self, subscribers, version: Optional[int], payload: bytes):
+        for subscriber in list(subscribers):
+            if subscriber.dropped:
+                continue
+            try:
+                subscriber.queue.put_nowait((version, payload))
+            except asyncio.QueueFull:
+                self.dropped_count += 1
+                self._drop(subscriber)
+        self.events_sent += 1
+
+    async def stream(self, username: Optional[str] = None, since: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Bir SSE bağlantısının gövdesi
+
+        since verilirse (Last-Event-ID veya ?since=) o sürümden sonraki katalog
+        değişiklikleri önce tekrar oynatılır. Kullanıcı bağlantılarında ilk olay
+        listenin güncel hâlidir.
+        """
+        # Sürümler abonelikten önce okunur: aradaki değişiklikler hem tekrar oynatmada hem
+        # canlı yayında görünebilir, sürüm filtresi tekrarları eler
+        current = await asyncio.to_thread(self.library.catalog_version)
+        list_version = await asyncio.to_thread(self.user_manager.list_version, username) if username else 0
+        subscriber = Subscriber(username, since if since is not None else current, list_version, self.queue_size)
+        self._subscribe(subscriber)
+        try:
+            yield b"retry: 3000\n\n"
+            if since is not None and since != current:
+                async for chunk in self._replay(subscriber):
+                    yield chunk
+            if username:
+                books = await asyncio.to_thread(self.user_manager.list_user_books, username)
+                yield encode_event("list", {"version": list_version, "books": books})
+            while True:
+                item = await subscriber.queue.get()
+                if item is _CLOSE:
+                    return
+                version, payload = item
+                if version is not None:
+                    if version <= subscriber.catalog_version:
+                        continue
+                    subscriber.catalog_version = version
+                yield payload
+        finally:
+            self._unsubscribe(subscriber)
+
+    async def _replay(self, subscriber: Subscriber) -> AsyncIterator[bytes]:
+        while True:
+            result = await asyncio.to_thread(self.library.changes_since, subscriber.catalog_version, self.batch_size)
+            if result["reset"]:
+                yield encode_event("reset", {"version": result["version"]}, result["version"])
+            for change in result["changes"]:
+                yield encode_event("book", change, change["version"])
+            subscriber.catalog_version = result["version"]
+            if not result["has_more"]:
+                return
+
+    async def _run(self):
+        last_heartbeat = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._subscribers:
+                try:
+                    await self.poll()
+                except Exception as e:
+                    print(f"Olay yayını sırasında hata: {e}")
+            now = time.monotonic()
+            if now - last_heartbeat >= self.heartbeat:
+                last_heartbeat = now
+                # Proxy'lerin boşta bağlantıyı kapatmaması için yorum satırı
+                self._publish(self._subscribers, None, b": ping\n\n")
+
+    async def poll(self):
+        """Katalog ve abone kullanıcıların liste sürümlerini kontrol edip değişiklikleri yayınlar"""
+        if not self._subscribers:
+            return
+        if self._catalog_version is None:
+            self._catalog_version = min(s.catalog_version for s in self._subscribers)
+        version = await asyncio.to_thread(self.library.catalog_version)
+        while version != self._catalog_version:
+            result = await asyncio.to_thread(self.library.changes_since, self._catalog_version, self.batch_size)
+            if result["reset"]:
+                self._publish(self._subscribers, result["version"],
+                              encode_event("reset", {"version": result["version"]}, result["version"]))
+            for change in result["changes"]:
+                self._publish(self._subscribers, change["version"], encode_event("book", change, change["version"]))
+            self._catalog_version = result["version"]
+            if not result["has_more"]:
+                break
+
+        if not self._by_user:
+            return
+        usernames = list(self._by_user)
+        versions = await asyncio.to_thread(self.user_manager.list_versions, usernames)
+        for username in usernames:
+            subscribers = self._by_user.get(username)
+            if not subscribers:
+                continue
+            baseline = self._list_versions.get(username)
+            if baseline is None:
+                baseline = min(s.list_version for s in subscribers)
+            current = versions.get(username, 0)
+            self._list_versions[username] = current
+            if current == baseline:
+                continue
+            books = await asyncio.to_thread(self.user_manager.list_user_books, username)
+            self._publish(self._by_user.get(username, ()), None,
+                          encode_event("list", {"version": current, "books": books}))
+
+    def snapshot(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "users": len(self._by_user),
+            "events_sent": self.events_sent,
+            "dropped": self.dropped_count,
+        }
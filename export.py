@@ -0,0 +1,78 @@
+"""
+Akış halinde dışa aktarım - tablolar SQLite imleci üzerinden parça parça okunur ve
+NDJSON veya CSV olarak üretilir; bellek kullanımı tablo boyutundan bağımsızdır
+"""
+
+import csv
+import io
+import json
+from typing import Iterator, List, Tuple
+
+from storage import SQLiteStorage
+
+
+# Tablo adı -> (sorgu, sütunlar). Sıralama birincil anahtar indeksinden okunur (geçici
+# sıralama yapılmaz); parola özetleri dışa aktarılmaz.
+EXPORTS = {
+    "books": ("SELECT isbn, title, author FROM books ORDER BY isbn", ("isbn", "title", "author")),
+    "users": ("SELECT username, role FROM users ORDER BY username", ("username", "role")),
+    "user_books": (
+        "SELECT username, isbn, title, author, is_read FROM user_books ORDER BY username, isbn",
+        ("username", "isbn", "title", "author", "is_read"),
+    ),
+}
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+BOOL_COLUMNS = ("is_read",)
+
+
+def iter_chunks(storage: SQLiteStorage, table: str, chunk_size: int = 1000) -> Iterator[List[tuple]]:
+    """Tablonun satırlarını en fazla chunk_size satırlık listeler halinde verir"""
+    sql, _ = EXPORTS[table]
+    with storage.snapshot() as conn:
+        cursor = conn.execute(sql)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+
+def _bool_indexes(columns: Tuple[str, ...]) -> List[int]:
+    return [i for i, name in enumerate(columns) if name in BOOL_COLUMNS]
+
+
+def encode_ndjson(columns: Tuple[str, ...], rows: List[tuple]) -> bytes:
+    bools = _bool_indexes(columns)
+    lines = []
+    for row in rows:
+        item = dict(zip(columns, row))
+        for i in bools:
+            item[columns[i]] = bool(row[i])
+        lines.append(json.dumps(item, ensure_ascii=False))
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(columns: Tuple[str, ...], rows: List[tuple], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def export_stream(storage: SQLiteStorage, table: str, fmt: str = "ndjson", chunk_size: int = 1000) -> Iterator[bytes]:
+    """Tabloyu NDJSON veya CSV parçaları olarak üretir (StreamingResponse gövdesi için)"""
+    if table not in EXPORTS:
+        raise ValueError(f"Bilinmeyen tablo: {table}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Bilinmeyen biçim: {fmt}")
+    _, columns = EXPORTS[table]
+    if fmt == "csv":
+        yield encode_csv(columns, [], header=True)
+    for rows in iter_chunks(storage, table, chunk_size):
+        yield encode_ndjson(columns, rows) if fmt == "ndjson" else encode_csv(columns, rows)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Toplu kitap içe aktarımı - CSV / NDJSON dosyalarından ağ sorgusu yapmadan
+
+Dosya akış halinde okunur; satırlar parça parça doğrulanır (ISBN kontrol basamakları
+isbn_validation.canonicalize_many ile parça başına tek geçişte denetlenir ve ISBN-13'e
+çevrilir; aynı kitabın ISBN-10 ve ISBN-13 satırları tek kayıt olur). Geçerli satırlar önce yazma bağlantısına ait geçici bir hazırlık
+tablosuna toplu eklenir, ardından büyük parçalar halinde books tablosuna birleştirilir
+(ekle-veya-güncelle). Birleştirme sırasında:
+- satır başına çalışan sürüm/değişiklik günlüğü tetikleyicileri, parçanın işlemi içinde
+  kaldırılıp sonunda yeniden oluşturulur; günlük kaydı küme tabanlı tek sorgu ile yapılır
+  (aynı işlemde olduğundan diğer bağlantılar tetikleyicisiz şemayı hiç görmez),
+- büyük içe aktarımlarda tüm parçalar tek işlemde birleştirilir; başlık indeksi bu işlemin
+  başında kaldırılıp sonunda bir kez yeniden kurulur. Diğer bağlantılar (WAL) işlem bitene
+  kadar indeksli eski durumu okur; süreç yarıda kalırsa işlem geri alınır ve indeks kaybolmaz.
+  Bu sırada yazma kilidi içe aktarım boyunca tutulur.
+
+Kullanım:
+    python -m importer kitaplar.csv --db app.db
+    python -m importer kitaplar.ndjson --batch-size 100000 --json
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from isbn_validation import canonicalize_many
+from models import Library
+
+
+DEFAULT_BATCH_SIZE = 100_000
+# Bu kadar satırdan büyük içe aktarımlarda başlık indeksi sonda yeniden kurulur
+DEFER_INDEX_THRESHOLD = 50_000
+MAX_ERROR_SAMPLES = 20
+COLUMNS = ("isbn", "title", "author")
+# Hazırlık tablosu paylaşılan yazma bağlantısına aittir; aynı anda tek içe aktarım
+_import_lock = threading.Lock()
+
+
+def detect_format(filename: str) -> str:
+    return "ndjson" if filename.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def iter_records(stream: TextIO, fmt: str = "csv") -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """(satır no, kayıt, hata) üçlüleri üretir
+
+    CSV'de ilk satır 'isbn' içeriyorsa başlık kabul edilir (sütun sırası serbest);
+    aksi halde sütunlar isbn, title, author sırasındadır.
+    """
+    if fmt == "ndjson":
+        for line_no, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"geçersiz JSON ({e.msg})"
+                continue
+            if not isinstance(item, dict):
+                yield line_no, None, "nesne bekleniyordu"
+                continue
+            yield line_no, item, None
+        return
+    reader = csv.reader(stream)
+    columns = COLUMNS
+    for row in reader:
+        if reader.line_num == 1 and any(cell.strip().lower() == "isbn" for cell in row):
+            columns = tuple(cell.strip().lower() for cell in row)
+            continue
+        if not row:
+            continue
+        yield reader.line_num, dict(zip(columns, row)), None
+
+
+def validate_batch(records: List[Tuple[int, dict]]) -> Tuple[List[tuple], List[Tuple[int, str]]]:
+    """(satır no, kayıt) listesini doğrular; (isbn, title, author) satırları ve
+    satır sırasıyla (satır no, hata nedeni) listesi döndürür"""
+    isbns = canonicalize_many([str(item.get("isbn") or "") for _, item in records])
+    rows, errors = [], []
+    for (line_no, item), isbn in zip(records, isbns):
+        title = str(item.get("title") or "").strip()
+        author = str(item.get("author") or "").strip()
+        if isbn is None:
+            errors.append((line_no, f"geçersiz ISBN: {item.get('isbn')!r}"))
+        elif not title:
+            errors.append((line_no, "başlık boş"))
+        elif not author:
+            errors.append((line_no, "yazar boş"))
+        else:
+            rows.append((isbn, title, author))
+    return rows, errors
+
+
+def bulk_import(library: Library, stream: TextIO, fmt: str = "csv", batch_size: int = DEFAULT_BATCH_SIZE,
+                dry_run: bool = False) -> dict:
+    """Akıştaki kitapları kataloğa ekler veya günceller; özet rapor döndürür
+
+    Aynı ISBN dosyada birden fazla kez geçerse son satır kullanılır.
+    """
+    if not library.use_sqlite:
+        raise ValueError("Toplu içe aktarım yalnızca SQLite modunda desteklenir")
+    if not _import_lock.acquire(blocking=False):
+        raise RuntimeError("Başka bir içe aktarım sürüyor")
+    try:
+        return _bulk_import(library, stream, fmt, batch_size, dry_run)
+    finally:
+        _import_lock.release()
+
+
+def _bulk_import(library: Library, stream: TextIO, fmt: str, batch_size: int, dry_run: bool) -> dict:
+    started = time.perf_counter()
+    report = {"rows": 0, "valid": 0, "invalid": 0, "duplicates": 0, "inserted": 0, "updated": 0,
+              "unchanged": 0, "batches": 0, "errors": [], "dry_run": dry_run}
+
+    def error(line_no: int, reason: str):
+        report["invalid"] += 1
+        if len(report["errors"]) < MAX_ERROR_SAMPLES:
+            report["errors"].append(f"satır {line_no}: {reason}")
+
+    with library._get_conn() as conn:
+        conn.execute("DROP TABLE IF EXISTS temp.import_staging")
+        conn.execute("CREATE TEMP TABLE import_staging (isbn TEXT PRIMARY KEY, title TEXT, author TEXT, op TEXT)")
+
+    # 1) Okuma ve doğrulama: satırlar parça parça doğrulanıp hazırlık tablosuna yazılır
+    pending = []
+
+    def flush():
+        rows, errors = validate_batch(pending)
+        for line_no, reason in errors:
+            error(line_no, reason)
+        report["valid"] += len(rows)
+        if rows:
+            _stage(library, rows)
+        pending.clear()
+
+    for line_no, item, problem in iter_records(stream, fmt):
+        report["rows"] += 1
+        if problem is not None:
+            # Okuma hataları sıralı kalsın diye bekleyen parça önce doğrulanır
+            flush()
+            error(line_no, problem)
+            continue
+        pending.append((line_no, item))
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+
+    with library._get_conn() as conn:
+        bounds = conn.execute("SELECT COUNT(*), MIN(rowid), MAX(rowid) FROM import_staging").fetchone()
+    unique, low, high = bounds
+    report["duplicates"] = report["valid"] - unique
+
+    def add_counts(counts: dict):
+        report["batches"] += 1
+        for op in ("inserted", "updated", "unchanged"):
+            report[op] += counts[op]
+
+    # 2) Birleştirme: küçük içe aktarımlarda her parça kendi işleminde; büyüklerde indeks
+    # kaldırma, tüm parçalar ve indeksin yeniden kurulması tek işlemde
+    defer_index = not dry_run and unique >= DEFER_INDEX_THRESHOLD
+    try:
+        if defer_index:
+            with library._get_conn() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DROP INDEX IF EXISTS idx_books_title")
+                for start in range(low, high + 1, batch_size):
+                    add_counts(_merge_rows(library, conn, start, start + batch_size - 1))
+                index_started = time.perf_counter()
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books (title)")
+                report["index_rebuild_s"] = round(time.perf_counter() - index_started, 3)
+        elif unique:
+            for start in range(low, high + 1, batch_size):
+                add_counts(_merge(library, start, start + batch_size - 1, dry_run))
+    finally:
+        with library._get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS temp.import_staging")
+
+    report["duration_s"] = round(time.perf_counter() - started, 3)
+    report["rows_per_s"] = round(report["rows"] / report["duration_s"]) if report["duration_s"] else 0
+    return report
+
+
+def _stage(library: Library, rows: list):
+    with library._get_conn() as conn:
+        conn.executemany(
+            "INSERT INTO import_staging (isbn, title, author) VALUES (?, ?, ?) "
+            "ON CONFLICT (isbn) DO UPDATE SET title = excluded.title, author = excluded.author",
+            rows,
+        )
+
+
+def _merge(library: Library, low: int, high: int, dry_run: bool) -> dict:
+    with library._get_conn() as conn:
+        # Tetikleyici değişikliği ve veri aynı işlemde: diğer bağlantılar ara durumu görmez
+        conn.execute("BEGIN IMMEDIATE")
+        counts = _merge_rows(library, conn, low, high, dry_run)
+        if dry_run or not (counts["inserted"] or counts["updated"]):
+            conn.rollback()
+    return counts
+
+
+def _merge_rows(library: Library, conn, low: int, high: int, dry_run: bool = False) -> dict:
+    """Hazırlık tablosunun [low, high] satırlarını açık işlem içinde books'a birleştirir
+
+    dry_run ise ya da değişen satır yoksa books'a yazılmaz; işlemi çağıran sonlandırır.
+    """
+    conn.execute(
+        """
+        UPDATE import_staging SET op = CASE COALESCE((
+            SELECT b.title = import_staging.title AND b.author = import_staging.author
+            FROM books b WHERE b.isbn = import_staging.isbn
+        ), -1) WHEN -1 THEN 'insert' WHEN 1 THEN NULL ELSE 'update' END
+        WHERE rowid BETWEEN ? AND ?
+        """,
+        (low, high),
+    )
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for op, count in conn.execute(
+        "SELECT op, COUNT(*) FROM import_staging WHERE rowid BETWEEN ? AND ? GROUP BY op", (low, high)
+    ):
+        counts[{"insert": "inserted", "update": "updated"}.get(op, "unchanged")] = count
+    if dry_run or not (counts["inserted"] or counts["updated"]):
+        return counts
+    library._drop_change_triggers(conn)
+    conn.execute(
+        """
+        INSERT INTO books (isbn, title, author)
+        SELECT isbn, title, author FROM import_staging WHERE rowid BETWEEN ? AND ? AND op IS NOT NULL
+        ON CONFLICT (isbn) DO UPDATE SET title = excluded.title, author = excluded.author,
+            author_key = CASE WHEN books.author = excluded.author THEN books.author_key END
+        """,
+        (low, high),
+    )
+    # Parça başına tek sürüm: istemciler parçanın tamamını tek adımda görür
+    conn.execute("UPDATE catalog_state SET version = version + 1 WHERE id = 1")
+    conn.execute(
+        """
+        INSERT INTO book_changes (isbn, version, op)
+        SELECT isbn, (SELECT version FROM catalog_state WHERE id = 1), op
+        FROM import_staging WHERE rowid BETWEEN ? AND ? AND op IS NOT NULL
+        ON CONFLICT (isbn) DO UPDATE SET version = excluded.version, op = excluded.op
+        """,
+        (low, high),
+    )
+    library._create_change_triggers(conn)
+    return counts
+
+
+def import_file(library: Library, path: str, fmt: Optional[str] = None, **kwargs) -> dict:
+    # utf-8-sig: Excel'in eklediği BOM başlık satırını bozmasın
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return bulk_import(library, f, fmt or detect_format(path), **kwargs)
+
+
+def import_bytes_file(library: Library, binary: io.BufferedIOBase, fmt: str, **kwargs) -> dict:
+    """İkili dosya nesnesinden (ör. yüklenen istek gövdesi) içe aktarır"""
+    stream = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    try:
+        return bulk_import(library, stream, fmt, **kwargs)
+    finally:
+        stream.detach()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="CSV / NDJSON dosyasından toplu kitap içe aktarımı (ağ sorgusu yok)")
+    parser.add_argument("file", help="CSV (isbn,title,author) veya NDJSON dosyası")
+    parser.add_argument("--db", default="app.db", help="SQLite veritabanı (varsayılan app.db)")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default=None, help="Varsayılan: dosya uzantısından")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="İşlem başına satır sayısı")
+    parser.add_argument("--dry-run", action="store_true", help="Yalnızca doğrula ve say, yazma")
+    parser.add_argument("--json", action="store_true", help="Raporu JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    library = Library(os.path.splitext(args.db)[0] + ".json", db_path=args.db)
+    try:
+        report = import_file(library, args.file, args.format, batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        library.storage.close()
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False))
+    else:
+        print(f"{report['rows']} satır okundu ({report['duration_s']} sn, {report['rows_per_s']} satır/sn): "
+              f"{report['inserted']} eklendi, {report['updated']} güncellendi, {report['unchanged']} değişmedi, "
+              f"{report['invalid']} geçersiz, {report['duplicates']} tekrar")
+        for line in report["errors"]:
+            print(f"  {line}")
+    return 1 if report["invalid"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+ISBN doğrulama ve standart biçim - kontrol basamağı doğrulaması ve ISBN-13'e çevirme
+
+Aynı kitabın ISBN-10 ve ISBN-13 biçimleri tek satırda tutulsun diye geçerli her ISBN
+ISBN-13 biçiminde saklanır (ISBN-10 -> 978 önekiyle ISBN-13). Kontrol basamağı tutmayan
+değerler ağa hiç gönderilmez.
+
+Toplu yollar (içe aktarım, çevrimdışı indeks) `canonicalize_many` ile değerleri tek
+geçişte doğrular. Ağırlıklı toplamlar basamak basamak değil, ASCII baytları üzerinde C
+düzeyinde hesaplanır:
+- ISBN-13: 1-3 ağırlıklı toplam = sum(tüm baytlar) + 2 * sum(tek konumlar); '0' ofseti
+  (48 * 25) 10'a bölündüğünden çıkarılmaz
+- ISBN-10: 10*d0 + 9*d1 + ... + 1*d9 = önek toplamlarının toplamı (accumulate);
+  X kontrol basamağı ':' (48 + 10) baytına çevrilir, ofset 48 * 55
+"""
+
+from itertools import accumulate
+from typing import Iterable, List, Optional
+
+
+_STRIP = str.maketrans("", "", "- ._")
+_ISBN13_PREFIXES = ("978", "979")
+# 12 basamaklı gövdede '0' ofseti: 48 * (12 + 2 * 6)
+_BODY_OFFSET = 48 * 24
+_ISBN10_OFFSET = 48 * 55
+
+
+def clean(raw: str) -> str:
+    """Tire, boşluk, nokta ve alt çizgileri kaldırır, büyük harfe çevirir"""
+    if not isinstance(raw, str):
+        return ""
+    return raw.translate(_STRIP).upper()
+
+
+def _check_digit13(body: bytes) -> str:
+    """12 basamaklı ASCII gövde için ISBN-13 kontrol basamağı"""
+    return str((_BODY_OFFSET - sum(body) - 2 * sum(body[1::2])) % 10)
+
+
+def canonicalize_many(values: Iterable[str]) -> List[Optional[str]]:
+    """Değerleri toplu doğrular; her biri için ISBN-13 ya da (geçersizse) None"""
+    result: List[Optional[str]] = []
+    append = result.append
+    for raw in values:
+        if type(raw) is not str:
+            append(None)
+            continue
+        # Noktalama içermeyen değerlerde (toplu dosyalarda olağan durum) temizlik atlanır
+        isbn = raw if raw.isalnum() else raw.translate(_STRIP)
+        size = len(isbn)
+        if size == 13:
+            if isbn.isdigit() and isbn.isascii() and isbn.startswith(_ISBN13_PREFIXES):
+                digits = isbn.encode()
+                if (sum(digits) + 2 * sum(digits[1::2])) % 10 == 0:
+                    append(isbn)
+                    continue
+        elif size == 10:
+            head, last = isbn[:9], isbn[9]
+            if head.isdigit() and head.isascii() and last in "0123456789Xx":
+                digits = (head + ":" if last in "Xx" else isbn).encode()
+                if (sum(accumulate(digits)) - _ISBN10_OFFSET) % 11 == 0:
+                    body = b"978" + digits[:9]
+                    append(body.decode() + _check_digit13(body))
+                    continue
+        append(None)
+    return result
+
+
+def canonicalize(raw: str) -> Optional[str]:
+    """Geçerli ISBN'i ISBN-13 olarak döndürür; kontrol basamağı tutmuyorsa None"""
+    return canonicalize_many((raw,))[0]
+
+
+def is_valid(raw: str) -> bool:
+    return canonicalize(raw) is not None
+
+
+def normalize(raw: str) -> str:
+    """Geçerliyse ISBN-13 biçimi, değilse yalnızca temizlenmiş değer
+
+    Doğrulamadan önce kaydedilmiş (kontrol basamağı tutmayan) kayıtlar bulunabilsin
+    diye geçersiz değerler reddedilmez; ağ ve içe aktarım yolları `canonicalize` kullanır.
+    """
+    isbn = clean(raw)
+    return canonicalize(isbn) or isbn
@@ -0,0 +1,206 @@
+"""
+Arka plan iş kuyruğu - SQLite'ta kalıcı, thread havuzu ile işlenen zenginleştirme işleri
+"""
+
+import json
+import secrets
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from storage import SQLiteStorage
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobQueue:
+    """Kalıcı iş kuyruğu
+
+    İşler `jobs` tablosuna tek bir yerel yazma ile kaydedilir; worker thread'leri
+    bekleyen işleri sırayla alıp kayıtlı handler'ı çalıştırır. Handler bir dict
+    döndürürse iş `done`, None döndürür veya hata fırlatırsa `failed` olur.
+    Sunucu yeniden başladığında yarım kalan (`running`) işler tekrar kuyruğa alınır.
+    """
+
+    def __init__(self, storage: SQLiteStorage, workers: int = 2, poll_interval: float = 1.0,
+                 lease_timeout: float = 300.0):
+        self.storage = storage
+        self.worker_count = max(1, workers)
+        self.poll_interval = poll_interval
+        # Bu süreden uzun süredir `running` olan işler terk edilmiş sayılır
+        self.lease_timeout = lease_timeout
+        self.handlers: Dict[str, Callable[[dict], Optional[dict]]] = {}
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._start_lock = threading.Lock()
+        self._last_recovery = 0.0
+        self._init_db()
+
+    def _init_db(self):
+        with self.storage.write() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+
+    def register(self, kind: str, handler: Callable[[dict], Optional[dict]]):
+        """Bir iş türü için handler kaydeder"""
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        """Yeni iş ekler ve iş kimliğini döndürür"""
+        if kind not in self.handlers:
+            raise ValueError(f"Bilinmeyen iş türü: {kind}")
+        job_id = secrets.token_urlsafe(12)
+        now = time.time()
+        with self.storage.write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), JOB_PENDING, now, now)
+            )
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """İş durumunu dict olarak döndürür"""
+        with self.storage.read() as conn:
+            row = conn.execute(
+                "SELECT id, kind, payload, status, result, error, attempts, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "payload": json.loads(row[2]),
+            "status": row[3],
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "attempts": row[6],
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        """Duruma göre iş sayıları"""
+        with self.storage.read() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        result = {JOB_PENDING: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        result.update({row[0]: row[1] for row in rows})
+        return result
+
+    def _recover_stale(self):
+        self._last_recovery = time.monotonic()
+        cutoff = time.time() - self.lease_timeout
+        with self.storage.write() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (JOB_PENDING, time.time(), JOB_RUNNING, cutoff)
+            )
+
+    def _claim(self) -> Optional[tuple]:
+        with self.storage.write() as conn:
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (JOB_PENDING,)
+            ).fetchone()
+            if not row:
+                return None
+            # Birden fazla süreç aynı dosyayı kullanıyorsa yalnızca biri işi alabilir
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ? AND status = ?",
+                (JOB_RUNNING, time.time(), row[0], JOB_PENDING)
+            )
+            if cur.rowcount == 0:
+                return None
+        return row
+
+    def _finish(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        with self.storage.write() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def run_pending(self, limit: Optional[int] = None) -> int:
+        """Bekleyen işleri çağıran thread'de işler (testler ve CLI için); işlenen sayısını döndürür"""
+        processed = 0
+        while limit is None or processed < limit:
+            job = self._claim()
+            if not job:
+                break
+            self._execute(job)
+            processed += 1
+        return processed
+
+    def _execute(self, job: tuple):
+        job_id, kind, payload = job
+        handler = self.handlers.get(kind)
+        if handler is None:
+            self._finish(job_id, JOB_FAILED, error=f"Bilinmeyen iş türü: {kind}")
+            return
+        try:
+            result = handler(json.loads(payload))
+        except Exception as e:
+            self._finish(job_id, JOB_FAILED, error=str(e))
+            return
+        if result is None:
+            self._finish(job_id, JOB_FAILED, error="Kitap bulunamadı veya eklenemedi")
+        else:
+            self._finish(job_id, JOB_DONE, result=result)
+
+    def _worker_loop(self):
+        while not self._stopping:
+            job = self._claim()
+            if job:
+                self._execute(job)
+                continue
+            # Boşta kalındığında terk edilmiş işleri ara sıra yeniden kuyruğa al
+            if time.monotonic() - self._last_recovery >= self.lease_timeout:
+                self._recover_stale()
+            with self._wakeup:
+                if self._stopping:
+                    break
+                self._wakeup.wait(self.poll_interval)
+
+    def start(self):
+        """Worker thread'lerini başlatır (zaten çalışıyorsa bir şey yapmaz)"""
+        with self._start_lock:
+            if self._threads:
+                return
+            self._stopping = False
+            self._recover_stale()
+            for i in range(self.worker_count):
+                t = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        """Worker thread'lerini durdurur"""
+        with self._start_lock:
+            self._stopping = True
+            with self._wakeup:
+                self._wakeup.notify_all()
+            for t in self._threads:
+                t.join(timeout)
+            self._threads = []
@@ -0,0 +1,82 @@
+"""
+Tembel başlatma - ağır bileşenler ilk kullanımda ya da arka planda oluşturulur
+
+API modülü içe aktarılırken veritabanı açılmaz ve Library / UserManager kurulmaz:
+- LazyComponent: ilk öznitelik erişiminde factory ile (thread güvenli, bir kez) oluşturulan
+  vekil. Modül değişkeni vekil olarak kaldığından handler'lar ve testlerin
+  patch("api.library", ...) kullanımı değişmez
+- warm_up: lifespan'de bileşenleri arka plan thread'lerinde ısıtır; sunucu bu sırada
+  bağlantı kabul eder, bileşene ilk erişen istek oluşturmanın bitmesini bekler
+"""
+
+import threading
+import time
+from typing import Callable, Generic, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+# Vekilin kendi alanları; __getattr__ bunları hedef nesneye iletmez
+_OWN_FIELDS = frozenset(("_name", "_factory", "_instance", "_loaded", "_lock", "load_seconds"))
+
+
+class LazyComponent(Generic[T]):
+    """İlk kullanımda oluşturulan bileşen vekili
+
+    Bilinmeyen öznitelikler (özel adlar dahil) oluşturulan nesneye iletilir; vekilin
+    kendisi yalnızca load(), loaded ve load_seconds sağlar.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self._name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Oluşturma süresi (saniye); henüz oluşturulmadıysa None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> T:
+        """Nesneyi döndürür; ilk çağrıda oluşturur (eşzamanlı çağıranlar bekler)"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    started = time.perf_counter()
+                    # factory hata verirse bileşen yüklenmemiş kalır, sonraki erişim tekrar dener
+                    self._instance = self._factory()
+                    self.load_seconds = time.perf_counter() - started
+                    self._loaded = True
+        return self._instance  # type: ignore[return-value]
+
+    def __getattr__(self, name: str):
+        if name in _OWN_FIELDS:
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._loaded else "pending"
+        return f"<LazyComponent {self._name} ({state})>"
+
+
+def warm_up(*chains: Sequence[Callable[[], object]], name: str = "warm-up") -> List[threading.Thread]:
+    """Her zinciri ayrı bir daemon thread'de sırayla çalıştırır; zincirler paralel ilerler
+
+    Başarısız adım yazdırılır ve zincirin kalanı atlanır; bileşen ilk istekte yeniden denenir.
+    """
+    def run(steps: Sequence[Callable[[], object]]):
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                print(f"Başlangıç ısıtması başarısız ({getattr(step, '__name__', step)}): {e}")
+                return
+
+    threads = [threading.Thread(target=run, args=(chain,), name=f"{name}-{i}", daemon=True)
+               for i, chain in enumerate(chains)]
+    for thread in threads:
+        thread.start()
+    return threads
@@ -2,8 +2,28 @@
 """
 Python 202 Bootcamp - Kütüphane Projesi
 Aşama 1 ve 2: Terminal Uygulaması
+
+Argümansız çalıştırıldığında etkileşimli menü açılır. Alt komutlarla betiklerden ve
+cron işlerinden kullanılabilir (--db ile SQLite veritabanı, --json ile makine çıktısı):
+    python main.py --db app.db add 978-0-441-17271-9 9780316769480
+    python main.py --db app.db add --from isbnler.txt --workers 8 --json
+    cat isbnler.txt | python main.py --db app.db add --from -
+    python main.py --db app.db remove --from silinecekler.txt
+    python main.py --db app.db list --author "Frank Herbert"
+    python main.py --db app.db find 9780441172719
+    python main.py --db app.db import kitaplar.csv
+    python main.py --db app.db export books --format csv --output kitaplar.csv
+Çıkış kodları: 0 başarılı, 1 bazı kayıtlar işlenemedi, 2 kullanım hatası.
 """
 
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, TextIO
+
+from isbn_validation import canonicalize_many
 from models import Library, Book
 
 
@@ -102,13 +122,8 @@ def find_book(library: Library):
         print("❌ Kitap bulunamadı.")
 
 
-def main():
-    """Ana uygulama döngüsü"""
-    print("Kütüphane Yönetim Sistemi başlatılıyor...")
-    
-    # Library nesnesini oluştur
-    library = Library()
-    
+def interactive(library: Library):
+    """Ana uygulama döngüsü (etkileşimli menü)"""
     print("✓ Kütüphane sistemi hazır!")
     
     while True:
@@ -141,8 +156,261 @@ def main():
             print("Lütfen tekrar deneyin.")
 
 
+# --- Toplu (etkileşimsiz) komutlar ---
+
+class Progress:
+    """stderr'e yazılan ilerleme çubuğu; stderr terminal değilse (cron, boru) sessizdir"""
+
+    def __init__(self, total: int, label: str, enabled: Optional[bool] = None,
+                 stream: Optional[TextIO] = None, width: int = 30):
+        self.total = total
+        self.label = label
+        self.stream = stream or sys.stderr
+        self.enabled = (self.stream.isatty() if enabled is None else enabled) and total > 0
+        self.width = width
+        self.done = 0
+        self.started = time.perf_counter()
+        self._drawn = 0.0
+
+    def advance(self, count: int = 1):
+        self.done += count
+        now = time.perf_counter()
+        # En fazla saniyede 10 kez çizilir
+        if self.enabled and (now - self._drawn >= 0.1 or self.done >= self.total):
+            self._drawn = now
+            filled = int(self.width * self.done / self.total)
+            rate = self.done / max(now - self.started, 1e-9)
+            self.stream.write(f"\r{self.label} [{'#' * filled}{'.' * (self.width - filled)}] "
+                              f"{self.done}/{self.total} ({rate:.1f}/sn)")
+            self.stream.flush()
+
+    def close(self):
+        if self.enabled:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def read_isbns(values: List[str], sources: List[str], stdin: Optional[TextIO] = None) -> List[str]:
+    """Argümanlardaki ve dosyalardaki ('-' = stdin) ISBN'leri okur
+
+    Dosyalarda satır başına ilk sözcük alınır; boş satırlar ve '#' ile başlayan
+    açıklamalar atlanır (ör. "978-0-441-17271-9  # Dune").
+    """
+    isbns = list(values)
+    for source in sources:
+        stream = (stdin or sys.stdin) if source == "-" else open(source, "r", encoding="utf-8-sig")
+        try:
+            for line in stream:
+                words = line.split("#", 1)[0].replace(",", " ").split()
+                if words:
+                    isbns.append(words[0])
+        finally:
+            if source != "-":
+                stream.close()
+    return isbns
+
+
+def _emit(args, payload, lines: List[str]):
+    if args.json:
+        print(json.dumps(payload, ensure_ascii=False))
+    else:
+        for line in lines:
+            print(line)
+
+
+def _require_sqlite(library: Library, command: str) -> bool:
+    if library.use_sqlite:
+        return True
+    print(f"❌ '{command}' komutu yalnızca SQLite ile çalışır (--db app.db).", file=sys.stderr)
+    return False
+
+
+def cmd_add(library: Library, args) -> int:
+    """ISBN'leri paralel çözer, her parçayı tek yazmada ekler"""
+    started = time.perf_counter()
+    raw = read_isbns(args.isbns, args.sources)
+    canonical = canonicalize_many(raw)
+    invalid = [value for value, isbn in zip(raw, canonical) if isbn is None]
+    unique = list(dict.fromkeys(isbn for isbn in canonical if isbn))
+    existing = [isbn for isbn in unique if library.find_book(isbn)]
+    known = set(existing)
+    todo = [isbn for isbn in unique if isbn not in known]
+
+    added: List[Book] = []
+    not_found: List[str] = []
+    progress = Progress(len(todo), "Çözümleniyor", enabled=args.progress)
+    # Open Library çağrıları paylaşılan korumadan geçer; eşzamanlılık sınırını aşan işçiler
+    # yalnızca bekleyip süre sınırına takılacağından işçi sayısı bu sınırla kırpılır
+    limit = library.outbound.max_concurrency
+    workers = max(1, min(args.workers or limit, limit))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(todo), args.batch_size):
+            batch = todo[start:start + args.batch_size]
+            found = []
+            for isbn, info in zip(batch, pool.map(library.lookup_isbn, batch)):
+                progress.advance()
+                if info:
+                    found.append((Book(title=info["title"], author=info["author"], isbn=isbn), info.get("author_key")))
+                else:
+                    not_found.append(isbn)
+            added.extend(library.add_books(found))
+    progress.close()
+
+    duration = round(time.perf_counter() - started, 3)
+    lines = [f"✓ Kitap başarıyla eklendi: {book}" for book in added]
+    lines += [f"❌ Kitap bulunamadı: {isbn}" for isbn in not_found]
+    lines += [f"❌ Geçersiz ISBN: {value}" for value in invalid]
+    lines.append(f"{len(raw)} ISBN: {len(added)} eklendi, {len(existing)} zaten mevcut, "
+                 f"{len(not_found)} bulunamadı, {len(invalid)} geçersiz, "
+                 f"{len(canonical) - len(invalid) - len(unique)} tekrar ({duration} sn)")
+    _emit(args, {
+        "requested": len(raw),
+        "added": [book.to_dict() for book in added],
+        "existing": existing,
+        "not_found": not_found,
+        "invalid": invalid,
+        "duplicates": len(canonical) - len(invalid) - len(unique),
+        "duration_s": duration,
+    }, lines)
+    return 1 if invalid or not_found else 0
+
+
+def cmd_remove(library: Library, args) -> int:
+    raw = read_isbns(args.isbns, args.sources)
+    removed = library.remove_books(raw)
+    gone = set(removed)
+    not_found = [isbn for isbn in dict.fromkeys(library._normalize_isbn(value) for value in raw) if isbn not in gone]
+    lines = [f"✓ Kitap başarıyla silindi: {isbn}" for isbn in removed]
+    lines += [f"❌ Kitap bulunamadı: {isbn}" for isbn in not_found]
+    _emit(args, {"removed": removed, "not_found": not_found}, lines)
+    return 1 if not_found else 0
+
+
+def cmd_list(library: Library, args) -> int:
+    books = library.books_by_author(args.author) if args.author else library.list_books()
+    lines = [f"{i}. {book}" for i, book in enumerate(books, 1)]
+    lines.append(f"Toplam {len(books)} kitap bulunuyor.")
+    _emit(args, [book.to_dict() for book in books], lines)
+    return 0
+
+
+def cmd_find(library: Library, args) -> int:
+    found = {isbn: library.find_book(isbn) for isbn in args.isbns}
+    lines = [f"✓ Kitap bulundu: {book}" if book else f"❌ Kitap bulunamadı: {isbn}" for isbn, book in found.items()]
+    _emit(args, {isbn: book.to_dict() if book else None for isbn, book in found.items()}, lines)
+    return 0 if all(found.values()) else 1
+
+
+def cmd_import(library: Library, args) -> int:
+    if not _require_sqlite(library, "import"):
+        return 2
+    from importer import import_file
+    options = {"dry_run": args.dry_run}
+    if args.batch_size:
+        options["batch_size"] = args.batch_size
+    report = import_file(library, args.file, args.format, **options)
+    lines = [f"{report['rows']} satır okundu ({report['duration_s']} sn, {report['rows_per_s']} satır/sn): "
+             f"{report['inserted']} eklendi, "
+             f"{report['updated']} güncellendi, {report['unchanged']} değişmedi, "
+             f"{report['invalid']} geçersiz, {report['duplicates']} tekrar"]
+    lines += [f"  {line}" for line in report["errors"]]
+    _emit(args, report, lines)
+    return 1 if report["invalid"] else 0
+
+
+def cmd_export(library: Library, args) -> int:
+    if not _require_sqlite(library, "export"):
+        return 2
+    from export import export_stream
+    written = 0
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in export_stream(library.storage, args.table, args.format, args.chunk_size):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+    if args.output:
+        _emit(args, {"table": args.table, "format": args.format, "output": args.output, "bytes": written},
+              [f"✓ {args.table} -> {args.output} ({written} bayt)"])
+    return 0
+
+
+COMMANDS = {
+    "add": cmd_add,
+    "remove": cmd_remove,
+    "list": cmd_list,
+    "find": cmd_find,
+    "import": cmd_import,
+    "export": cmd_export,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Kütüphane Yönetim Sistemi (argümansız: etkileşimli menü)")
+    parser.add_argument("--file", default="library.json", help="JSON kitap dosyası (varsayılan library.json)")
+    parser.add_argument("--db", help="SQLite veritabanı (ör. app.db); verilirse JSON yerine kullanılır")
+    parser.add_argument("--offline-index", help="Ağdan önce denenecek çevrimdışı Open Library indeksi")
+    parser.add_argument("--json", action="store_true", help="Sonucu JSON olarak yaz")
+    sub = parser.add_subparsers(dest="command")
+
+    def isbn_inputs(p):
+        p.add_argument("isbns", nargs="*", help="ISBN'ler")
+        p.add_argument("--from", dest="sources", action="append", default=[], metavar="DOSYA",
+                       help="Satır başına bir ISBN içeren dosya ('-' = stdin); birden fazla verilebilir")
+
+    p = sub.add_parser("add", help="ISBN'lerle kitap ekle (paralel çözümleme, parça başına tek yazma)")
+    isbn_inputs(p)
+    p.add_argument("--workers", type=int, default=None,
+                   help="Paralel çözümleme sayısı (varsayılan ve üst sınır KUTUPHANE_OPENLIBRARY_MAX_CONCURRENCY)")
+    p.add_argument("--batch-size", type=int, default=500, help="Tek yazmada eklenen kitap sayısı")
+    p.add_argument("--progress", action=argparse.BooleanOptionalAction, default=None,
+                   help="İlerleme çubuğu (varsayılan: stderr terminalse)")
+    p = sub.add_parser("remove", help="ISBN'lerle kitap sil (tek yazma)")
+    isbn_inputs(p)
+    p = sub.add_parser("list", help="Kitapları listele")
+    p.add_argument("--author", help="Yalnızca bu yazarın kitapları")
+    p = sub.add_parser("find", help="ISBN ile kitap ara")
+    p.add_argument("isbns", nargs="+", help="ISBN'ler")
+    p = sub.add_parser("import", help="CSV / NDJSON dosyasından toplu içe aktar (ağ sorgusu yok, --db gerekir)")
+    p.add_argument("file", help="CSV (isbn,title,author) veya NDJSON dosyası")
+    p.add_argument("--format", choices=("csv", "ndjson"), default=None, help="Varsayılan: dosya uzantısından")
+    p.add_argument("--batch-size", type=int, default=None, help="İşlem başına satır sayısı")
+    p.add_argument("--dry-run", action="store_true", help="Yalnızca doğrula ve say, yazma")
+    p = sub.add_parser("export", help="Tabloyu NDJSON / CSV olarak dışa aktar (--db gerekir)")
+    p.add_argument("table", choices=("books", "users", "user_books"))
+    p.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    p.add_argument("--output", help="Çıktı dosyası (varsayılan stdout)")
+    p.add_argument("--chunk-size", type=int, default=1000)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        print("Kütüphane Yönetim Sistemi başlatılıyor...")
+    offline = None
+    if args.offline_index:
+        from offline_index import OfflineIndex
+        offline = OfflineIndex.open(args.offline_index)
+    library = Library(args.file, db_path=args.db, offline_index=offline)
+    try:
+        if args.command is None:
+            interactive(library)
+            return 0
+        return COMMANDS[args.command](library, args)
+    finally:
+        if library.storage:
+            library.storage.close()
+        if offline is not None:
+            offline.close()
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
 """
 ISBN formatları:
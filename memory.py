@@ -0,0 +1,233 @@
+"""
+Bellek muhasebesi - büyük yapılar (katalog, kullanıcılar, önbellekler, token deposu) için
+boyut tahmini, isteğe bağlı boyut bütçeleri ve tracemalloc fark anlık görüntüleri
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+import types
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Paylaşılan/tekil nesneler ölçüme dahil edilmez
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, threading.Lock().__class__, threading.RLock().__class__)
+
+
+def _slot_names(cls) -> List[str]:
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(s for s in slots if s not in ("__dict__", "__weakref__"))
+    return names
+
+
+def deep_sizeof(obj) -> int:
+    """Nesnenin ve erişilebilir alt nesnelerinin toplam boyutu (bayt)
+
+    Aynı nesne birden fazla kez referanslanıyorsa (ör. intern edilmiş yazar adları)
+    yalnızca bir kez sayılır. Değerler tahminidir; allocator ek yükü dahil değildir.
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES) or current is None:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, (str, bytes, int, float, bool)):
+            continue
+        if isinstance(current, dict):
+            for key, value in list(current.items()):
+                stack.append(key)
+                stack.append(value)
+            continue
+        if isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(list(current))
+            continue
+        instance_dict = getattr(current, "__dict__", None)
+        if instance_dict is not None:
+            stack.append(instance_dict)
+        for name in _slot_names(type(current)):
+            value = getattr(current, name, None)
+            if value is not None:
+                stack.append(value)
+    return total
+
+
+def process_memory() -> dict:
+    """Sürecin anlık ve en yüksek RSS değerleri (bayt; desteklenmiyorsa None)"""
+    rss = None
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux KB, macOS bayt döndürür
+        peak = peak if sys.platform == "darwin" else peak * 1024
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+class MemoryAccountant:
+    """Kayıtlı yapıların boyutlarını ölçer ve bütçe aşımlarında uyarı yazar"""
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None):
+        self.budgets: Dict[str, int] = dict(budgets or {})
+        self._sources: Dict[str, Callable[[], object]] = {}
+        self._over_budget: set = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "KUTUPHANE_MEMORY_BUDGET_") -> 'MemoryAccountant':
+        """KUTUPHANE_MEMORY_BUDGET_<YAPI>_MB ortam değişkenlerinden bütçeleri okur
+
+        Örnek: KUTUPHANE_MEMORY_BUDGET_CATALOG_MB=64
+        """
+        budgets = {}
+        for key, value in os.environ.items():
+            if not key.startswith(prefix) or not key.endswith("_MB"):
+                continue
+            name = key[len(prefix):-3].lower()
+            try:
+                budgets[name] = int(float(value) * 1024 * 1024)
+            except ValueError:
+                continue
+        return cls(budgets)
+
+    def register(self, name: str, source: Callable[[], object], budget_bytes: Optional[int] = None):
+        """Ölçülecek bir yapı ekler; `source` ölçüm anında yapıyı döndürür"""
+        def measure_source() -> Tuple[int, Optional[int]]:
+            obj = source()
+            try:
+                size = deep_sizeof(obj)
+            except RuntimeError:
+                # Ölçüm sırasında başka bir thread yapıyı değiştirdi; bir kez daha dene
+                size = deep_sizeof(obj)
+            return size, (len(obj) if hasattr(obj, "__len__") else None)
+
+        self.register_measured(name, measure_source, budget_bytes)
+
+    def register_measured(self, name: str, measure: Callable[[], Tuple[int, Optional[int]]],
+                          budget_bytes: Optional[int] = None):
+        """Boyutunu kendisi bildiren bir yapı ekler; `measure` (bayt, öğe sayısı) döndürür
+
+        Python nesnesi olarak tutulmayan yapılar (ör. mmap'lenmiş katalog) için kullanılır.
+        """
+        self._sources[name] = measure
+        if budget_bytes is not None:
+            self.budgets[name] = budget_bytes
+
+    def measure(self) -> List[dict]:
+        """Kayıtlı her yapının boyut tahmini (bütçe aşımları uyarı olarak yazılır)"""
+        result = []
+        for name, measure in list(self._sources.items()):
+            size, items = measure()
+            budget = self.budgets.get(name)
+            over = budget is not None and size > budget
+            result.append({
+                "name": name,
+                "bytes": size,
+                "items": items,
+                "budget_bytes": budget,
+                "over_budget": over,
+            })
+            self._check_budget(name, size, budget, over)
+        return result
+
+    def _check_budget(self, name: str, size: int, budget: Optional[int], over: bool):
+        with self._lock:
+            if over and name not in self._over_budget:
+                self._over_budget.add(name)
+                print(f"UYARI: '{name}' bellek bütçesini aştı: {size / 1048576:.1f} MB > {budget / 1048576:.1f} MB")
+            elif not over:
+                self._over_budget.discard(name)
+
+    def start_monitor(self, interval: float = 300.0):
+        """Bütçe tanımlıysa yapıları periyodik olarak ölçen arka plan thread'ini başlatır"""
+        if not self.budgets or (self._monitor and self._monitor.is_alive()):
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.measure()
+
+        self._monitor = threading.Thread(target=loop, name="memory-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop_monitor(self):
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=5)
+            self._monitor = None
+
+
+class SnapshotTracker:
+    """İsteğe bağlı tracemalloc izleme; her anlık görüntü bir öncekiyle karşılaştırılır
+
+    tracemalloc açıkken her bellek ayırma izlendiğinden yalnızca inceleme sırasında açılır.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def snapshot(self, limit: int = 20, key_type: str = "lineno") -> dict:
+        """Yeni anlık görüntü alır; öncekine göre en çok büyüyen konumları döndürür
+
+        İzleme kapalıysa açılır ve ilk görüntü taban olarak kaydedilir.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._previous = None
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+            previous, self._previous = self._previous, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        result = {"traced_bytes": current, "traced_peak_bytes": peak, "baseline": previous is None, "top": []}
+        if previous is None:
+            return result
+        for stat in snapshot.compare_to(previous, key_type)[:limit]:
+            frame = stat.traceback[0]
+            result["top"].append({
+                "location": f"{frame.filename}:{frame.lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            })
+        return result
+
+    def stop(self):
+        with self._lock:
+            self._previous = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
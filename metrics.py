@@ -0,0 +1,262 @@
+"""
+Metrik alt sistemi - sayaç, histogram ve gauge'lar; Prometheus metin formatında dışa aktarım
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Gecikme histogramları için varsayılan kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: tuple = ()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: tuple = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Anlık değer"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, labels: tuple = ()):
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Sabit kovalı histogram (kümülatif olmayan sayaçlar tutulur, çıktıda kümülatife çevrilir)"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiketler -> [kova sayaçları..., +Inf sayacı, toplam]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = [0] * (len(self.buckets) + 1) + [0.0]
+                self._values[labels] = row
+            row[idx] += 1
+            row[-1] += value
+
+    def count(self, labels: tuple = ()) -> int:
+        row = self._values.get(labels)
+        return sum(row[:-1]) if row else 0
+
+    def sum(self, labels: tuple = ()) -> float:
+        row = self._values.get(labels)
+        return row[-1] if row else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for labels, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += count
+                le = _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+# Toplama anında hesaplanan metrikler: (ad, tür, açıklama, [(etiketler, değer), ...])
+CollectorResult = Iterable[Tuple[str, str, str, Iterable[Tuple[Dict[str, str], float]]]]
+
+
+class Registry:
+    """Metriklerin ve toplama anı collector'larının kaydı"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], CollectorResult]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, key: str, collector: Callable[[], CollectorResult]):
+        """Scrape anında çağrılacak bir fonksiyon kaydeder (aynı anahtar yeniden kaydedilirse değiştirilir)"""
+        with self._lock:
+            self._collectors[key] = collector
+
+    def render(self) -> str:
+        """Prometheus metin formatı (text/plain; version=0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                continue
+            for name, type_name, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for labels, value in samples:
+                    names = tuple(labels.keys())
+                    values = tuple(labels.values())
+                    lines.append(f"{name}{_format_labels(names, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Paylaşılan metrikler
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP istek süresi (rota şablonuna göre)", ("method", "route", "status"))
+SQLITE_STATEMENT_DURATION = REGISTRY.histogram(
+    "sqlite_statement_duration_seconds", "SQLite ifade çalıştırma süresi", ("statement",))
+SQLITE_WRITE_LOCK_WAIT = REGISTRY.histogram(
+    "sqlite_write_lock_wait_seconds", "Yazma bağlantısı kilidi için bekleme süresi")
+OPENLIBRARY_REQUEST_DURATION = REGISTRY.histogram(
+    "openlibrary_request_duration_seconds", "Open Library HTTP çağrı süresi", ("endpoint",))
+OPENLIBRARY_RESPONSES = REGISTRY.counter(
+    "openlibrary_responses_total", "Open Library yanıtları (durum koduna göre)", ("endpoint", "status"))
+
+
+_statement_labels: Dict[str, str] = {}
+
+
+def statement_label(sql: str) -> str:
+    """SQL metnini düşük kardinaliteli bir etikete çevirir (ör. 'SELECT books')"""
+    label = _statement_labels.get(sql)
+    if label is not None:
+        return label
+    tokens = sql.split()
+    verb = tokens[0].upper() if tokens else "?"
+    table = "?"
+    upper = [t.upper() for t in tokens]
+    for keyword in ("FROM", "INTO", "UPDATE", "EXISTS", "TABLE", "ON"):
+        if keyword in upper:
+            i = upper.index(keyword)
+            if i + 1 < len(tokens):
+                table = tokens[i + 1].strip("(").split("(")[0]
+                break
+    if verb == "PRAGMA" and len(tokens) > 1:
+        table = tokens[1].split("=")[0].split("(")[0]
+    label = f"{verb} {table}"
+    # Dinamik SQL'lerde sözlüğün sınırsız büyümesini önle
+    if len(_statement_labels) < 1000:
+        _statement_labels[sql] = label
+    return label
+
+
+class MetricsMiddleware:
+    """ASGI middleware: istek süresini rota şablonu, metot ve durum koduna göre kaydeder"""
+
+    def __init__(self, app, histogram: Histogram = HTTP_REQUEST_DURATION):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or ("/static" if scope["path"].startswith("/static/") else "unmatched")
+            self.histogram.observe(
+                time.perf_counter() - start,
+                (scope["method"], path, str(status_holder[0])),
+            )
@@ -1,17 +1,91 @@
 import json
-import httpx
 import sqlite3
 import os
-from typing import List, Optional, Dict, Tuple
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional, Dict, Tuple
+from storage import SQLiteStorage, StorageProfile
+from catalog_store import ColumnarCatalog
+from memory import deep_sizeof
+from offline_index import OfflineIndex
+from isbn_validation import canonicalize, normalize as normalize_isbn
+from resolver import AuthorCache, BookResolver, MetadataCache
+from outbound import OutboundGuard, OutboundRejected
+from metrics import OPENLIBRARY_REQUEST_DURATION, OPENLIBRARY_RESPONSES
+from tracing import span
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# Open Library çağrıları tüm Library örnekleri arasında ortak bir koruma ile sınırlandırılır
+openlibrary_guard = OutboundGuard.from_env()
+# Yük testleri için yerel bir taklit sunucuya yönlendirilebilir (bkz. benchmarks/openlibrary_stub.py)
+OPENLIBRARY_URL = os.environ.get("KUTUPHANE_OPENLIBRARY_URL", "https://openlibrary.org").rstrip("/")
+
+
+def __getattr__(name: str):
+    # httpx (~100 ms) ilk Open Library çağrısında içe aktarılır; models.httpx erişimi
+    # (ör. patch("models.httpx.Client")) modülü o anda yükler
+    if name == "httpx":
+        import httpx
+        return httpx
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _observe_openlibrary(endpoint: str, status: str, started: float):
+    """Open Library çağrısının süresini ve durum kodunu metriklere yazar"""
+    OPENLIBRARY_REQUEST_DURATION.observe(time.perf_counter() - started, (endpoint,))
+    OPENLIBRARY_RESPONSES.inc(1, (endpoint, status))
+
+
+def _file_version(path: str) -> int:
+    """JSON modunda sürüm: dosyanın son değişiklik zamanı (ns); dosya yoksa 0"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _migrate_isbn13(conn, table: str):
+    """Tablodaki geçerli ISBN-10 anahtarlarını bir kez ISBN-13'e çevirir
+
+    Aynı kitabın iki biçimi birden varsa ISBN-13 satırı korunur, ISBN-10 satırı silinir.
+    Yapılan geçişler isbn_migrations tablosunda tutulur; sonraki açılışlarda tarama yapılmaz.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS isbn_migrations (name TEXT PRIMARY KEY)")
+    if conn.execute("SELECT 1 FROM isbn_migrations WHERE name = ?", (table,)).fetchone():
+        return
+    conn.create_function("isbn13", 1, canonicalize, deterministic=True)
+    conn.execute(
+        f"UPDATE OR IGNORE {table} SET isbn = isbn13(isbn) WHERE length(isbn) = 10 AND isbn13(isbn) IS NOT NULL"
+    )
+    conn.execute(f"DELETE FROM {table} WHERE length(isbn) = 10 AND isbn13(isbn) IS NOT NULL")
+    conn.execute("INSERT INTO isbn_migrations (name) VALUES (?)", (table,))
 
 
 class Book:
-    """Kitap sınıfı - her bir kitabı temsil eder"""
+    """Kitap sınıfı - her bir kitabı temsil eder
+
+    Milyonlarca kayıtta nesne başı yükü düşük tutmak için __slots__ kullanır;
+    yazar adları intern edilir, böylece aynı yazarın kitapları tek bir string paylaşır.
+    """
+
+    __slots__ = ("title", "_author", "isbn")
     
     def __init__(self, title: str, author: str, isbn: str):
         self.title = title
         self.author = author
         self.isbn = isbn
+
+    @property
+    def author(self) -> str:
+        return self._author
+
+    @author.setter
+    def author(self, value: str):
+        self._author = sys.intern(value) if type(value) is str else value
     
     def __str__(self) -> str:
         """Kitap bilgilerini okunaklı formatta döndürür"""
@@ -21,7 +95,7 @@ class Book:
         """Kitap nesnesini dictionary formatına çevirir"""
         return {
             "title": self.title,
-            "author": self.author,
+            "author": self._author,
             "isbn": self.isbn
         }
     
@@ -39,23 +113,69 @@ class Library:
     """Kütüphane sınıfı - tüm kütüphane operasyonlarını yönetir
 
     SQLite desteği: db_path verildiğinde JSON yerine SQLite kullanılır.
+    catalog_path verilirse (yalnızca SQLite) okuma yolları mmap'lenmiş sütun tabanlı
+    katalogdan karşılanır; katalog sürümü veritabanının gerisinde kaldığında (bu süreçte
+    ya da başka bir işçi / CLI / içe aktarıcı tarafından yapılan yazma) okumalar SQLite'a
+    döner ve katalog arka planda yeniden oluşturulur (bkz. _fresh_catalog).
+    `books` bellek listesi yalnızca JSON modunda tutulur; SQLite modunda okuma yolları
+    veritabanından (ya da katalogdan) karşılanır ve `books` her erişimde list_books()
+    ile okunan yeni bir liste döndürür (listeyi değiştirmek kataloğu değiştirmez).
+    offline_index verilirse ISBN ile eklemede Open Library'den önce çevrimdışı indekse bakılır.
+    Yazar anahtarı -> ad eşlemesi `authors` önbelleğinde tutulur; bilinen yazarlar için
+    Open Library'ye ikinci istek yapılmaz.
     """
     
-    def __init__(self, filename: str = "library.json", db_path: Optional[str] = None):
+    def __init__(self, filename: str = "library.json", db_path: Optional[str] = None,
+                 storage_profile: Optional[StorageProfile] = None, catalog_path: Optional[str] = None,
+                 offline_index: Optional[OfflineIndex] = None):
         self.filename = filename
+        self.offline = offline_index
         self.db_path = db_path
         self.use_sqlite = bool(db_path)
-        self.books: List[Book] = []
+        self._books: List[Book] = []
+        self.outbound = openlibrary_guard
+        self.storage: Optional[SQLiteStorage] = None
+        self.catalog_path = catalog_path if self.use_sqlite else None
+        self.catalog: Optional[ColumnarCatalog] = None
+        # Aynı anda tek yeniden oluşturma; başarısız olan sürüm değişene kadar tekrar denenmez
+        self._catalog_build_lock = threading.Lock()
+        self._catalog_state_lock = threading.Lock()
+        self._catalog_thread: Optional[threading.Thread] = None
+        self._catalog_failed_version: Optional[int] = None
+        self._closed = False
+        if self.use_sqlite:
+            self.storage = SQLiteStorage(db_path, storage_profile)
+        self.authors = AuthorCache(self.storage)
         if self.use_sqlite:
             self._init_db()
             self._migrate_json_to_sqlite_if_needed()
-            self.load_books()
+            if self.catalog_path:
+                self._open_catalog()
+            # Okuma yolları her istekte veritabanını sorgular; tüm tabloyu açılışta belleğe
+            # almak yalnızca başlangıcı uzatırdı (100k kitapta ~0.5 sn)
         else:
             self.load_books()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        assert self.db_path
-        return sqlite3.connect(self.db_path)
+    @property
+    def books(self) -> List[Book]:
+        """JSON modunda bellek listesi; SQLite modunda veritabanından okunan kopya"""
+        if self.use_sqlite:
+            return self.list_books()
+        return self._books
+
+    @books.setter
+    def books(self, books: List[Book]):
+        self._books = books
+
+    def _get_conn(self):
+        """Yazma bağlantısı (kilitli, çıkışta commit edilir)"""
+        assert self.storage
+        return self.storage.write()
+
+    def _get_read_conn(self):
+        """Salt-okunur sorgu bağlantısı (thread başına ayrı)"""
+        assert self.storage
+        return self.storage.read()
 
     def _init_db(self):
         with self._get_conn() as conn:
@@ -68,11 +188,277 @@ class Library:
                 )
                 """
             )
+            # list_books / load_books ORDER BY title için geçici sıralama gerektirmez
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books (title)")
+            # Open Library yazar anahtarı (authors tablosuna referans; bilinmiyorsa NULL)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+            if "author_key" not in columns:
+                conn.execute("ALTER TABLE books ADD COLUMN author_key TEXT")
+            # books_by_author: WHERE author = ? ORDER BY title
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_books_author ON books (author, title)")
+            # Katalog sürümü: books tablosundaki her değişiklikte tetikleyicilerle artırılır
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS catalog_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("INSERT OR IGNORE INTO catalog_state (id, version) VALUES (1, 0)")
+            # Değişiklik günlüğü: ISBN başına yalnızca son değişiklik tutulur (anahtar bazlı
+            # sıkıştırma); silinen kitaplar op='delete' mezar taşı olarak kalır
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS book_changes (
+                    isbn TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    op TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_book_changes_version ON book_changes (version)")
+            # Mezar taşları silindiğinde bu sürümden eski istemciler tam eşitleme yapmalıdır
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS book_changes_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    compacted_version INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("INSERT OR IGNORE INTO book_changes_state (id, compacted_version) VALUES (1, 0)")
+            # Günlükten önce var olan kitaplar mevcut sürümle bir kez günlüğe yazılır
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO book_changes (isbn, version, op)
+                SELECT isbn, (SELECT version FROM catalog_state WHERE id = 1), 'insert' FROM books
+                WHERE NOT EXISTS (SELECT 1 FROM book_changes)
+                """
+            )
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                # Sürüm artışı ve günlük kaydı artık tek tetikleyicide (bkz. _create_change_triggers)
+                conn.execute(f"DROP TRIGGER IF EXISTS books_version_{event.lower()}")
+            self._create_change_triggers(conn)
+            # Doğrulamadan önce ISBN-10 olarak kaydedilmiş kitaplar (değişiklik günlüğüne yazılır)
+            _migrate_isbn13(conn, "books")
+            conn.commit()
+
+    @staticmethod
+    def _create_change_triggers(conn):
+        """books tablosunun sürüm ve değişiklik günlüğü tetikleyicilerini oluşturur
+
+        Sürüm artışı ve günlük kaydı aynı tetikleyicide yapılır: aynı olaydaki birden
+        fazla tetikleyicinin çalışma sırası garanti değildir.
+        """
+        for event, row, op in (("INSERT", "NEW", "insert"), ("UPDATE", "NEW", "update"), ("DELETE", "OLD", "delete")):
+            renamed = ""
+            if event == "UPDATE":
+                renamed = """
+                    INSERT INTO book_changes (isbn, version, op)
+                    SELECT OLD.isbn, version, 'delete' FROM catalog_state WHERE id = 1 AND OLD.isbn <> NEW.isbn
+                    ON CONFLICT (isbn) DO UPDATE SET version = excluded.version, op = excluded.op;
+                """
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS books_changes_{event.lower()} AFTER {event} ON books
+                BEGIN
+                    UPDATE catalog_state SET version = version + 1 WHERE id = 1;
+                    INSERT INTO book_changes (isbn, version, op)
+                    SELECT {row}.isbn, version, '{op}' FROM catalog_state WHERE id = 1
+                    ON CONFLICT (isbn) DO UPDATE SET version = excluded.version, op = excluded.op;
+                    {renamed}
+                END
+                """
+            )
+
+    @staticmethod
+    def _drop_change_triggers(conn):
+        """Toplu içe aktarım sırasında satır başına tetikleyici maliyetini kaldırmak için"""
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS books_changes_{event}")
+
+    def catalog_version(self) -> int:
+        """books tablosunun değişiklik sürümü (JSON modunda dosyanın değişiklik zamanı)"""
+        if not self.use_sqlite:
+            return _file_version(self.filename)
+        with self._get_read_conn() as conn:
+            row = conn.execute("SELECT version FROM catalog_state WHERE id = 1").fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, since: int, limit: int = 1000) -> dict:
+        """Verilen sürümden sonraki katalog değişikliklerini sürüm sırasıyla döndürür
+
+        Her ISBN için yalnızca son değişiklik döner: op 'insert' / 'update' (istemci
+        tarafından ekle-veya-değiştir olarak uygulanır, kitap alanları ile) ya da 'delete'.
+        reset=True ise istemcinin kopyası günlükten kurtarılamaz (sıkıştırılmış mezar taşları,
+        bilinmeyen sürüm ya da JSON modu); GET /books ile tam eşitleme yapılmalıdır.
+        has_more=True ise kalan değişiklikler için dönen version ile tekrar çağrılır.
+        """
+        if not self.use_sqlite:
+            version = _file_version(self.filename)
+            return {"version": version, "reset": since != version, "has_more": False, "changes": []}
+        with self._get_read_conn() as conn:
+            # Sürüm ve değişiklikler aynı okuma işleminden (tutarlı anlık görüntü) okunur
+            conn.execute("BEGIN")
+            try:
+                version = conn.execute("SELECT version FROM catalog_state WHERE id = 1").fetchone()[0]
+                compacted = conn.execute("SELECT compacted_version FROM book_changes_state WHERE id = 1").fetchone()[0]
+                if since < compacted or since > version:
+                    return {"version": version, "reset": True, "has_more": False, "changes": []}
+                rows = conn.execute(
+                    """
+                    SELECT c.version, c.op, c.isbn, b.title, b.author
+                    FROM book_changes c LEFT JOIN books b ON b.isbn = c.isbn
+                    WHERE c.version > ? ORDER BY c.version LIMIT ?
+                    """,
+                    (since, limit + 1),
+                ).fetchall()
+            finally:
+                conn.execute("COMMIT")
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        changes = []
+        for row_version, op, isbn, title, author in rows:
+            change = {"version": row_version, "op": op, "isbn": isbn}
+            if op != "delete":
+                change["title"] = title
+                change["author"] = author
+            changes.append(change)
+        return {
+            "version": rows[-1][0] if has_more else version,
+            "reset": False,
+            "has_more": has_more,
+            "changes": changes,
+        }
+
+    def compact_changes(self, retain: int = 10000) -> dict:
+        """Son `retain` sürümden eski mezar taşlarını siler
+
+        Ekleme/güncelleme kayıtları ISBN başına zaten tektir; sıkıştırma yalnızca silinen
+        kitapların kayıtlarını temizler. Sıkıştırılan sürümden eski istemciler reset alır.
+        """
+        if not self.use_sqlite:
+            return {"removed": 0, "compacted_version": 0}
+        with self._get_conn() as conn:
+            version = conn.execute("SELECT version FROM catalog_state WHERE id = 1").fetchone()[0]
+            cutoff = version - max(0, retain)
+            newest = conn.execute(
+                "SELECT MAX(version) FROM book_changes WHERE op = 'delete' AND version <= ?", (cutoff,)
+            ).fetchone()[0]
+            removed = 0
+            if newest is not None:
+                removed = conn.execute(
+                    "DELETE FROM book_changes WHERE op = 'delete' AND version <= ?", (cutoff,)
+                ).rowcount
+                conn.execute(
+                    "UPDATE book_changes_state SET compacted_version = MAX(compacted_version, ?) WHERE id = 1",
+                    (newest,),
+                )
+            compacted = conn.execute("SELECT compacted_version FROM book_changes_state WHERE id = 1").fetchone()[0]
             conn.commit()
+        return {"removed": removed, "compacted_version": compacted}
+
+    def _open_catalog(self):
+        """Sütun tabanlı katalog dosyasını açar; yoksa veya eskiyse yeniden oluşturur"""
+        try:
+            catalog = ColumnarCatalog.open(self.catalog_path)
+        except (OSError, ValueError):
+            catalog = None
+        if catalog is not None and catalog.version == self.catalog_version():
+            self.catalog = catalog
+            return
+        if catalog is not None:
+            catalog.close()
+        self.rebuild_catalog()
+
+    def rebuild_catalog(self) -> Optional[ColumnarCatalog]:
+        """books tablosundan sütun tabanlı katalog dosyasını yeniden üretir ve mmap ile açar"""
+        if not self.catalog_path:
+            return None
+        with self._catalog_build_lock:
+            with self._get_read_conn() as conn:
+                # Sürüm ve satırlar aynı okuma işleminden (tutarlı anlık görüntü) okunur
+                conn.execute("BEGIN")
+                try:
+                    version = conn.execute("SELECT version FROM catalog_state WHERE id = 1").fetchone()[0]
+                    rows = conn.execute("SELECT title, author, isbn FROM books").fetchall()
+                finally:
+                    conn.execute("COMMIT")
+            try:
+                ColumnarCatalog.build(rows, version).save(self.catalog_path)
+                catalog = ColumnarCatalog.open(self.catalog_path)
+            except (OSError, ValueError) as e:
+                print(f"Sütun tabanlı katalog oluşturulamadı, SQLite kullanılacak: {e}")
+                self._catalog_failed_version = version
+                return None
+            # Eski katalogu kullanan okuyucular olabileceğinden kapatılmaz; referans bırakılır
+            self.catalog = catalog
+            return catalog
+
+    def _fresh_catalog(self) -> Optional[ColumnarCatalog]:
+        """Veritabanı sürümüyle eşleşen katalog; yoksa ya da eskiyse None
+
+        Sürüm her okumada catalog_state'ten (tek satırlık birincil anahtar sorgusu) okunur;
+        böylece başka süreçlerin yazmaları da fark edilir. Eski katalog bulunduğunda çağıran
+        SQLite'tan okur ve yeniden oluşturma arka planda başlatılır.
+        """
+        if not self.catalog_path:
+            return None
+        catalog = self.catalog
+        version = self.catalog_version()
+        if catalog is not None and catalog.version == version:
+            return catalog
+        self._schedule_catalog_rebuild(version)
+        return None
+
+    def _schedule_catalog_rebuild(self, version: int):
+        with self._catalog_state_lock:
+            if self._closed:
+                return
+            if self._catalog_thread is not None and self._catalog_thread.is_alive():
+                return
+            if version == self._catalog_failed_version:
+                return
+            self._catalog_thread = threading.Thread(
+                target=self._rebuild_catalog_in_background, name="catalog-rebuild", daemon=True
+            )
+            self._catalog_thread.start()
+
+    def _rebuild_catalog_in_background(self):
+        try:
+            self.rebuild_catalog()
+        except Exception as e:
+            # Depo kapatılmış olabilir (kapanış sırasında); okumalar SQLite'tan devam eder
+            print(f"Sütun tabanlı katalog arka planda oluşturulamadı: {e}")
+
+    def close(self):
+        """Arka plandaki katalog oluşturmayı bekler; katalogu ve veritabanını kapatır"""
+        with self._catalog_state_lock:
+            self._closed = True
+            thread = self._catalog_thread
+        # Kapanan veritabanına yazmaya çalışan bir oluşturma thread'i bırakılmaz
+        if thread is not None:
+            thread.join()
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
+        if self.storage is not None:
+            self.storage.close()
+
+    def catalog_status(self) -> dict:
+        """Sütun tabanlı katalog durumu (/health için)"""
+        catalog = self.catalog
+        return {
+            "enabled": bool(self.catalog_path),
+            "active": self._fresh_catalog() is not None,
+            "version": catalog.version if catalog is not None else None,
+            "rebuilding": self._catalog_thread is not None and self._catalog_thread.is_alive(),
+        }
 
     def _migrate_json_to_sqlite_if_needed(self):
         # Eğer DB boşsa ve JSON dosyası varsa içeri aktarmayı dene
-        with self._get_conn() as conn:
+        with self._get_read_conn() as conn:
             cur = conn.execute("SELECT COUNT(*) FROM books")
             count = cur.fetchone()[0]
         if count == 0 and os.path.exists(self.filename):
@@ -96,15 +482,14 @@ class Library:
                 pass
     
     def _normalize_isbn(self, isbn: str) -> str:
-        """ISBN değerini standartlaştırır (tire, boşluk ve nokta işaretlerini kaldırır)."""
+        """ISBN değerini standartlaştırır: tire, boşluk, nokta ve alt çizgileri kaldırır;
+        kontrol basamağı geçerliyse ISBN-13 biçimine çevirir (bkz. isbn_validation)."""
         if not isinstance(isbn, str):
             return ""
-        # Tüm tire, boşluk, nokta ve alt çizgileri kaldır
-        normalized = isbn.replace("-", "").replace(" ", "").replace(".", "").replace("_", "").upper()
-        return normalized
+        return normalize_isbn(isbn)
     
-    def add_book(self, book: Book) -> bool:
-        """Yeni bir kitabı kütüphaneye ekler"""
+    def add_book(self, book: Book, author_key: Optional[str] = None) -> bool:
+        """Yeni bir kitabı kütüphaneye ekler (author_key: Open Library yazar anahtarı, yalnızca SQLite)"""
         # ISBN'i normalize et ve tekrar yaz
         book.isbn = self._normalize_isbn(book.isbn)
         # ISBN zaten varsa ekleme
@@ -115,11 +500,10 @@ class Library:
             try:
                 with self._get_conn() as conn:
                     conn.execute(
-                        "INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)",
-                        (book.isbn, book.title, book.author)
+                        "INSERT INTO books (isbn, title, author, author_key) VALUES (?, ?, ?, ?)",
+                        (book.isbn, book.title, book.author, author_key)
                     )
                     conn.commit()
-                self.books.append(book)
                 return True
             except sqlite3.IntegrityError:
                 return False
@@ -128,19 +512,31 @@ class Library:
             self.save_books()
             return True
     
+    def lookup_isbn(self, isbn: str) -> Optional[dict]:
+        """Normalize edilmiş ISBN için {title, author, author_key}; kataloğa yazmaz
+
+        Kontrol basamağı tutmayan ISBN için ağa gidilmez; önce çevrimdışı döküm
+        indeksi, bulunamazsa Open Library API denenir.
+        """
+        if canonicalize(isbn) is None:
+            return None
+        book_info = self.offline.lookup(isbn) if self.offline is not None else None
+        if not book_info:
+            book_info = self._fetch_book_from_api(isbn)
+        return book_info
+
     def add_book_by_isbn(self, isbn: str) -> Optional[Book]:
         """ISBN ile Open Library API'den kitap bilgilerini çeker ve ekler"""
         try:
             normalized_isbn = self._normalize_isbn(isbn)
-            # Open Library API'den kitap bilgilerini çek
-            book_info = self._fetch_book_from_api(normalized_isbn)
+            book_info = self.lookup_isbn(normalized_isbn)
             if book_info:
                 book = Book(
                     title=book_info["title"],
                     author=book_info["author"],
                     isbn=normalized_isbn
                 )
-                if self.add_book(book):
+                if self.add_book(book, book_info.get("author_key")):
                     return book
                 else:
                     return None  # Kitap zaten mevcut
@@ -150,6 +546,56 @@ class Library:
             print(f"Kitap eklenirken hata oluştu: {e}")
             return None
     
+    def add_books(self, books: List[Tuple[Book, Optional[str]]]) -> List[Book]:
+        """(kitap, yazar anahtarı) listesini tek yazmada ekler; eklenen kitapları döndürür
+
+        Zaten var olan ISBN'ler atlanır. SQLite'ta tek işlem, JSON modunda tek dosya
+        yazımı yapılır (toplu CLI ekleme yolları için).
+        """
+        for book, _ in books:
+            book.isbn = self._normalize_isbn(book.isbn)
+        if self.use_sqlite:
+            added = []
+            with self._get_conn() as conn:
+                for book, author_key in books:
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO books (isbn, title, author, author_key) VALUES (?, ?, ?, ?)",
+                        (book.isbn, book.title, book.author, author_key)
+                    )
+                    if cur.rowcount:
+                        added.append(book)
+                conn.commit()
+            return added
+        existing = {book.isbn for book in self.books}
+        added = []
+        for book, _ in books:
+            if book.isbn not in existing:
+                existing.add(book.isbn)
+                added.append(book)
+        if added:
+            self.books.extend(added)
+            self.save_books()
+        return added
+
+    def remove_books(self, isbns: List[str]) -> List[str]:
+        """Birden fazla kitabı tek yazmada siler; silinen (normalize) ISBN'leri döndürür"""
+        targets = list(dict.fromkeys(self._normalize_isbn(isbn) for isbn in isbns))
+        if self.use_sqlite:
+            removed = []
+            with self._get_conn() as conn:
+                for isbn in targets:
+                    if conn.execute("DELETE FROM books WHERE isbn = ?", (isbn,)).rowcount:
+                        removed.append(isbn)
+                conn.commit()
+            return removed
+        present = {book.isbn for book in self.books}
+        removed = [isbn for isbn in targets if isbn in present]
+        if removed:
+            gone = set(removed)
+            self.books = [b for b in self.books if b.isbn not in gone]
+            self.save_books()
+        return removed
+
     def remove_book(self, isbn: str) -> bool:
         """ISBN ile kitabı kütüphaneden siler"""
         normalized_isbn = self._normalize_isbn(isbn)
@@ -160,8 +606,6 @@ class Library:
             with self._get_conn() as conn:
                 conn.execute("DELETE FROM books WHERE isbn = ?", (normalized_isbn,))
                 conn.commit()
-            # Bellek listesini güncelle
-            self.books = [b for b in self.books if b.isbn != normalized_isbn]
             return True
         else:
             self.books.remove(book)
@@ -170,20 +614,44 @@ class Library:
     
     def list_books(self) -> List[Book]:
         """Kütüphanedeki tüm kitapları listeler"""
+        catalog = self._fresh_catalog()
+        if catalog is not None:
+            return [Book(title=t, author=a, isbn=i) for t, a, i in catalog.iter_by_title()]
         if self.use_sqlite:
             # DB'den taze çekip dön
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute("SELECT title, author, isbn FROM books ORDER BY title")
                 rows = cur.fetchall()
-            self.books = [Book(title=row[0], author=row[1], isbn=row[2]) for row in rows]
-            return self.books.copy()
+            return [Book(title=row[0], author=row[1], isbn=row[2]) for row in rows]
         return self.books.copy()
+
+    def count_books(self) -> int:
+        """Kitap sayısı (liste oluşturulmadan)"""
+        catalog = self._fresh_catalog()
+        if catalog is not None:
+            return len(catalog)
+        if self.use_sqlite:
+            with self._get_read_conn() as conn:
+                return conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+        return len(self.books)
     
+    def memory_usage(self) -> Tuple[int, int]:
+        """(bayt, kitap sayısı): JSON modunda bellek listesinin boyutu, SQLite modunda
+        mmap'lenmiş katalog dosyasının boyutu (katalog yoksa kitaplar bellekte tutulmaz)"""
+        if not self.use_sqlite:
+            return deep_sizeof(self.books), len(self.books)
+        catalog = self.catalog
+        return (catalog.nbytes if catalog is not None else 0), self.count_books()
+
     def find_book(self, isbn: str) -> Optional[Book]:
         """ISBN ile belirli bir kitabı bulur"""
         normalized_isbn = self._normalize_isbn(isbn)
+        catalog = self._fresh_catalog()
+        if catalog is not None:
+            row = catalog.find(normalized_isbn)
+            return Book(title=row[0], author=row[1], isbn=row[2]) if row else None
         if self.use_sqlite:
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute("SELECT title, author, isbn FROM books WHERE isbn = ?", (normalized_isbn,))
                 row = cur.fetchone()
             if not row:
@@ -195,12 +663,26 @@ class Library:
         return None
     
     def _fetch_book_from_api(self, isbn: str) -> Optional[dict]:
-        """Open Library API'den kitap bilgilerini çeker"""
+        """Open Library API'den kitap bilgilerini çeker
+
+        Çağrılar hız sınırı, eşzamanlılık sınırı, devre kesici ve toplam süre
+        sınırı ile korunur (bkz. outbound.OutboundGuard).
+        """
         try:
+            import httpx
             normalized_isbn = self._normalize_isbn(isbn)
-            url = f"https://openlibrary.org/isbn/{normalized_isbn}.json"
-            with httpx.Client() as client:
-                response = client.get(url, timeout=10.0, follow_redirects=True)
+            url = f"{OPENLIBRARY_URL}/isbn/{normalized_isbn}.json"
+            with self.outbound.call() as call, httpx.Client() as client:
+                started = time.perf_counter()
+                with span("http", endpoint="isbn", url=url) as http_span:
+                    try:
+                        response = client.get(url, timeout=call.timeout(), follow_redirects=True)
+                    except Exception:
+                        _observe_openlibrary("isbn", "error", started)
+                        raise
+                    if http_span is not None:
+                        http_span.attrs["status"] = response.status_code
+                _observe_openlibrary("isbn", str(response.status_code), started)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -208,47 +690,119 @@ class Library:
                     # Kitap başlığını al
                     title = data.get("title", "Bilinmeyen Başlık")
                     
-                    # Yazar bilgisini al
+                    # Yazar bilgisini al (önce yazar önbelleği, yoksa ikinci istek)
                     authors = data.get("authors", [])
+                    author_key = None
+                    author = "Bilinmeyen Yazar"
                     if authors:
                         # İlk yazarın adını al
                         author_key = authors[0]["key"]
-                        author_response = client.get(
-                            f"https://openlibrary.org{author_key}.json",
-                            timeout=10.0,
-                            follow_redirects=True,
-                        )
-                        if author_response.status_code == 200:
-                            author_data = author_response.json()
-                            author = author_data.get("name", "Bilinmeyen Yazar")
-                        else:
-                            author = "Bilinmeyen Yazar"
-                    else:
-                        author = "Bilinmeyen Yazar"
+                        name = self.authors.get(author_key)
+                        if name is None:
+                            name = self._fetch_author_name(client, call, author_key)
+                            if name is not None:
+                                self.authors.put(author_key, name)
+                        if name is not None:
+                            author = name
                     
                     return {
                         "title": title,
-                        "author": author
+                        "author": author,
+                        "author_key": author_key
                     }
                 else:
+                    # 5xx ve 429 servis sorunudur; 404 geçerli bir "bulunamadı" yanıtıdır
+                    if response.status_code >= 500 or response.status_code == 429:
+                        call.mark_failure()
                     return None
                     
+        except OutboundRejected as e:
+            print(f"Open Library çağrısı yapılmadı: {e}")
+            return None
         except Exception as e:
             print(f"API'den veri çekilirken hata: {e}")
             return None
+
+    def _fetch_author_name(self, client: "httpx.Client", call, author_key: str) -> Optional[str]:
+        """/authors/OL..A.json isteği; yanıt 200 değilse None (önbelleğe yazılmaz)"""
+        author_url = f"{OPENLIBRARY_URL}{author_key}.json"
+        started = time.perf_counter()
+        with span("http", endpoint="author", url=author_url) as http_span:
+            try:
+                author_response = client.get(
+                    author_url,
+                    timeout=call.timeout(),
+                    follow_redirects=True,
+                )
+            except Exception:
+                _observe_openlibrary("author", "error", started)
+                raise
+            if http_span is not None:
+                http_span.attrs["status"] = author_response.status_code
+        _observe_openlibrary("author", str(author_response.status_code), started)
+        if author_response.status_code != 200:
+            if author_response.status_code >= 500 or author_response.status_code == 429:
+                call.mark_failure()
+            return None
+        return author_response.json().get("name", "Bilinmeyen Yazar")
+
+    def prefetch_authors(self, keys: List[str]) -> dict:
+        """Verilen yazar anahtarlarını önbelleğe toplu olarak yükler
+
+        Bilinen anahtarlar tek sorguyla ayrılır; bilinmeyenler tek bir HTTP istemcisiyle
+        sırayla (her biri Open Library korumasından geçerek) çekilir ve tek işlemde yazılır.
+        """
+        keys = [key for key in dict.fromkeys(keys) if isinstance(key, str) and key.startswith("/authors/")]
+        known = self.authors.get_many(keys)
+        missing = [key for key in keys if key not in known]
+        fetched: Dict[str, str] = {}
+        failed = 0
+        if missing:
+            import httpx
+            with httpx.Client() as client:
+                for key in missing:
+                    try:
+                        with self.outbound.call() as call:
+                            name = self._fetch_author_name(client, call, key)
+                    except OutboundRejected as e:
+                        print(f"Open Library çağrısı yapılmadı: {e}")
+                        failed += len(missing) - len(fetched) - failed
+                        break
+                    except Exception as e:
+                        print(f"Yazar bilgisi çekilirken hata: {e}")
+                        name = None
+                    if name is None:
+                        failed += 1
+                    else:
+                        fetched[key] = name
+        self.authors.put_many(fetched)
+        return {"requested": len(keys), "cached": len(known), "fetched": len(fetched), "failed": failed}
+
+    def books_by_author(self, author: str) -> List[Book]:
+        """Yazar adına göre kitaplar (başlık sırasıyla); SQLite'ta idx_books_author kullanılır"""
+        author = author.strip()
+        if self.use_sqlite:
+            with self._get_read_conn() as conn:
+                rows = conn.execute(
+                    "SELECT title, author, isbn FROM books WHERE author = ? ORDER BY title", (author,)
+                ).fetchall()
+            return [Book(title=row[0], author=row[1], isbn=row[2]) for row in rows]
+        return sorted((book for book in self.books if book.author == author), key=lambda book: book.title)
     
     def load_books(self):
-        """Kitapları depodan yükler (SQLite varsa oradan)"""
+        """Kitapları JSON dosyasından belleğe yükler (SQLite modunda bellek listesi tutulmaz)"""
         if self.use_sqlite:
-            with self._get_conn() as conn:
-                cur = conn.execute("SELECT title, author, isbn FROM books ORDER BY title")
-                rows = cur.fetchall()
-                self.books = [Book(title=row[0], author=row[1], isbn=row[2]) for row in rows]
             return
         try:
             with open(self.filename, 'r', encoding='utf-8') as file:
                 data = json.load(file)
-                self.books = [Book.from_dict(book_data) for book_data in data]
+                # Eski dosyalardaki ISBN-10 kayıtları ISBN-13'e çevrilir; aynı kitabın ilk kaydı kalır
+                books: Dict[str, Book] = {}
+                for book_data in data:
+                    book = Book.from_dict(book_data)
+                    book.isbn = self._normalize_isbn(book.isbn)
+                    books.setdefault(book.isbn, book)
+                self.books = list(books.values())
         except FileNotFoundError:
             self.books = []
         except json.JSONDecodeError:
@@ -269,11 +823,34 @@ class Library:
     
     def get_books_as_dicts(self) -> List[dict]:
         """Kitapları dictionary listesi olarak döndürür (API için)"""
+        catalog = self._fresh_catalog()
+        if catalog is not None:
+            return catalog.to_dicts()
         # SQLite modunda veriler DB'de tutulduğundan, her istekte taze listeyi çek
         if self.use_sqlite:
-            self.list_books()
+            return [book.to_dict() for book in self.list_books()]
         return [book.to_dict() for book in self.books]
 
+    def books_snapshot(self) -> Tuple[int, List[dict]]:
+        """(katalog sürümü, kitap sözlükleri); ikisi aynı kaynaktan okunur
+
+        GET /books ETag'i gövdeyle aynı sürümden üretilsin diye: katalog güncelse onun
+        sürümü, değilse sürüm ve satırlar tek SQLite okuma işleminden alınır.
+        """
+        if not self.use_sqlite:
+            return _file_version(self.filename), [book.to_dict() for book in self.books]
+        catalog = self._fresh_catalog()
+        if catalog is not None:
+            return catalog.version, catalog.to_dicts()
+        with self._get_read_conn() as conn:
+            conn.execute("BEGIN")
+            try:
+                version = conn.execute("SELECT version FROM catalog_state WHERE id = 1").fetchone()[0]
+                rows = conn.execute("SELECT title, author, isbn FROM books ORDER BY title").fetchall()
+            finally:
+                conn.execute("COMMIT")
+        return version, [{"title": title, "author": author, "isbn": isbn} for title, author, isbn in rows]
+
     def update_book(self, isbn: str, title: Optional[str] = None, author: Optional[str] = None) -> Optional[Book]:
         """Mevcut bir kitabın başlık/yazar bilgilerini günceller"""
         normalized_isbn = self._normalize_isbn(isbn)
@@ -289,14 +866,14 @@ class Library:
             new_author = author.strip()
         if self.use_sqlite:
             with self._get_conn() as conn:
-                conn.execute("UPDATE books SET title = ?, author = ? WHERE isbn = ?", (new_title, new_author, normalized_isbn))
+                # Yazar adı elle değiştirilirse Open Library yazar referansı artık geçerli değildir
+                conn.execute(
+                    "UPDATE books SET title = ?, author_key = CASE WHEN author = ? THEN author_key END, author = ? "
+                    "WHERE isbn = ?",
+                    (new_title, new_author, new_author, normalized_isbn),
+                )
                 conn.commit()
-            # Bellek listesini tazele ve güncellenen kitabı döndür
-            self.list_books()
-            for b in self.books:
-                if b.isbn == normalized_isbn:
-                    return b
-            return None
+            return self.find_book(normalized_isbn)
         else:
             existing.title = new_title
             existing.author = new_author
@@ -305,17 +882,47 @@ class Library:
 
 
 class UserBook:
-    """Kullanıcının kitap listesinde yer alan kitap ve okuma durumunu temsil eder"""
+    """Kullanıcının kitap listesinde yer alan kitap ve okuma durumunu temsil eder
+
+    `book` gerçek bir Book referansıdır; title / author / isbn ona yönlendirilir, böylece
+    `user_book.book.title = ...` ile `user_book.title = ...` aynı nesneyi değiştirir.
+    """
+
+    __slots__ = ("book", "is_read")
 
     def __init__(self, book: Book, is_read: bool = False):
         self.book = book
         self.is_read = is_read
 
+    @property
+    def title(self) -> str:
+        return self.book.title
+
+    @title.setter
+    def title(self, value: str):
+        self.book.title = value
+
+    @property
+    def author(self) -> str:
+        return self.book.author
+
+    @author.setter
+    def author(self, value: str):
+        self.book.author = value
+
+    @property
+    def isbn(self) -> str:
+        return self.book.isbn
+
+    @isbn.setter
+    def isbn(self, value: str):
+        self.book.isbn = value
+
     def to_dict(self) -> dict:
         return {
-            "title": self.book.title,
-            "author": self.book.author,
-            "isbn": self.book.isbn,
+            "title": self.title,
+            "author": self.author,
+            "isbn": self.isbn,
             "is_read": self.is_read,
         }
 
@@ -334,6 +941,8 @@ class UserBook:
 class User:
     """Uygulama kullanıcısı (admin veya normal)"""
 
+    __slots__ = ("username", "password_hash", "role", "books")
+
     def __init__(self, username: str, password_hash: str, role: str = "user", books: Optional[List[UserBook]] = None):
         self.username = username
         self.password_hash = password_hash
@@ -361,15 +970,35 @@ class User:
 class UserManager:
     """Kullanıcı yönetimi ve kullanıcı bazlı kitap listeleri
 
-    SQLite desteği: db_path verildiğinde JSON yerine SQLite kullanılır.
+    SQLite desteği: db_path verildiğinde JSON yerine SQLite kullanılır. Aynı veritabanını
+    kullanan bir Library verilirse onun SQLiteStorage'ı (ve depolama profili) paylaşılır.
     """
  
-    def __init__(self, filename: str = "users.json", db_path: Optional[str] = None):
+    def __init__(self, filename: str = "users.json", db_path: Optional[str] = None,
+                 storage_profile: Optional[StorageProfile] = None, library: Optional[Library] = None,
+                 offline_index: Optional[OfflineIndex] = None):
         self.filename = filename
         self.db_path = db_path
         self.use_sqlite = bool(db_path)
         self.users: Dict[str, User] = {}
-        self._library_helper = Library()  # ISBN normalize ve API için yardımcı
+        # ISBN normalize ve API için yardımcı; paylaşılan katalog verilirse onun yazar önbelleği kullanılır
+        self._library_helper = library if library is not None else Library()
+        self.storage: Optional[SQLiteStorage] = None
+        if self.use_sqlite:
+            # Aynı veritabanındaki kataloğun deposu paylaşılır: tek yazma bağlantısı ve tek yazma
+            # kilidi (iki yazıcı birbirini SQLITE_BUSY / busy_timeout ile bekletirdi)
+            shared = library.storage if library is not None else None
+            if shared is not None and os.path.abspath(shared.db_path) == os.path.abspath(db_path):
+                self.storage = shared
+            else:
+                self.storage = SQLiteStorage(db_path, storage_profile)
+        # ISBN çözümleme: önce paylaşılan katalog, sonra metadata cache, çevrimdışı indeks, en son ağ
+        self.resolver = BookResolver(
+            fetcher=lambda isbn: self._library_helper._fetch_book_from_api(isbn),
+            library=library,
+            cache=MetadataCache(self.storage),
+            offline=offline_index,
+        )
         if self.use_sqlite:
             self._init_db()
             self._migrate_json_to_sqlite_if_needed()
@@ -389,9 +1018,15 @@ class UserManager:
                 self.create_user("demo", "demo123", role="user")
                 self.save_users()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        assert self.db_path
-        return sqlite3.connect(self.db_path)
+    def _get_conn(self):
+        """Yazma bağlantısı (kilitli, çıkışta commit edilir)"""
+        assert self.storage
+        return self.storage.write()
+
+    def _get_read_conn(self):
+        """Salt-okunur sorgu bağlantısı (thread başına ayrı)"""
+        assert self.storage
+        return self.storage.read()
 
     def _init_db(self):
         with self._get_conn() as conn:
@@ -417,11 +1052,59 @@ class UserManager:
                 )
                 """
             )
+            # list_user_read_books: WHERE username = ? AND is_read = 1
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_user_books_user_read ON user_books (username, is_read)")
+            # Kullanıcı başına liste sürümü: user_books değişikliklerinde tetikleyicilerle artırılır
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_list_versions (
+                    username TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL
+                )
+                """
+            )
+            for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS user_books_version_{event.lower()} AFTER {event} ON user_books
+                    BEGIN
+                        INSERT INTO user_list_versions (username, version) VALUES ({row}.username, 1)
+                        ON CONFLICT (username) DO UPDATE SET version = version + 1;
+                    END
+                    """
+                )
+            # Doğrulamadan önce ISBN-10 olarak kaydedilmiş liste ve önbellek kayıtları
+            _migrate_isbn13(conn, "user_books")
+            _migrate_isbn13(conn, "book_metadata_cache")
             conn.commit()
 
+    def list_version(self, username: str) -> int:
+        """Kullanıcının kitap listesinin değişiklik sürümü (JSON modunda dosyanın değişiklik zamanı)"""
+        if not self.use_sqlite:
+            return _file_version(self.filename)
+        with self._get_read_conn() as conn:
+            row = conn.execute("SELECT version FROM user_list_versions WHERE username = ?", (username,)).fetchone()
+        return row[0] if row else 0
+
+    def list_versions(self, usernames: List[str]) -> Dict[str, int]:
+        """Birden fazla kullanıcının liste sürümlerini tek seferde döndürür"""
+        if not self.use_sqlite:
+            version = _file_version(self.filename)
+            return {username: version for username in usernames}
+        versions = {username: 0 for username in usernames}
+        with self._get_read_conn() as conn:
+            for start in range(0, len(usernames), 500):
+                chunk = usernames[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for username, version in conn.execute(
+                    f"SELECT username, version FROM user_list_versions WHERE username IN ({placeholders})", chunk
+                ):
+                    versions[username] = version
+        return versions
+
     def _migrate_json_to_sqlite_if_needed(self):
         # Eğer users tablosu boşsa ve JSON dosyası varsa içeri aktar
-        with self._get_conn() as conn:
+        with self._get_read_conn() as conn:
             cur = conn.execute("SELECT COUNT(*) FROM users")
             count = cur.fetchone()[0]
         if count == 0 and os.path.exists(self.filename):
@@ -466,6 +1149,12 @@ class UserManager:
             with open(self.filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 self.users = {u["username"]: User.from_dict(u) for u in data}
+            for user in self.users.values():
+                books: Dict[str, UserBook] = {}
+                for user_book in user.books:
+                    user_book.isbn = self._library_helper._normalize_isbn(user_book.isbn)
+                    books.setdefault(user_book.isbn, user_book)
+                user.books = list(books.values())
         except FileNotFoundError:
             self.users = {}
         except json.JSONDecodeError:
@@ -505,7 +1194,7 @@ class UserManager:
 
     def verify_user(self, username: str, password: str) -> Optional[User]:
         if self.use_sqlite:
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute("SELECT username, password_hash, role FROM users WHERE username = ?", (username,))
                 row = cur.fetchone()
             if not row:
@@ -522,7 +1211,7 @@ class UserManager:
 
     def get_user(self, username: str) -> Optional[User]:
         if self.use_sqlite:
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute("SELECT username, password_hash, role FROM users WHERE username = ?", (username,))
                 row = cur.fetchone()
             if not row:
@@ -533,7 +1222,7 @@ class UserManager:
     def _load_user_books_from_db(self, username: str) -> List[UserBook]:
         if not self.use_sqlite:
             return []
-        with self._get_conn() as conn:
+        with self._get_read_conn() as conn:
             cur = conn.execute("SELECT title, author, isbn, is_read FROM user_books WHERE username = ?", (username,))
             rows = cur.fetchall()
         result: List[UserBook] = []
@@ -544,7 +1233,7 @@ class UserManager:
     # Kullanıcı kitap işlemleri
     def list_user_books(self, username: str) -> List[dict]:
         if self.use_sqlite:
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute("SELECT title, author, isbn, is_read FROM user_books WHERE username = ?", (username,))
                 rows = cur.fetchall()
             return [
@@ -564,7 +1253,7 @@ class UserManager:
     def add_book_to_user_by_isbn(self, username: str, isbn: str) -> Optional[dict]:
         if self.use_sqlite:
             normalized = self._library_helper._normalize_isbn(isbn)
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 # Kullanıcı var mı?
                 cur = conn.execute("SELECT 1 FROM users WHERE username = ?", (username,))
                 if not cur.fetchone():
@@ -573,30 +1262,36 @@ class UserManager:
                 cur = conn.execute("SELECT 1 FROM user_books WHERE username = ? AND isbn = ?", (username, normalized))
                 if cur.fetchone():
                     return None
-                info = self._library_helper._fetch_book_from_api(normalized)
-                if not info:
-                    return None
-                conn.execute(
-                    "INSERT INTO user_books (username, isbn, title, author, is_read) VALUES (?, ?, ?, ?, 0)",
-                    (username, normalized, info["title"], info["author"]) 
-                )
-                conn.commit()
-            return {"title": info["title"], "author": info["author"], "isbn": normalized, "is_read": False}
+            # Çözümleme (olası ağ çağrısı) yazma kilidi dışında yapılır
+            info, source = self.resolver.resolve(normalized)
+            if not info:
+                return None
+            try:
+                with self._get_conn() as conn:
+                    conn.execute(
+                        "INSERT INTO user_books (username, isbn, title, author, is_read) VALUES (?, ?, ?, ?, 0)",
+                        (username, normalized, info["title"], info["author"])
+                    )
+                    conn.commit()
+            except sqlite3.IntegrityError:
+                # Bu arada başka bir istek aynı kitabı eklemiş
+                return None
+            return {"title": info["title"], "author": info["author"], "isbn": normalized, "is_read": False, "source": source}
         # JSON modu
         user = self.get_user(username)
         if not user:
             return None
         normalized = self._library_helper._normalize_isbn(isbn)
         for b in user.books:
-            if b.book.isbn == normalized:
+            if b.isbn == normalized:
                 return None
-        info = self._library_helper._fetch_book_from_api(normalized)
+        info, source = self.resolver.resolve(normalized)
         if not info:
             return None
         user_book = UserBook(Book(title=info["title"], author=info["author"], isbn=normalized), is_read=False)
         user.books.append(user_book)
         self.save_users()
-        return user_book.to_dict()
+        return {**user_book.to_dict(), "source": source}
 
     def remove_user_book(self, username: str, isbn: str) -> bool:
         normalized = self._library_helper._normalize_isbn(isbn)
@@ -609,7 +1304,7 @@ class UserManager:
         if not user:
             return False
         for b in list(user.books):
-            if b.book.isbn == normalized:
+            if b.isbn == normalized:
                 user.books.remove(b)
                 self.save_users()
                 return True
@@ -625,7 +1320,7 @@ class UserManager:
                 )
                 conn.commit()
             # Güncellenen kaydı döndür
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute(
                     "SELECT title, author, isbn, is_read FROM user_books WHERE username = ? AND isbn = ?",
                     (username, normalized)
@@ -638,7 +1333,7 @@ class UserManager:
         if not user:
             return None
         for b in user.books:
-            if b.book.isbn == normalized:
+            if b.isbn == normalized:
                 b.is_read = is_read
                 self.save_users()
                 return b.to_dict()
@@ -646,7 +1341,7 @@ class UserManager:
 
     def list_user_read_books(self, username: str) -> List[dict]:
         if self.use_sqlite:
-            with self._get_conn() as conn:
+            with self._get_read_conn() as conn:
                 cur = conn.execute("SELECT title, author, isbn, is_read FROM user_books WHERE username = ? AND is_read = 1", (username,))
                 rows = cur.fetchall()
             return [
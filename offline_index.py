@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Çevrimdışı Open Library metadata indeksi - döküm dosyalarından oluşturulan yerel ISBN deposu
+
+Open Library döküm dosyaları (ol_dump_editions_*.txt.gz, ol_dump_authors_*.txt.gz) satır
+başına sekmeyle ayrılmış kayıtlardır: tür, anahtar, revizyon, last_modified, JSON.
+Dosyalar akış halinde (gzip / bz2 / xz veya düz metin) okunur ve ayrı bir SQLite
+dosyasına yazılır:
+- isbn_index(isbn INTEGER PRIMARY KEY, edition) : paketlenmiş ISBN -> baskı kimliği
+- editions(id INTEGER PRIMARY KEY, title, author, last_modified)
+- authors(id INTEGER PRIMARY KEY, name, last_modified)
+OL anahtarları (/books/OL123M, /authors/OL45A) ve ISBN'ler tamsayı olarak saklandığından
+indeks küçük kalır; arama üç birincil anahtar erişimidir (mikrosaniyeler).
+
+Artımlı oluşturma: her tür için işlenen en yeni last_modified değeri saklanır; sonraki
+dökümlerde yalnızca daha yeni kayıtların JSON'u çözülür ve yazılır. Yeniden gelen bir
+baskının ISBN'leri öncekilerin yerini alır; silinen (/type/delete), yönlendirilen
+(/type/redirect) ya da başlığını / geçerli ISBN'lerini yitiren baskılar indeksten çıkarılır.
+
+Kullanım:
+    python -m offline_index --index openlibrary.db --editions ol_dump_editions.txt.gz \\
+        --authors ol_dump_authors.txt.gz
+    KUTUPHANE_OFFLINE_INDEX=openlibrary.db uvicorn api:app
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import sys
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from catalog_store import encode_isbn
+from isbn_validation import canonicalize, canonicalize_many
+from storage import SQLiteStorage, StorageProfile
+
+
+BATCH_SIZE = 50_000
+_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def _ol_id(key: str) -> Optional[int]:
+    """'/books/OL7353617M' -> 7353617 (tanınmazsa None)"""
+    name = key.rsplit("/", 1)[-1]
+    if len(name) < 4 or not name.startswith("OL") or not name[2:-1].isdigit():
+        return None
+    return int(name[2:-1])
+
+
+def open_dump(path: str):
+    """Döküm dosyasını uzantısına göre sıkıştırmayı açarak metin olarak açar"""
+    opener = _OPENERS.get(os.path.splitext(path)[1].lower(), open)
+    return opener(path, "rt", encoding="utf-8")
+
+
+def iter_dump(stream, newer_than: str = "") -> Iterator[Tuple[str, str, str, dict]]:
+    """(tür, anahtar, last_modified, kayıt) üretir; newer_than'dan eski kayıtların JSON'u çözülmez"""
+    for line in stream:
+        parts = line.split("\t", 4)
+        if len(parts) != 5:
+            continue
+        kind, key, _, last_modified, payload = parts
+        if last_modified <= newer_than:
+            continue
+        try:
+            record = json.loads(payload)
+        except json.JSONDecodeError:
+            continue
+        yield kind, key, last_modified, record
+
+
+class OfflineIndex:
+    """Döküm dosyalarından oluşturulan ISBN -> {title, author} deposu"""
+
+    def __init__(self, path: str, profile: Optional[StorageProfile] = None):
+        self.path = path
+        self.storage = SQLiteStorage(path, profile)
+        with self.storage.write() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS isbn_index (isbn INTEGER PRIMARY KEY, edition INTEGER NOT NULL)")
+            # Yeniden gelen / silinen baskının eski ISBN satırlarını bulmak için
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_isbn_index_edition ON isbn_index (edition)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS editions (id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+                "author INTEGER, last_modified TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS authors (id INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+                "last_modified TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dump_state (kind TEXT PRIMARY KEY, last_modified TEXT NOT NULL, "
+                "applied INTEGER NOT NULL, built_at REAL NOT NULL)"
+            )
+
+    @classmethod
+    def open(cls, path: str) -> Optional['OfflineIndex']:
+        """Var olan bir indeksi açar; dosya yoksa None"""
+        if not os.path.exists(path):
+            return None
+        return cls(path)
+
+    def close(self):
+        self.storage.close()
+
+    def lookup(self, isbn: str) -> Optional[dict]:
+        """ISBN (10 veya 13) için {title, author, author_key}; bulunamazsa None"""
+        canonical = canonicalize(isbn)
+        if canonical is None:
+            return None
+        code = encode_isbn(canonical)
+        with self.storage.read() as conn:
+            row = conn.execute(
+                "SELECT e.title, a.name, e.author FROM isbn_index i JOIN editions e ON e.id = i.edition "
+                "LEFT JOIN authors a ON a.id = e.author WHERE i.isbn = ?",
+                (code,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "title": row[0],
+            "author": row[1] or "Bilinmeyen Yazar",
+            "author_key": f"/authors/OL{row[2]}A" if row[2] is not None else None,
+        }
+
+    def _state(self, kind: str) -> str:
+        with self.storage.read() as conn:
+            row = conn.execute("SELECT last_modified FROM dump_state WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else ""
+
+    def _save_state(self, conn, kind: str, last_modified: str, applied: int):
+        conn.execute(
+            "INSERT INTO dump_state (kind, last_modified, applied, built_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (kind) DO UPDATE SET last_modified = MAX(last_modified, excluded.last_modified), "
+            "applied = excluded.applied, built_at = excluded.built_at",
+            (kind, last_modified, applied, time.time()),
+        )
+
+    def ingest_editions(self, stream, batch_size: int = BATCH_SIZE) -> dict:
+        """Baskı dökümünü uygular; yalnızca son oluşturmadan yeni kayıtlar yazılır
+
+        Her yeni kayıt baskının önceki ISBN satırlarını siler ve güncel olanları yazar.
+        Silinen / yönlendirilen ya da başlığı veya geçerli ISBN'i kalmayan baskılar
+        (removed) indeksten çıkarılır; baskıya ait olmayan kayıtlar atlanır (skipped).
+        """
+        since = self._state("editions")
+        newest, applied, removed, skipped = since, 0, 0, 0
+        # baskı kimliği -> ((id, title, author, last_modified), ISBN kodları) ya da kaldırma için None
+        pending: Dict[int, Optional[tuple]] = {}
+
+        def flush(final: bool = False):
+            with self.storage.write() as conn:
+                conn.executemany("DELETE FROM isbn_index WHERE edition = ?", [(i,) for i in pending])
+                conn.executemany("DELETE FROM editions WHERE id = ?",
+                                 [(i,) for i, entry in pending.items() if entry is None])
+                conn.executemany(
+                    "INSERT INTO editions (id, title, author, last_modified) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET title = excluded.title, author = excluded.author, "
+                    "last_modified = excluded.last_modified",
+                    [entry[0] for entry in pending.values() if entry is not None],
+                )
+                conn.executemany(
+                    "INSERT INTO isbn_index (isbn, edition) VALUES (?, ?) "
+                    "ON CONFLICT (isbn) DO UPDATE SET edition = excluded.edition",
+                    [(code, i) for i, entry in pending.items() if entry is not None for code in entry[1]],
+                )
+                # Döküm last_modified'a göre sıralı olmadığından durum yalnızca tam bir geçişten
+                # sonra kaydedilir; yarıda kesilen oluşturma baştan (idempotent) tekrarlanır
+                if final:
+                    self._save_state(conn, "editions", newest, applied)
+            pending.clear()
+
+        for kind, key, last_modified, record in iter_dump(stream, since):
+            edition_id = _ol_id(key) if key.startswith("/books/") else None
+            if edition_id is None or kind not in ("/type/edition", "/type/delete", "/type/redirect"):
+                skipped += 1
+                continue
+            if last_modified > newest:
+                newest = last_modified
+            title = record.get("title")
+            codes = set()
+            if kind == "/type/edition" and isinstance(title, str) and title.strip():
+                # ISBN-10'lar ISBN-13'e çevrilir; kontrol basamağı tutmayanlar atlanır
+                values = [str(value) for field in ("isbn_13", "isbn_10") for value in record.get(field) or ()]
+                codes = {encode_isbn(isbn) for isbn in canonicalize_many(values) if isbn is not None}
+            if not codes:
+                pending[edition_id] = None
+                removed += 1
+            else:
+                authors = record.get("authors") or []
+                author_key = authors[0].get("key") if authors and isinstance(authors[0], dict) else None
+                pending[edition_id] = (
+                    (edition_id, title.strip(), _ol_id(author_key) if author_key else None, last_modified),
+                    codes,
+                )
+                applied += 1
+            if len(pending) >= batch_size:
+                flush()
+        flush(final=True)
+        return {"applied": applied, "removed": removed, "skipped": skipped, "since": since, "last_modified": newest}
+
+    def ingest_authors(self, stream, batch_size: int = BATCH_SIZE) -> dict:
+        """Yazar dökümünü uygular; yalnızca son oluşturmadan yeni kayıtlar yazılır"""
+        since = self._state("authors")
+        newest, applied, skipped = since, 0, 0
+        authors = []
+
+        def flush(final: bool = False):
+            with self.storage.write() as conn:
+                conn.executemany(
+                    "INSERT INTO authors (id, name, last_modified) VALUES (?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET name = excluded.name, last_modified = excluded.last_modified",
+                    authors,
+                )
+                if final:
+                    self._save_state(conn, "authors", newest, applied)
+            authors.clear()
+
+        for kind, key, last_modified, record in iter_dump(stream, since):
+            author_id = _ol_id(key)
+            name = record.get("name")
+            if kind != "/type/author" or author_id is None or not isinstance(name, str) or not name.strip():
+                skipped += 1
+                continue
+            authors.append((author_id, name.strip(), last_modified))
+            applied += 1
+            if last_modified > newest:
+                newest = last_modified
+            if len(authors) >= batch_size:
+                flush()
+        flush(final=True)
+        return {"applied": applied, "skipped": skipped, "since": since, "last_modified": newest}
+
+    def status(self) -> dict:
+        with self.storage.read() as conn:
+            counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("isbn_index", "editions", "authors")
+            }
+            state = {kind: last_modified for kind, last_modified in
+                     conn.execute("SELECT kind, last_modified FROM dump_state")}
+        return {
+            "path": self.path,
+            "isbns": counts["isbn_index"],
+            "editions": counts["editions"],
+            "authors": counts["authors"],
+            "last_modified": state,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Open Library dökümlerinden çevrimdışı ISBN indeksi oluştur / güncelle")
+    parser.add_argument("--index", default="openlibrary.db", help="İndeks dosyası (varsayılan openlibrary.db)")
+    parser.add_argument("--editions", help="Baskı dökümü (.txt, .gz, .bz2, .xz)")
+    parser.add_argument("--authors", help="Yazar dökümü (.txt, .gz, .bz2, .xz)")
+    parser.add_argument("--lookup", help="İndekste bir ISBN ara")
+    args = parser.parse_args(argv)
+
+    index = OfflineIndex(args.index)
+    try:
+        for kind, path in (("authors", args.authors), ("editions", args.editions)):
+            if not path:
+                continue
+            started = time.perf_counter()
+            with open_dump(path) as stream:
+                result = (index.ingest_authors if kind == "authors" else index.ingest_editions)(stream)
+            print(f"{kind}: {result['applied']} kayıt uygulandı, {result.get('removed', 0)} kaldırıldı, "
+                  f"{result['skipped']} atlandı "
+                  f"({time.perf_counter() - started:.1f} sn; önceki sürüm {result['since'] or '-'}, "
+                  f"yeni sürüm {result['last_modified'] or '-'})")
+        if args.lookup:
+            print(json.dumps(index.lookup(args.lookup), ensure_ascii=False))
+        else:
+            print(json.dumps(index.status(), ensure_ascii=False))
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
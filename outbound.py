@@ -0,0 +1,269 @@
+"""
+Dış servis (Open Library) çağrıları için koruma katmanı:
+token-bucket hız sınırlayıcı, eşzamanlılık sınırı, devre kesici ve istek başına süre sınırı
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class OutboundRejected(Exception):
+    """Çağrı ağa hiç gitmeden reddedildi"""
+
+
+class CircuitOpenError(OutboundRejected):
+    """Devre kesici açık; dış servis geçici olarak devre dışı"""
+
+
+class RateLimitedError(OutboundRejected):
+    """Hız sınırı veya eşzamanlılık sınırı süre sınırı içinde aşılamadı"""
+
+
+class DeadlineExceededError(OutboundRejected):
+    """İstek için ayrılan toplam süre doldu"""
+
+
+class TokenBucket:
+    """Saniyede `rate` token üreten, en fazla `burst` token biriktiren kova"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Token alınabildiyse 0, aksi halde bir sonraki token için beklenmesi gereken süre"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float) -> bool:
+        """En fazla `timeout` saniye bekleyerek token almaya çalışır"""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Son `window` çağrıya göre açılan/kapanan devre kesici
+
+    Hata oranı `failure_rate` veya yavaş çağrı oranı `slow_call_rate` eşiğini
+    (en az `min_calls` çağrı sonrası) geçtiğinde devre açılır ve `reset_timeout`
+    boyunca tüm çağrılar hemen reddedilir. Süre dolunca tek bir deneme çağrısına
+    izin verilir (half_open); başarılı olursa devre kapanır.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_threshold: float = 5.0, slow_call_rate: float = 0.8,
+                 reset_timeout: float = 30.0):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate = slow_call_rate
+        self.reset_timeout = reset_timeout
+        # (başarılı_mı, yavaş_mı) çiftleri
+        self._outcomes: deque = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.open_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._update_state(time.monotonic())
+            return self._state
+
+    def _update_state(self, now: float):
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.open_count += 1
+
+    def allow(self) -> bool:
+        """Çağrıya izin verilip verilmediği"""
+        with self._lock:
+            self._update_state(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected_count += 1
+            return False
+
+    def cancel(self):
+        """İzin verilen çağrı ağa gitmeden iptal edildi (half_open denemesini serbest bırakır)"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, success: bool, latency: float):
+        """Tamamlanan çağrının sonucunu kaydeder"""
+        slow = latency >= self.slow_call_threshold
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if success and not slow:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open(now)
+                return
+            self._outcomes.append((success, slow))
+            total = len(self._outcomes)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for ok, _ in self._outcomes if not ok)
+            slow_calls = sum(1 for _, is_slow in self._outcomes if is_slow)
+            if failures / total >= self.failure_rate or slow_calls / total >= self.slow_call_rate:
+                self._open(now)
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            total = len(self._outcomes)
+            failures = sum(1 for ok, _ in self._outcomes if not ok)
+            return {
+                "state": state,
+                "recent_calls": total,
+                "recent_failures": failures,
+                "open_count": self.open_count,
+                "rejected_count": self.rejected_count,
+            }
+
+
+class OutboundCall:
+    """Tek bir korumalı çağrının süre sınırı ve sonuç bilgisi"""
+
+    def __init__(self, deadline_at: float):
+        self.deadline_at = deadline_at
+        self.failed = False
+
+    def remaining(self) -> float:
+        return self.deadline_at - time.monotonic()
+
+    def timeout(self, cap: float = 10.0) -> float:
+        """Bir sonraki HTTP isteği için kullanılacak zaman aşımı (kalan süre ile sınırlı)"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError("İstek süresi doldu")
+        return min(cap, remaining)
+
+    def mark_failure(self):
+        """Yanıt alındı ama hata olarak sayılmalı (ör. 5xx, 429)"""
+        self.failed = True
+
+
+class OutboundGuard:
+    """Hız sınırlayıcı, eşzamanlılık sınırı ve devre kesiciyi tek bir çağrı noktasında birleştirir"""
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, max_concurrency: int = 4,
+                 deadline: float = 8.0, breaker: Optional[CircuitBreaker] = None):
+        self.limiter = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.deadline = deadline
+        self.breaker = breaker or CircuitBreaker()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix: str = "KUTUPHANE_OPENLIBRARY_") -> 'OutboundGuard':
+        """Ortam değişkenlerinden ayarları okur (ör. KUTUPHANE_OPENLIBRARY_RATE=2)"""
+        def _get(name: str, default, cast):
+            try:
+                return cast(os.environ.get(prefix + name, default))
+            except ValueError:
+                return default
+
+        breaker = CircuitBreaker(
+            failure_rate=_get("FAILURE_RATE", 0.5, float),
+            slow_call_threshold=_get("SLOW_CALL_THRESHOLD", 5.0, float),
+            reset_timeout=_get("RESET_TIMEOUT", 30.0, float),
+        )
+        return cls(
+            rate=_get("RATE", 5.0, float),
+            burst=_get("BURST", 10, int),
+            max_concurrency=_get("MAX_CONCURRENCY", 4, int),
+            deadline=_get("DEADLINE", 8.0, float),
+            breaker=breaker,
+        )
+
+    @contextmanager
+    def call(self) -> Iterator[OutboundCall]:
+        """Korumalı dış çağrı; izin verilmezse OutboundRejected fırlatır"""
+        call = OutboundCall(time.monotonic() + self.deadline)
+        if not self.breaker.allow():
+            raise CircuitOpenError("Open Library devre kesicisi açık")
+        acquired = False
+        started = None
+        try:
+            if not self.limiter.acquire(max(0.0, call.remaining())):
+                raise RateLimitedError("Open Library hız sınırı aşıldı")
+            acquired = self._semaphore.acquire(timeout=max(0.0, call.remaining()))
+            if not acquired:
+                raise RateLimitedError("Open Library eşzamanlı istek sınırı aşıldı")
+            with self._lock:
+                self._in_flight += 1
+            started = time.monotonic()
+            try:
+                yield call
+            except Exception:
+                call.failed = True
+                raise
+        finally:
+            if started is not None:
+                self.breaker.record(not call.failed, time.monotonic() - started)
+            else:
+                self.breaker.cancel()
+            if acquired:
+                with self._lock:
+                    self._in_flight -= 1
+                self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "breaker": self.breaker.snapshot(),
+            "in_flight": in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.limiter.rate,
+            "deadline_seconds": self.deadline,
+        }
@@ -0,0 +1,243 @@
+"""
+Çalışan sunucu için isteğe bağlı CPU profilleme:
+- Sonraki N isteği cProfile ile profilleme (pstats çıktısı); isteğin thread havuzunda
+  çalıştırdığı işler (senkron endpoint'ler, bağımlılıklar, run_in_threadpool) dahil
+- Süreci N saniye boyunca örnekleme (flamegraph için collapsed-stack çıktısı)
+Kapalıyken maliyet istek başına tek bir tamsayı kontrolüdür.
+"""
+
+import cProfile
+import functools
+import io
+import marshal
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+
+# Event loop thread'indeki profil, istek beklerken loop'ta çalışan diğer isteklerin
+# eşyordamlarını da içerir; rapor bu yüzden istekleri tek tek değil toplu gösterir
+SCOPE_NOTE = ("Event loop thread'i ve isteğin thread havuzuna gönderdiği işler profillenir; "
+              "istek beklerken aynı loop'ta çalışan diğer isteklerin kodu da rapora girebilir.")
+
+# Profillenen isteğin görevinde ayarlıdır; thread havuzu kancası yalnızca o isteğin işlerini profiller
+_request_profiles: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar("request_profiles", default=None)
+_hook_lock = threading.Lock()
+# Kancayı isteyen oturum sayısı ve (özgün, kurulan) run_sync çifti
+_hook_users = 0
+_hook_state: Optional[tuple] = None
+
+
+def _profiled_call(profiles: List[cProfile.Profile], func, *args):
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ cProfile tüm süreci izler; loop thread'indeki profil bu işi zaten görür
+        return func(*args)
+    try:
+        return func(*args)
+    finally:
+        profile.disable()
+        profiles.append(profile)
+
+
+def _install_threadpool_hook():
+    """anyio.to_thread.run_sync'i profillenen isteğin işlerini ayrı bir cProfile ile çalıştıracak şekilde sarar
+
+    FastAPI senkron endpoint ve bağımlılıkları, Starlette run_in_threadpool üzerinden
+    anyio.to_thread.run_sync'e gider. cProfile yalnızca etkinleştirildiği thread'i izlediğinden
+    bu işler aksi halde profilde görünmez. Kanca yalnızca profil oturumu sürerken kurulu
+    kalır; her çağrı bir _remove_threadpool_hook ile eşleşmelidir.
+    """
+    global _hook_users, _hook_state
+    with _hook_lock:
+        _hook_users += 1
+        if _hook_users > 1:
+            return
+        import anyio.to_thread
+
+        original = anyio.to_thread.run_sync
+
+        @functools.wraps(original)
+        async def run_sync(func, *args, **kwargs):
+            profiles = _request_profiles.get()
+            if profiles is not None:
+                func = functools.partial(_profiled_call, profiles, func)
+            return await original(func, *args, **kwargs)
+
+        anyio.to_thread.run_sync = run_sync
+        _hook_state = (original, run_sync)
+
+
+def _remove_threadpool_hook():
+    """Son profil oturumu bittiğinde özgün anyio.to_thread.run_sync'i geri koyar"""
+    global _hook_users, _hook_state
+    with _hook_lock:
+        if _hook_users == 0:
+            return
+        _hook_users -= 1
+        if _hook_users or _hook_state is None:
+            return
+        import anyio.to_thread
+
+        original, installed = _hook_state
+        # Başka bir kod sonradan kendi sarmalayıcısını kurduysa zincir bozulmasın diye dokunulmaz;
+        # kancamız profil yokken çağrıyı olduğu gibi geçirir
+        if anyio.to_thread.run_sync is installed:
+            anyio.to_thread.run_sync = original
+        _hook_state = None
+
+
+class RequestProfiler:
+    """Kurulduğunda sonraki N HTTP isteğini cProfile ile profiller
+
+    cProfile thread başına çalıştığından aynı anda yalnızca bir istek profillenir;
+    o sırada gelen diğer istekler profillenmeden geçer ve sayıma dahil edilmez. İsteğin
+    thread havuzundaki işleri ayrı profillerle toplanıp birleştirilir (bkz. SCOPE_NOTE);
+    bunun için gereken thread havuzu kancası yalnızca oturum sürerken kuruludur.
+    """
+
+    def __init__(self):
+        self.remaining = 0
+        self.requested = 0
+        self.completed = 0
+        self._stats: Optional[pstats.Stats] = None
+        self._active = False
+        self._hooked = False
+        self._lock = threading.Lock()
+
+    def arm(self, count: int):
+        with self._lock:
+            self.remaining = max(0, count)
+            self.requested = self.remaining
+            self.completed = 0
+            self._stats = None
+            self._update_hook()
+
+    def _update_hook(self):
+        # Kilit altında çağrılır: oturum (kalan ya da süren istek) varken kanca kurulu olur
+        wanted = self.remaining > 0 or self._active
+        if wanted and not self._hooked:
+            _install_threadpool_hook()
+            self._hooked = True
+        elif not wanted and self._hooked:
+            _remove_threadpool_hook()
+            self._hooked = False
+
+    def _try_begin(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0 or self._active:
+                return False
+            self._active = True
+            self.remaining -= 1
+            return True
+
+    def _end(self, profiles: List[cProfile.Profile]):
+        with self._lock:
+            self._active = False
+            self.completed += 1
+            for profile in profiles:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            self._update_hook()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "requested": self.requested,
+                "remaining": self.remaining,
+                "completed": self.completed,
+                "ready": self._stats is not None and self.remaining == 0 and not self._active,
+                "scope": SCOPE_NOTE,
+            }
+
+    def text_report(self, sort: str = "cumulative", limit: int = 50) -> str:
+        with self._lock:
+            stats = self._stats
+            if stats is None:
+                return ""
+            buffer = io.StringIO()
+            stats.stream = buffer
+            stats.sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
+
+    def pstats_bytes(self) -> bytes:
+        """pstats.Stats(...) ile açılabilen ikili profil dosyası içeriği"""
+        with self._lock:
+            if self._stats is None:
+                return b""
+            return marshal.dumps(self._stats.stats)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: RequestProfiler kuruluysa isteği cProfile altında çalıştırır"""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.profiler.remaining <= 0 or scope["path"].startswith("/admin/profile"):
+            await self.app(scope, receive, send)
+            return
+        if not self.profiler._try_begin():
+            await self.app(scope, receive, send)
+            return
+        profile = cProfile.Profile()
+        profiles = [profile]
+        token = _request_profiles.set(profiles)
+        profile.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.disable()
+            _request_profiles.reset(token)
+            self.profiler._end(profiles)
+
+
+def _frame_key(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def sample_stacks(seconds: float, interval: float = 0.005, include_idle: bool = False) -> Dict[str, int]:
+    """Tüm thread'lerin yığınlarını `seconds` boyunca örnekler
+
+    Sonuç, flamegraph.pl / speedscope tarafından okunabilen collapsed-stack
+    biçimindedir: "thread;dış_fonksiyon;...;iç_fonksiyon" -> örnek sayısı.
+    """
+    own_id = threading.get_ident()
+    names = {}
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names.update({t.ident: t.name for t in threading.enumerate()})
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_key(frame))
+                frame = frame.f_back
+            if not stack:
+                continue
+            # Bekleme halindeki thread'ler (ör. kuyruk/select) varsayılan olarak atlanır
+            if not include_idle and stack[0].split(" ", 1)[0] in ("wait", "select", "_worker", "poll", "accept"):
+                continue
+            stack.reverse()
+            counts[names.get(thread_id, str(thread_id)) + ";" + ";".join(stack)] += 1
+        time.sleep(interval)
+    return dict(counts)
+
+
+def collapsed_text(counts: Dict[str, int]) -> str:
+    """collapsed-stack sözlüğünü metne çevirir (en sık yığın önce)"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(counts.items(), key=lambda item: -item[1]))
@@ -0,0 +1,201 @@
+"""
+SQLite sorgu günlüğü - ifade başına istatistikler, yavaş sorgular için EXPLAIN QUERY PLAN
+yakalama ve tam tablo taraması tespiti
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+
+# Yalnızca sorgu planı anlamlı olan ifadeler için EXPLAIN çalıştırılır
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH", "REPLACE")
+_SCAN_RE = re.compile(r"^SCAN (\w+)(.*)$")
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> List[str]:
+    """Sorgunun EXPLAIN QUERY PLAN satırlarını (detail sütunu) döndürür"""
+    # Enstrümanlı bağlantının execute'u atlanır; EXPLAIN kendisi ölçülmez
+    rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[3] for row in rows]
+
+
+def _open_plan_reader(database) -> Optional[sqlite3.Connection]:
+    """Ertelenmiş planlar için veritabanı dosyasına ayrı salt-okunur bağlantı açar"""
+    if not isinstance(database, str) or not database or database == ":memory:":
+        return None
+    if database.startswith("file:"):
+        if "mode=memory" in database:
+            return None
+        uri = database
+    else:
+        uri = f"file:{os.path.abspath(database)}?mode=ro"
+    try:
+        return sqlite3.connect(uri, uri=True)
+    except sqlite3.Error:
+        return None
+
+
+def analyze_plan(plan: List[str]) -> dict:
+    """Plan satırlarından tam tablo taraması ve geçici sıralama bilgisini çıkarır
+
+    "SCAN books" indeks kullanılmadan yapılan tam taramadır; "SCAN books USING INDEX ..."
+    tüm tabloyu indeks sırasıyla dolaşır (ör. ORDER BY için) ve tam tarama sayılmaz.
+    """
+    full_scans = []
+    for detail in plan:
+        match = _SCAN_RE.match(detail)
+        if match and "USING" not in match.group(2):
+            full_scans.append(match.group(1))
+    return {
+        "plan": plan,
+        "full_scans": full_scans,
+        "temp_btree": any("USE TEMP B-TREE" in d for d in plan),
+        "uses_index": any("USING" in d and "INDEX" in d for d in plan),
+    }
+
+
+class QueryLog:
+    """İfade başına sayım/süre istatistikleri ve eşiği aşan sorguların plan kaydı"""
+
+    def __init__(self, slow_threshold_ms: float = 50.0, max_slow_entries: int = 200,
+                 max_statements: int = 2000):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_statements = max_statements
+        self._stats: Dict[str, list] = {}
+        self._slow: deque = deque(maxlen=max_slow_entries)
+        self._plans: Dict[str, dict] = {}
+        # (kayıt, veritabanı, sql, parametreler): planı raporlama anında çıkarılacak yavaş sorgular
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'QueryLog':
+        try:
+            threshold = float(os.environ.get("KUTUPHANE_SLOW_QUERY_MS", "50"))
+        except ValueError:
+            threshold = 50.0
+        return cls(slow_threshold_ms=threshold)
+
+    def record(self, conn: Optional[sqlite3.Connection], sql: str, params, elapsed: float,
+               many: bool = False, database: Optional[str] = None):
+        """Bir ifade çalıştırmasını kaydeder (enstrümanlı bağlantı tarafından çağrılır)
+
+        conn verilmezse (imleç serbest bırakılırken) plan o bağlantıda çıkarılmaz; yavaş
+        sorgunun planı top()/slow() çağrıldığında database dosyasına açılan ayrı bir
+        salt-okunur bağlantıda çıkarılır.
+        """
+        key = _normalize(sql)
+        with self._lock:
+            row = self._stats.get(key)
+            if row is None:
+                if len(self._stats) >= self.max_statements:
+                    return
+                # [sayım, toplam süre, en uzun süre]
+                row = [0, 0.0, 0.0]
+                self._stats[key] = row
+            row[0] += 1
+            row[1] += elapsed
+            if elapsed > row[2]:
+                row[2] = elapsed
+        elapsed_ms = elapsed * 1000.0
+        if elapsed_ms < self.slow_threshold_ms:
+            return
+        entry = {"ts": time.time(), "sql": key, "duration_ms": round(elapsed_ms, 3)}
+        pending = False
+        if many:
+            analysis = None
+        elif conn is not None:
+            analysis = self.plan_for(conn, sql, params)
+        else:
+            analysis = self._plans.get(key)
+            pending = analysis is None and database is not None and key.upper().startswith(_EXPLAINABLE)
+        if analysis:
+            entry.update(analysis)
+        with self._lock:
+            self._slow.append(entry)
+            if pending:
+                self._pending.append((entry, database, sql, params))
+
+    def plan_for(self, conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> Optional[dict]:
+        """İfadenin plan analizini döndürür (ifade metni başına önbelleğe alınır)"""
+        key = _normalize(sql)
+        cached = self._plans.get(key)
+        if cached is not None:
+            return cached
+        if not key.upper().startswith(_EXPLAINABLE):
+            return None
+        try:
+            analysis = analyze_plan(explain(conn, sql, params))
+        except sqlite3.Error:
+            return None
+        with self._lock:
+            self._plans[key] = analysis
+        return analysis
+
+    def _resolve_pending(self):
+        """Ertelenmiş yavaş sorguların planlarını ayrı bağlantılarda çıkarır"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        readers: Dict[str, Optional[sqlite3.Connection]] = {}
+        try:
+            for entry, database, sql, params in pending:
+                analysis = self._plans.get(_normalize(sql))
+                if analysis is None:
+                    if database not in readers:
+                        readers[database] = _open_plan_reader(database)
+                    reader = readers[database]
+                    analysis = self.plan_for(reader, sql, params) if reader is not None else None
+                if analysis:
+                    with self._lock:
+                        entry.update(analysis)
+        finally:
+            for reader in readers.values():
+                if reader is not None:
+                    reader.close()
+
+    def top(self, n: int = 10) -> List[dict]:
+        """Toplam süreye göre en pahalı N ifade"""
+        self._resolve_pending()
+        with self._lock:
+            items = [(sql, list(row)) for sql, row in self._stats.items()]
+            plans = dict(self._plans)
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        result = []
+        for sql, (count, total, longest) in items[:n]:
+            entry = {
+                "sql": sql,
+                "count": count,
+                "total_ms": round(total * 1000.0, 3),
+                "avg_ms": round(total * 1000.0 / count, 3) if count else 0.0,
+                "max_ms": round(longest * 1000.0, 3),
+            }
+            if sql in plans:
+                entry["full_scans"] = plans[sql]["full_scans"]
+                entry["plan"] = plans[sql]["plan"]
+            result.append(entry)
+        return result
+
+    def slow(self, limit: int = 50) -> List[dict]:
+        """Eşiği aşan son sorgular (planları ile)"""
+        self._resolve_pending()
+        with self._lock:
+            return list(self._slow)[-limit:]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self._plans.clear()
+            self._pending.clear()
+
+
+QUERY_LOG = QueryLog.from_env()
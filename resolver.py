@@ -0,0 +1,198 @@
+"""
+ISBN çözümleme katmanı - yerel katalog, yerel metadata cache, çevrimdışı Open Library
+indeksi ve ağ (Open Library) sırasıyla denenir
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from isbn_validation import is_valid
+from storage import SQLiteStorage
+
+
+# Çözümleme katmanları (hangi kaynağın isteği karşıladığını raporlamak için)
+TIER_CATALOG = "catalog"
+TIER_CACHE = "cache"
+TIER_OFFLINE = "offline"
+TIER_NETWORK = "network"
+
+
+class MetadataCache:
+    """ISBN -> {title, author} önbelleği
+
+    SQLite deposu verilirse kalıcıdır (book_metadata_cache tablosu),
+    aksi halde yalnızca bellekte tutulur.
+    """
+
+    def __init__(self, storage: Optional[SQLiteStorage] = None):
+        self.storage = storage
+        self._memory: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if self.storage:
+            with self.storage.write() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS book_metadata_cache (
+                        isbn TEXT PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        author TEXT NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    def get(self, isbn: str) -> Optional[dict]:
+        if self.storage:
+            with self.storage.read() as conn:
+                row = conn.execute(
+                    "SELECT title, author FROM book_metadata_cache WHERE isbn = ?", (isbn,)
+                ).fetchone()
+            if not row:
+                return None
+            return {"title": row[0], "author": row[1]}
+        with self._lock:
+            info = self._memory.get(isbn)
+        return dict(info) if info else None
+
+    def put(self, isbn: str, info: dict):
+        if self.storage:
+            with self.storage.write() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO book_metadata_cache (isbn, title, author, fetched_at) VALUES (?, ?, ?, ?)",
+                    (isbn, info["title"], info["author"], time.time())
+                )
+            return
+        with self._lock:
+            self._memory[isbn] = {"title": info["title"], "author": info["author"]}
+
+    def __len__(self) -> int:
+        if self.storage:
+            with self.storage.read() as conn:
+                return conn.execute("SELECT COUNT(*) FROM book_metadata_cache").fetchone()[0]
+        return len(self._memory)
+
+
+class AuthorCache:
+    """Open Library yazar anahtarı (/authors/OL123A) -> yazar adı önbelleği
+
+    Katalogdaki yazar sayısı kitap sayısından çok daha azdır; bu nedenle tüm kayıtlar
+    bellekte de tutulur. SQLite deposu verilirse kalıcıdır (authors tablosu) ve bellek
+    katmanı ilk kullanımda depodan tek sorguyla doldurulur.
+    """
+
+    def __init__(self, storage: Optional[SQLiteStorage] = None):
+        self.storage = storage
+        self._memory: Dict[str, str] = {}
+        self._warmed = storage is None
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hit": 0, "miss": 0}
+        if self.storage:
+            with self.storage.write() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS authors (
+                        key TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    def _warm(self):
+        if self._warmed:
+            return
+        with self.storage.read() as conn:
+            rows = conn.execute("SELECT key, name FROM authors").fetchall()
+        with self._lock:
+            for key, name in rows:
+                self._memory.setdefault(key, name)
+            self._warmed = True
+
+    def get(self, key: str) -> Optional[str]:
+        self._warm()
+        with self._lock:
+            name = self._memory.get(key)
+            self.stats["hit" if name is not None else "miss"] += 1
+        return name
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Bilinen anahtarların adlarını döndürür (bilinmeyenler sonuçta yer almaz)"""
+        self._warm()
+        with self._lock:
+            return {key: self._memory[key] for key in set(keys) if key in self._memory}
+
+    def put(self, key: str, name: str):
+        self.put_many({key: name})
+
+    def put_many(self, names: Dict[str, str]):
+        if not names:
+            return
+        if self.storage:
+            now = time.time()
+            with self.storage.write() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO authors (key, name, fetched_at) VALUES (?, ?, ?)",
+                    [(key, name, now) for key, name in names.items()],
+                )
+        with self._lock:
+            self._memory.update(names)
+
+    def __len__(self) -> int:
+        self._warm()
+        return len(self._memory)
+
+
+class BookResolver:
+    """Normalize edilmiş bir ISBN için kitap bilgisini en ucuz kaynaktan çözer
+
+    Sıra: yerel katalog (Library) -> metadata cache -> çevrimdışı indeks -> ağ. Ağdan
+    gelen sonuçlar cache'e yazılır. Her katmanın kaç isteği karşıladığı `stats` içinde tutulur.
+    """
+
+    def __init__(
+        self,
+        fetcher: Callable[[str], Optional[dict]],
+        library=None,
+        cache: Optional[MetadataCache] = None,
+        offline=None,
+    ):
+        self.fetcher = fetcher
+        self.library = library
+        self.cache = cache if cache is not None else MetadataCache()
+        # offline_index.OfflineIndex (lookup(isbn) -> dict | None)
+        self.offline = offline
+        self.stats: Dict[str, int] = {TIER_CATALOG: 0, TIER_CACHE: 0, TIER_OFFLINE: 0, TIER_NETWORK: 0, "miss": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def resolve(self, isbn: str) -> Tuple[Optional[dict], Optional[str]]:
+        """(bilgi, katman) döndürür; bulunamazsa (None, None)"""
+        if self.library is not None:
+            book = self.library.find_book(isbn)
+            if book:
+                self._count(TIER_CATALOG)
+                return {"title": book.title, "author": book.author}, TIER_CATALOG
+        info = self.cache.get(isbn)
+        if info:
+            self._count(TIER_CACHE)
+            return info, TIER_CACHE
+        # Kontrol basamağı tutmayan ISBN çevrimdışı indekste de ağda da bulunamaz
+        if not is_valid(isbn):
+            self._count("miss")
+            return None, None
+        if self.offline is not None:
+            info = self.offline.lookup(isbn)
+            if info:
+                self._count(TIER_OFFLINE)
+                return info, TIER_OFFLINE
+        info = self.fetcher(isbn)
+        if info:
+            self.cache.put(isbn, info)
+            self._count(TIER_NETWORK)
+            return info, TIER_NETWORK
+        self._count("miss")
+        return None, None
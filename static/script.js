@@ -6,6 +6,10 @@ class LibraryManager {
         this.authToken = null;
         this.currentUser = null;
         this.currentRole = null;
+        // Katalog görünümü GET /events olaylarıyla yerinde güncellenir
+        this.books = new Map();
+        this.catalogVersion = null;
+        this.eventSource = null;
         this.init();
     }
 
@@ -214,15 +218,21 @@ class LibraryManager {
         booksListDiv.innerHTML = '';
         try {
             booksListDiv.innerHTML = '<div class="loading">Kitaplar yükleniyor...</div>';
-            // Cache'i tamamen devre dışı bırak
-            const response = await fetch(`${this.apiBaseUrl}/books`, { cache: 'no-store' });
+            // Tarayıcı önbelleğindeki kopya ETag ile doğrulanır (If-None-Match);
+            // katalog değişmediyse sunucu 304 döner ve gövde yeniden indirilmez
+            const response = await fetch(`${this.apiBaseUrl}/books`, { cache: 'no-cache' });
             const books = await response.json();
+            // ETag "c<sürüm>": olay akışı bu sürümden itibaren kaçırılan değişiklikleri gönderir
+            const match = /"c(\d+)"/.exec(response.headers.get('ETag') || '');
+            this.catalogVersion = match ? match[1] : null;
+            this.books = new Map(books.map(book => [book.isbn, book]));
 
             if (books.length === 0) {
                 booksListDiv.innerHTML = '<div class="empty-state">Kütüphanede henüz kitap bulunmuyor.</div>';
             } else {
                 this.displayBooks(books);
             }
+            this.connectEvents();
         } catch (error) {
             console.error('Kitaplar yüklenirken hata:', error);
             booksListDiv.innerHTML = '<div class="error-state">Kitaplar yüklenirken bir hata oluştu.</div>';
@@ -232,9 +242,14 @@ class LibraryManager {
     // Kitapları göster
     displayBooks(books) {
         const booksListDiv = document.getElementById('booksList');
+        const booksHtml = books.map(book => this.bookCardHtml(book)).join('');
+        booksListDiv.innerHTML = `<div class="books-grid">${booksHtml}</div>`;
+    }
+
+    // Tek bir kitap kartının HTML'i
+    bookCardHtml(book) {
         const isAdmin = (this.currentRole === 'admin');
-        const booksHtml = books.map(book => {
-            const adminActions = isAdmin ? `
+        const adminActions = isAdmin ? `
                 <div class="book-actions">
                     <button class="btn btn-small" onclick="libraryManager.prefillEditForm('${book.isbn}','${encodeURIComponent(book.title)}','${encodeURIComponent(book.author)}')">
                         <i class="fas fa-pen"></i> Düzenle
@@ -261,8 +276,79 @@ class LibraryManager {
                 </div>
                 ${adminActions}
             </div>`;
-        }).join('');
-        booksListDiv.innerHTML = `<div class="books-grid">${booksHtml}</div>`;
+    }
+
+    // Sunucu olaylarına (SSE) abone ol; tarayıcı kopunca Last-Event-ID ile kendisi yeniden bağlanır
+    async connectEvents() {
+        if (!window.EventSource) return;
+        if (this.eventSource) this.eventSource.close();
+        const params = new URLSearchParams();
+        if (this.catalogVersion !== null) params.set('since', this.catalogVersion);
+        // Oturum token'ı URL'ye (erişim / proxy günlüklerine) yazılmaz; tek kullanımlık bilet alınır
+        const ticket = this.authToken ? await this.fetchEventTicket() : null;
+        if (ticket) params.set('ticket', ticket);
+        // Bilet beklenirken başka bir çağrı akış açmış olabilir
+        if (this.eventSource) this.eventSource.close();
+        const source = new EventSource(`${this.apiBaseUrl}/events?${params}`);
+        this.eventSource = source;
+        source.addEventListener('book', (e) => this.applyBookEvent(JSON.parse(e.data)));
+        // Değişiklik günlüğünden kurtarılamayan durum: kataloğu yeniden yükle
+        source.addEventListener('reset', () => this.loadBooks());
+        source.addEventListener('list', (e) => {
+            const books = JSON.parse(e.data).books;
+            this.renderUserToRead(books);
+            this.renderUserReadBooks(books.filter(b => b.is_read));
+        });
+        // Kullanılmış bilet ile otomatik yeniden bağlanma (ya da 503) reddedilir ve akış kapanır;
+        // bu durumda yeni bir biletle tekrar bağlan
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED && this.eventSource === source) {
+                setTimeout(() => this.eventSource === source && this.connectEvents(), 3000);
+            }
+        };
+    }
+
+    async fetchEventTicket() {
+        try {
+            const res = await fetch(`${this.apiBaseUrl}/events/ticket`, {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${this.authToken}` }
+            });
+            if (!res.ok) return null;
+            return (await res.json()).ticket;
+        } catch (_) {
+            return null;
+        }
+    }
+
+    // Katalog değişikliğini tüm listeyi yeniden çizmeden uygula
+    applyBookEvent(change) {
+        const grid = document.querySelector('#booksList .books-grid');
+        const existing = grid && grid.querySelector(`.book-card[data-isbn="${change.isbn}"]`);
+        this.catalogVersion = String(change.version);
+        if (change.op === 'delete') {
+            this.books.delete(change.isbn);
+            existing && existing.remove();
+            if (this.books.size === 0) {
+                document.getElementById('booksList').innerHTML = '<div class="empty-state">Kütüphanede henüz kitap bulunmuyor.</div>';
+            }
+            return;
+        }
+        const book = { title: change.title, author: change.author, isbn: change.isbn };
+        this.books.set(book.isbn, book);
+        if (!grid) {
+            this.displayBooks([book]);
+            return;
+        }
+        existing && existing.remove();
+        // Başlık sırasını koru (GET /books ile aynı sıralama)
+        const next = Array.from(grid.children).find(card => {
+            const other = this.books.get(card.dataset.isbn);
+            return other && other.title > book.title;
+        });
+        const template = document.createElement('template');
+        template.innerHTML = this.bookCardHtml(book).trim();
+        grid.insertBefore(template.content.firstChild, next || null);
     }
 
     // Kitap silme modal'ını göster
@@ -508,65 +594,79 @@ class LibraryManager {
         try {
             target.innerHTML = '<div class="loading">Kitaplar yükleniyor...</div>';
             const res = await fetch(`${this.apiBaseUrl}/me/books`, {
-                headers: { 'Authorization': `Bearer ${this.authToken}` }
+                headers: { 'Authorization': `Bearer ${this.authToken}` },
+                cache: 'no-cache'
             });
             const books = await res.json();
-            const toRead = (Array.isArray(books) ? books : []).filter(b => !b.is_read);
-            if (toRead.length === 0) {
-                target.innerHTML = '<div class="empty-state">Okunacak kitap yok.</div>';
-                return;
-            }
-            target.innerHTML = `<div class="books-grid">${toRead.map(b => `
-                <div class="book-card" data-isbn="${b.isbn}">
-                    <div class="book-header">
-                        <div class="book-icon"><i class="fas fa-book"></i></div>
-                        <h3 class="book-title">${b.title}</h3>
-                    </div>
-                    <div class="book-details">
-                        <div class="book-author"><span>${b.author}</span></div>
-                        <div class="book-isbn"><span>${b.isbn}</span></div>
-                    </div>
-                    <div class="book-actions">
-                        <button class="btn btn-small ${b.is_read ? 'btn-outline' : 'btn-secondary'}" onclick="libraryManager.toggleRead('${b.isbn}', ${!b.is_read})">
-                            <i class="fas ${b.is_read ? 'fa-rotate-left' : 'fa-check'}"></i> ${b.is_read ? 'Okunmadı' : 'Okundu'}
-                        </button>
-                        <button class="btn btn-small btn-danger" onclick="libraryManager.removeFromUser('${b.isbn}')"><i class="fas fa-trash"></i> Kaldır</button>
-                    </div>
-                </div>`).join('')}</div>`;
+            this.renderUserToRead(books);
         } catch (e) {
             target.innerHTML = '<div class="error-state">Kullanıcı kitapları yüklenemedi.</div>';
         }
     }
 
+    renderUserToRead(books) {
+        const target = document.getElementById('userToreadList');
+        if (!target) return;
+        const toRead = (Array.isArray(books) ? books : []).filter(b => !b.is_read);
+        if (toRead.length === 0) {
+            target.innerHTML = '<div class="empty-state">Okunacak kitap yok.</div>';
+            return;
+        }
+        target.innerHTML = `<div class="books-grid">${toRead.map(b => `
+            <div class="book-card" data-isbn="${b.isbn}">
+                <div class="book-header">
+                    <div class="book-icon"><i class="fas fa-book"></i></div>
+                    <h3 class="book-title">${b.title}</h3>
+                </div>
+                <div class="book-details">
+                    <div class="book-author"><span>${b.author}</span></div>
+                    <div class="book-isbn"><span>${b.isbn}</span></div>
+                </div>
+                <div class="book-actions">
+                    <button class="btn btn-small ${b.is_read ? 'btn-outline' : 'btn-secondary'}" onclick="libraryManager.toggleRead('${b.isbn}', ${!b.is_read})">
+                        <i class="fas ${b.is_read ? 'fa-rotate-left' : 'fa-check'}"></i> ${b.is_read ? 'Okunmadı' : 'Okundu'}
+                    </button>
+                    <button class="btn btn-small btn-danger" onclick="libraryManager.removeFromUser('${b.isbn}')"><i class="fas fa-trash"></i> Kaldır</button>
+                </div>
+            </div>`).join('')}</div>`;
+    }
+
     async loadUserReadBooks() {
         if (!this.authToken) return;
         const target = document.getElementById('userReadBooksList');
         try {
             target.innerHTML = '<div class="loading">Kitaplar yükleniyor...</div>';
             const res = await fetch(`${this.apiBaseUrl}/me/books/read`, {
-                headers: { 'Authorization': `Bearer ${this.authToken}` }
+                headers: { 'Authorization': `Bearer ${this.authToken}` },
+                cache: 'no-cache'
             });
             const books = await res.json();
-            if (!Array.isArray(books) || books.length === 0) {
-                target.innerHTML = '<div class="empty-state">Henüz okuduğunuz kitap yok.</div>';
-                return;
-            }
-            target.innerHTML = `<div class="books-grid">${books.map(b => `
-                <div class="book-card">
-                    <div class="book-header">
-                        <div class="book-icon"><i class="fas fa-check"></i></div>
-                        <h3 class="book-title">${b.title}</h3>
-                    </div>
-                    <div class="book-details">
-                        <div class="book-author"><span>${b.author}</span></div>
-                        <div class="book-isbn"><span>${b.isbn}</span></div>
-                    </div>
-                </div>`).join('')}</div>`;
+            this.renderUserReadBooks(books);
         } catch (e) {
             target.innerHTML = '<div class="error-state">Okunan kitaplar yüklenemedi.</div>';
         }
     }
 
+    renderUserReadBooks(books) {
+        const target = document.getElementById('userReadBooksList');
+        if (!target) return;
+        if (!Array.isArray(books) || books.length === 0) {
+            target.innerHTML = '<div class="empty-state">Henüz okuduğunuz kitap yok.</div>';
+            return;
+        }
+        target.innerHTML = `<div class="books-grid">${books.map(b => `
+            <div class="book-card">
+                <div class="book-header">
+                    <div class="book-icon"><i class="fas fa-check"></i></div>
+                    <h3 class="book-title">${b.title}</h3>
+                </div>
+                <div class="book-details">
+                    <div class="book-author"><span>${b.author}</span></div>
+                    <div class="book-isbn"><span>${b.isbn}</span></div>
+                </div>
+            </div>`).join('')}</div>`;
+    }
+
     async userAddBook() {
         if (!this.authToken) {
             this.showStatus('Lütfen giriş yapın.', 'error');
@@ -0,0 +1,380 @@
+"""
+SQLite depolama katmanı - bağlantı profili, okuma/yazma ayrımı ve checkpoint politikası
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from metrics import SQLITE_STATEMENT_DURATION, SQLITE_WRITE_LOCK_WAIT, statement_label
+from tracing import current_span
+from querylog import QUERY_LOG
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """İfade süresini metriklere, sorgu günlüğüne ve aktif iz (trace) ağacına yazan imleç
+
+    Satır döndüren ifadelerde SQLite işin çoğunu satırlar çekilirken yapar; bu yüzden
+    fetchone/fetchmany/fetchall ve yineleme süreleri de ifadenin süresine eklenir. Süre
+    imleç tükendiğinde, kapatıldığında ya da serbest bırakıldığında bir kez kaydedilir;
+    yavaş sorgu eşiği (EXPLAIN) bu toplam süreye uygulanır.
+    """
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        # [sql, args, many, label, span, geçen süre]; kaydedilecek ifade yoksa None
+        self._timing: Optional[list] = None
+
+    def _run(self, method, sql, args, many=False):
+        self._finish()
+        label = statement_label(sql)
+        parent = current_span()
+        child = parent.child("sqlite", statement=label) if parent is not None else None
+        start = time.perf_counter()
+        try:
+            method(sql, args)
+        finally:
+            self._timing = [sql, args, many, label, child, time.perf_counter() - start]
+            # Satır döndürmeyen ifadeler (ve hatalar) hemen kaydedilir
+            if self.description is None:
+                self._finish()
+        return self
+
+    def execute(self, sql, parameters=(), /):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self._run(super().executemany, sql, seq_of_parameters, many=True)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._timing is not None:
+                self._timing[5] += time.perf_counter() - start
+
+    def fetchone(self):
+        row = self._fetch(super().fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._fetch(super().fetchmany, size)
+        if len(rows) < size or not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(super().fetchall)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            return self._fetch(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Tüketilmeden bırakılan imleçler (ör. tek satırlık fetchone) serbest bırakılırken kaydedilir.
+        # Bu an çağıranın kilidi bırakılmış olabilir; paylaşılan bağlantıda EXPLAIN çalıştırılmaz,
+        # plan gerekiyorsa ayrı salt-okunur bağlantıda sonradan çıkarılır
+        try:
+            self._finish(deferred=True)
+        except Exception:
+            pass
+
+    def _finish(self, deferred: bool = False):
+        timing, self._timing = getattr(self, "_timing", None), None
+        if timing is None:
+            return
+        sql, args, many, label, child, elapsed = timing
+        SQLITE_STATEMENT_DURATION.observe(elapsed, (label,))
+        if deferred:
+            QUERY_LOG.record(None, sql, args, elapsed, many,
+                             database=getattr(self.connection, "database", None))
+        else:
+            QUERY_LOG.record(self.connection, sql, args, elapsed, many)
+        if child is not None:
+            child.end = child.start + elapsed
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """execute/executemany çağrılarını InstrumentedCursor üzerinden ölçen bağlantı sınıfı"""
+
+    def __init__(self, database, *args, **kwargs):
+        super().__init__(database, *args, **kwargs)
+        # Ertelenen sorgu planları aynı dosyaya açılan ayrı bir bağlantıda çıkarılır
+        self.database = database
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor(InstrumentedCursor).execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor(InstrumentedCursor).executemany(sql, seq_of_parameters)
+
+
+class _ReaderHandle:
+    """Thread'e ait okuma bağlantısını tutar; thread bitip handle toplandığında bağlantı kapanır"""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_reader(storage_ref, conn: sqlite3.Connection):
+    storage = storage_ref()
+    if storage is not None:
+        with storage._readers_lock:
+            if conn in storage._readers:
+                storage._readers.remove(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class StorageProfile:
+    """SQLite bağlantılarına uygulanacak PRAGMA ayarlarını tutar
+
+    Varsayılan profil WAL günlük modunu kullanır; böylece okuyucular
+    yazma işlemleri sırasında bloklanmaz.
+    """
+
+    def __init__(
+        self,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        mmap_size: int = 64 * 1024 * 1024,
+        cache_size: int = -16000,
+        busy_timeout_ms: int = 5000,
+        wal_autocheckpoint: int = 1000,
+        checkpoint_interval: float = 60.0,
+        split_read_connections: bool = True,
+    ):
+        self.journal_mode = journal_mode.upper()
+        self.synchronous = synchronous.upper()
+        self.mmap_size = mmap_size
+        # Negatif değer KiB cinsinden boyut anlamına gelir (SQLite kuralı)
+        self.cache_size = cache_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.wal_autocheckpoint = wal_autocheckpoint
+        # Saniye cinsinden; 0 veya negatif değer periyodik checkpoint'i kapatır
+        self.checkpoint_interval = checkpoint_interval
+        self.split_read_connections = split_read_connections
+
+    @property
+    def is_wal(self) -> bool:
+        return self.journal_mode == "WAL"
+
+    def to_dict(self) -> dict:
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "busy_timeout_ms": self.busy_timeout_ms,
+            "wal_autocheckpoint": self.wal_autocheckpoint,
+            "checkpoint_interval": self.checkpoint_interval,
+            "split_read_connections": self.split_read_connections,
+        }
+
+    @classmethod
+    def from_env(cls, prefix: str = "KUTUPHANE_SQLITE_") -> 'StorageProfile':
+        """Ortam değişkenlerinden profil oluşturur (ör. KUTUPHANE_SQLITE_JOURNAL_MODE=DELETE)"""
+        defaults = cls()
+
+        def _get(name: str, default, cast):
+            raw = os.environ.get(prefix + name)
+            if raw is None or raw == "":
+                return default
+            try:
+                return cast(raw)
+            except ValueError:
+                return default
+
+        def _bool(raw: str) -> bool:
+            return raw.strip().lower() in ("1", "true", "yes", "on")
+
+        return cls(
+            journal_mode=_get("JOURNAL_MODE", defaults.journal_mode, str),
+            synchronous=_get("SYNCHRONOUS", defaults.synchronous, str),
+            mmap_size=_get("MMAP_SIZE", defaults.mmap_size, int),
+            cache_size=_get("CACHE_SIZE", defaults.cache_size, int),
+            busy_timeout_ms=_get("BUSY_TIMEOUT_MS", defaults.busy_timeout_ms, int),
+            wal_autocheckpoint=_get("WAL_AUTOCHECKPOINT", defaults.wal_autocheckpoint, int),
+            checkpoint_interval=_get("CHECKPOINT_INTERVAL", defaults.checkpoint_interval, float),
+            split_read_connections=_get("SPLIT_READ_CONNECTIONS", defaults.split_read_connections, _bool),
+        )
+
+
+class SQLiteStorage:
+    """Tek bir veritabanı dosyası için yazma ve okuma bağlantılarını yönetir
+
+    - Yazma işlemleri tek bir paylaşılan bağlantı üzerinden, kilit ile sıralanarak yapılır.
+    - Okuma işlemleri her thread için ayrı, salt-okunur bağlantılar kullanır.
+    - Yazma sonrası, profilde belirtilen aralık dolduysa pasif WAL checkpoint çalışır.
+    """
+
+    def __init__(self, db_path: str, profile: Optional[StorageProfile] = None):
+        self.db_path = db_path
+        self.profile = profile or StorageProfile()
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._last_checkpoint = time.monotonic()
+        self.checkpoint_count = 0
+        # Yazma kilidi bekleme istatistikleri (kilit altında güncellenir)
+        self.write_count = 0
+        self.lock_wait_total = 0.0
+        self.lock_wait_max = 0.0
+
+    def _apply_pragmas(self, conn: sqlite3.Connection, writer: bool):
+        p = self.profile
+        conn.execute(f"PRAGMA busy_timeout = {int(p.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA cache_size = {int(p.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(p.mmap_size)}")
+        if writer:
+            # journal_mode kalıcıdır; yalnızca yazma bağlantısında ayarlanır
+            conn.execute(f"PRAGMA journal_mode = {p.journal_mode}")
+            conn.execute(f"PRAGMA synchronous = {p.synchronous}")
+            if p.is_wal:
+                conn.execute(f"PRAGMA wal_autocheckpoint = {int(p.wal_autocheckpoint)}")
+
+    def _get_writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=InstrumentedConnection)
+            self._apply_pragmas(conn, writer=True)
+            self._writer = conn
+        return self._writer
+
+    def _open_reader(self) -> sqlite3.Connection:
+        # Dosya henüz yoksa salt-okunur bağlantı açılamaz; önce yazıcı dosyayı oluşturur
+        self._get_writer()
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=InstrumentedConnection)
+        self._apply_pragmas(conn, writer=False)
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Yazma bağlantısını kilitli olarak verir; çıkışta commit, hata durumunda rollback yapar"""
+        started = time.perf_counter()
+        with self._write_lock:
+            waited = time.perf_counter() - started
+            self.write_count += 1
+            self.lock_wait_total += waited
+            if waited > self.lock_wait_max:
+                self.lock_wait_max = waited
+            SQLITE_WRITE_LOCK_WAIT.observe(waited)
+            conn = self._get_writer()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._maybe_checkpoint()
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Geçerli thread'e ait salt-okunur bağlantıyı verir"""
+        if not self.profile.split_read_connections:
+            with self.write() as conn:
+                yield conn
+            return
+        handle = getattr(self._local, "reader", None)
+        if handle is None:
+            handle = _ReaderHandle(self._open_reader())
+            # Thread sonlandığında thread-local temizlenir; bağlantı ve WAL okuma işareti bırakılır
+            weakref.finalize(handle, _release_reader, weakref.ref(self), handle.conn)
+            self._local.reader = handle
+        yield handle.conn
+        # Yalnızca okuyan süreçler de WAL'ı büyütmesin; yazıcı meşgulse beklenmez
+        self._maybe_checkpoint(blocking=False)
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Uzun okumalar için ayrı bir salt-okunur bağlantı ve tek okuma işlemi verir
+
+        Akış halinde dışa aktarım gibi parçalar farklı thread'lerde okunduğunda kullanılır;
+        WAL modunda tüm parçalar aynı tutarlı anlık görüntüyü görür. Çıkışta bağlantı kapanır.
+        """
+        self._get_writer()
+        uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                               factory=InstrumentedConnection)
+        try:
+            self._apply_pragmas(conn, writer=False)
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            conn.close()
+
+    def lock_stats(self) -> dict:
+        """Yazma kilidi için toplam/en uzun bekleme süreleri"""
+        with self._write_lock:
+            return {
+                "writes": self.write_count,
+                "wait_total_s": round(self.lock_wait_total, 6),
+                "wait_max_ms": round(self.lock_wait_max * 1000.0, 3),
+            }
+
+    def _maybe_checkpoint(self, blocking: bool = True):
+        interval = self.profile.checkpoint_interval
+        if not self.profile.is_wal or interval <= 0:
+            return
+        if time.monotonic() - self._last_checkpoint >= interval:
+            self.checkpoint(blocking=blocking)
+
+    def checkpoint(self, mode: str = "PASSIVE", blocking: bool = True) -> Optional[tuple]:
+        """WAL dosyasını ana veritabanına aktarır; (busy, log, checkpointed) döndürür
+
+        blocking=False iken yazma kilidi o an alınamazsa (ya da yazma işlemi açıksa) checkpoint
+        atlanır ve None döner.
+        """
+        if not self._write_lock.acquire(blocking=blocking):
+            return None
+        try:
+            conn = self._get_writer()
+            if not blocking and conn.in_transaction:
+                # Okuma, aynı thread'in açık yazma işleminin içinden yapılmış
+                return None
+            row = conn.execute(f"PRAGMA wal_checkpoint({mode.upper()})").fetchone()
+            self._last_checkpoint = time.monotonic()
+            self.checkpoint_count += 1
+        finally:
+            self._write_lock.release()
+        return tuple(row) if row else (0, 0, 0)
+
+    def close(self):
+        """Tüm bağlantıları kapatır"""
+        with self._readers_lock:
+            for conn in self._readers:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._readers = []
+        self._local = threading.local()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -0,0 +1,14 @@
+"""
+pytest ortak ayarları: API testleri depodaki app.db yerine geçici bir veritabanı kullanır
+"""
+
+import os
+import shutil
+import tempfile
+
+_temp_dir = tempfile.mkdtemp(prefix="kutuphane-test-")
+os.environ.setdefault("KUTUPHANE_DB_PATH", os.path.join(_temp_dir, "app.db"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_temp_dir, ignore_errors=True)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: admission.py için testler
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from admission import (
+    AdmissionController, RouteClassLimiter,
+    CLASS_READ, CLASS_WRITE, CLASS_LOOKUP,
+)
+
+
+class TestRouteClassLimiter:
+    """RouteClassLimiter sınıfı için testler"""
+
+    def test_shed_when_queue_full(self):
+        """Slot ve kuyruk doluyken istek hemen reddedilir"""
+        async def scenario():
+            limiter = RouteClassLimiter("test", max_concurrent=1, max_queue=0, queue_timeout=1.0, retry_after=1)
+            assert await limiter.acquire() is True
+            assert await limiter.acquire() is False
+            limiter.release()
+            assert await limiter.acquire() is True
+            return limiter
+
+        limiter = asyncio.run(scenario())
+        assert limiter.shed_count == 1
+        assert limiter.admitted_count == 2
+
+    def test_queue_timeout(self):
+        """Kuyrukta bekleme süresi dolan istek reddedilir"""
+        async def scenario():
+            limiter = RouteClassLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=0.01, retry_after=1)
+            await limiter.acquire()
+            return await limiter.acquire(), limiter
+
+        admitted, limiter = asyncio.run(scenario())
+        assert admitted is False
+        assert limiter.queue_depth == 0
+
+    def test_release_hands_slot_to_waiter(self):
+        """Bırakılan slot kuyruktaki bekleyene devredilir"""
+        async def scenario():
+            limiter = RouteClassLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=1.0, retry_after=1)
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            assert limiter.queue_depth == 1
+            limiter.release()
+            return await waiter, limiter
+
+        admitted, limiter = asyncio.run(scenario())
+        assert admitted is True
+        assert limiter.in_flight == 1
+
+
+    def test_cancelled_waiter_returns_slot(self):
+        """Slot devredildikten sonra iptal edilen bekleyen slotu sızdırmaz"""
+        async def scenario():
+            limiter = RouteClassLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=1.0, retry_after=1)
+            await limiter.acquire()
+
+            async def request():
+                if await limiter.acquire():
+                    limiter.release()
+
+            waiter = asyncio.create_task(request())
+            await asyncio.sleep(0)
+            limiter.release()
+            waiter.cancel()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                pass
+            return limiter
+
+        limiter = asyncio.run(scenario())
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+    def test_cancel_after_handover_releases(self):
+        """wait_for iptali yutmasa bile (Python 3.12+) devredilen slot geri verilir"""
+        async def scenario():
+            limiter = RouteClassLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=1.0, retry_after=1)
+            await limiter.acquire()
+
+            async def handed_over_then_cancelled(fut, timeout):
+                limiter.release()
+                raise asyncio.CancelledError()
+
+            with patch("admission.asyncio.wait_for", handed_over_then_cancelled):
+                with pytest.raises(asyncio.CancelledError):
+                    await limiter.acquire()
+            return limiter
+
+        limiter = asyncio.run(scenario())
+        assert limiter.in_flight == 0
+
+class TestAdmissionController:
+    """AdmissionController sınıflandırma testleri"""
+
+    def test_classify(self):
+        """İstekler doğru rota sınıfına ayrılır"""
+        controller = AdmissionController()
+
+        assert controller.classify("GET", "/books") == CLASS_READ
+        assert controller.classify("POST", "/books") == CLASS_LOOKUP
+        assert controller.classify("POST", "/me/books") == CLASS_LOOKUP
+        assert controller.classify("POST", "/books", b"async=true") == CLASS_WRITE
+        assert controller.classify("POST", "/books", b"isbn=1&async=Yes") == CLASS_WRITE
+        assert controller.classify("POST", "/books", b"async=on") == CLASS_WRITE
+        assert controller.classify("POST", "/books", b"foo_async=true") == CLASS_LOOKUP
+        assert controller.classify("POST", "/books", b"async=false") == CLASS_LOOKUP
+        assert controller.classify("POST", "/books", b"async=true&async=0") == CLASS_LOOKUP
+        assert controller.classify("DELETE", "/books/1234567890") == CLASS_WRITE
+        assert controller.classify("GET", "/health") is None
+        assert controller.classify("GET", "/static/script.js") is None
+
+    def test_from_env(self, monkeypatch):
+        """Ortam değişkenleri ile sınırlar ayarlanabilir"""
+        monkeypatch.setenv("KUTUPHANE_ADMISSION_LOOKUP_CONCURRENCY", "3")
+
+        controller = AdmissionController.from_env()
+        assert controller.limiters[CLASS_LOOKUP].max_concurrent == 3
+
+
+class TestAdmissionMiddleware:
+    """API üzerinde yük atma davranışı"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        import api
+        self.api = api
+        self.client = TestClient(api.app)
+        self.lookup = api.admission.limiters[CLASS_LOOKUP]
+        self.saved = (self.lookup.in_flight, self.lookup.max_queue)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.lookup.in_flight, self.lookup.max_queue = self.saved
+
+    def test_saturated_lookups_shed_reads_served(self):
+        """Lookup sınıfı doluyken eklemeler 503 alır, okumalar çalışmaya devam eder"""
+        self.lookup.in_flight = self.lookup.max_concurrent
+        self.lookup.max_queue = 0
+
+        response = self.client.post("/books", json={"isbn": "1234567890"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(self.lookup.retry_after)
+
+        assert self.client.get("/books").status_code == 200
+        health = self.client.get("/health").json()
+        assert health["admission"][CLASS_LOOKUP]["shed"] >= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
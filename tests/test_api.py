@@ -100,19 +100,19 @@ class TestAPI:
         """Başarılı kitap ekleme testi"""
         with patch('api.library', self.test_library):
             with patch.object(self.test_library, 'add_book_by_isbn') as mock_add:
-                mock_book = Book("Test Kitap", "Test Yazar", "1234567890")
+                mock_book = Book("Test Kitap", "Test Yazar", "9780306406157")
                 mock_add.return_value = mock_book
                 
                 response = self.client.post(
                     "/books",
-                    json={"isbn": "1234567890"}
+                    json={"isbn": "0-306-40615-2"}
                 )
                 
                 assert response.status_code == 200
                 data = response.json()
                 assert data["title"] == "Test Kitap"
                 assert data["author"] == "Test Yazar"
-                assert data["isbn"] == "1234567890"
+                assert data["isbn"] == "9780306406157"
     
     def test_post_books_invalid_isbn(self):
         """Geçersiz ISBN ile kitap ekleme testi"""
@@ -136,16 +136,29 @@ class TestAPI:
         data = response.json()
         assert "Geçersiz ISBN formatı" in data["detail"]
     
+    def test_post_books_checksum_mismatch(self):
+        """Kontrol basamağı tutmayan ISBN ağa gönderilmeden reddedilir"""
+        with patch('api.library', self.test_library), \
+                patch.object(self.test_library, 'add_book_by_isbn') as mock_add:
+            response = self.client.post(
+                "/books",
+                json={"isbn": "978-0-306-40615-8"}
+            )
+            
+            assert response.status_code == 400
+            assert "kontrol basamağı" in response.json()["detail"]
+            mock_add.assert_not_called()
+    
     def test_post_books_duplicate_isbn(self):
         """Var olan ISBN ile kitap ekleme testi"""
         # Test kitabı ekle
-        test_book = Book("Test Kitap", "Test Yazar", "1234567890")
+        test_book = Book("Test Kitap", "Test Yazar", "9780306406157")
         self.test_library.add_book(test_book)
         
         with patch('api.library', self.test_library):
             response = self.client.post(
                 "/books",
-                json={"isbn": "1234567890"}
+                json={"isbn": "0-306-40615-2"}
             )
             
             assert response.status_code == 409
@@ -160,7 +173,7 @@ class TestAPI:
                 
                 response = self.client.post(
                     "/books",
-                    json={"isbn": "1234567890"}
+                    json={"isbn": "0-306-40615-2"}
                 )
                 
                 assert response.status_code == 404
@@ -250,5 +263,81 @@ class TestAPI:
         assert response.status_code == 422  # Validation error
 
 
+class TestConditionalRequests:
+    """ETag / If-None-Match testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        from api import get_current_username
+        from models import UserManager
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=db_path)
+        self.manager = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=db_path, library=self.library)
+        self.library.add_book(Book("Test Kitap", "Test Yazar", "1234567890"))
+        self.patches = [patch("api.library", self.library), patch("api.user_manager", self.manager)]
+        for p in self.patches:
+            p.start()
+        app.dependency_overrides[get_current_username] = lambda: "demo"
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        import shutil
+        app.dependency_overrides = {}
+        for p in self.patches:
+            p.stop()
+        self.library.storage.close()
+        self.manager.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_books_not_modified(self):
+        """Katalog değişmediyse 304 döner, değiştiyse yeni ETag ile 200"""
+        first = self.client.get("/books")
+        etag = first.headers["etag"]
+
+        cached = self.client.get("/books", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        self.library.add_book(Book("Yeni Kitap", "Yeni Yazar", "0987654321"))
+        changed = self.client.get("/books", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert len(changed.json()) == 2
+
+    def test_books_not_modified_without_query(self):
+        """304 yanıtı için kitap listesi sorgulanmaz"""
+        etag = self.client.get("/books").headers["etag"]
+
+        with patch.object(self.library, "books_snapshot") as listing:
+            assert self.client.get("/books", headers={"If-None-Match": f'W/{etag}, "x"'}).status_code == 304
+            listing.assert_not_called()
+
+    def test_user_list_versioned_per_user(self):
+        """Kullanıcı listesi ETag'i listedeki her değişiklikte değişir"""
+        first = self.client.get("/me/books")
+        etag = first.headers["etag"]
+        assert first.headers["vary"] == "Authorization"
+        assert "private" in first.headers["cache-control"]
+        assert self.client.get("/me/books", headers={"If-None-Match": etag}).status_code == 304
+
+        self.manager.add_book_to_user_by_isbn("demo", "1234567890")
+        after_add = self.client.get("/me/books", headers={"If-None-Match": etag})
+        assert after_add.status_code == 200
+        self.manager.mark_user_book_read("demo", "1234567890")
+        assert self.client.get("/me/books", headers={"If-None-Match": after_add.headers["etag"]}).status_code == 200
+        assert self.client.get("/me/books/read").headers["etag"] != after_add.headers["etag"]
+
+    def test_user_etag_differs_between_users(self):
+        """Aynı sürümdeki farklı kullanıcıların ETag'leri farklıdır"""
+        from api import get_current_username
+        demo_etag = self.client.get("/me/books").headers["etag"]
+        app.dependency_overrides[get_current_username] = lambda: "admin"
+
+        assert self.client.get("/me/books", headers={"If-None-Match": demo_etag}).status_code == 200
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
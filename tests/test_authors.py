@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: yazar önbelleği, yazar referansları ve GET /authors/{name}/books için testler
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock, patch
+
+from api import app, require_admin
+from models import Book, Library
+from resolver import AuthorCache
+from storage import SQLiteStorage
+
+
+def _response(status_code: int, payload: dict = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = payload or {}
+    return response
+
+
+def _mock_openlibrary(mock_client, editions: dict, authors: dict) -> Mock:
+    """URL'ye göre baskı / yazar yanıtı döndüren sahte istemci"""
+    def get(url, **kwargs):
+        for key, payload in {**editions, **authors}.items():
+            if url.endswith(f"{key}.json"):
+                return _response(200, payload)
+        return _response(404)
+
+    client = Mock()
+    client.get.side_effect = get
+    mock_client.return_value.__enter__.return_value = client
+    return client
+
+
+def _author_calls(client: Mock) -> list:
+    return [c.args[0] for c in client.get.call_args_list if "/authors/" in c.args[0]]
+
+
+class TestAuthorCache:
+    """AuthorCache testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(os.path.join(self.temp_dir, "app.db"))
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_persistent(self):
+        """Yazılan adlar yeni bir örnekte depodan okunur"""
+        AuthorCache(self.storage).put_many({"/authors/OL1A": "Sait Faik", "/authors/OL2A": "Orhan Veli"})
+
+        cache = AuthorCache(self.storage)
+
+        assert cache.get("/authors/OL1A") == "Sait Faik"
+        assert cache.get("/authors/OL3A") is None
+        assert cache.stats == {"hit": 1, "miss": 1}
+        assert cache.get_many(["/authors/OL2A", "/authors/OL3A"]) == {"/authors/OL2A": "Orhan Veli"}
+        assert len(cache) == 2
+
+    def test_memory_only(self):
+        """Depo verilmezse yalnızca bellekte tutulur"""
+        cache = AuthorCache()
+        cache.put("/authors/OL1A", "Sait Faik")
+
+        assert cache.get("/authors/OL1A") == "Sait Faik"
+
+
+class TestAuthorReferences:
+    """Library yazar önbelleği ve yazar referansı testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _author_key(self, isbn: str):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT author_key FROM books WHERE isbn = ?", (isbn,)).fetchone()[0]
+
+    @patch('models.httpx.Client')
+    def test_author_fetched_once(self, mock_client):
+        """Aynı yazarın ikinci kitabı için yazar isteği yapılmaz; referans kitaba yazılır"""
+        client = _mock_openlibrary(
+            mock_client,
+            editions={
+                "/isbn/9781111111113": {"title": "Semaver", "authors": [{"key": "/authors/OL1A"}]},
+                "/isbn/9782222222224": {"title": "Lüzumsuz Adam", "authors": [{"key": "/authors/OL1A"}]},
+            },
+            authors={"/authors/OL1A": {"name": "Sait Faik Abasıyanık"}},
+        )
+
+        self.library.add_book_by_isbn("9781111111113")
+        self.library.add_book_by_isbn("9782222222224")
+
+        assert len(_author_calls(client)) == 1
+        assert self.library.find_book("9782222222224").author == "Sait Faik Abasıyanık"
+        assert self._author_key("9782222222224") == "/authors/OL1A"
+
+    @patch('models.httpx.Client')
+    def test_failed_author_not_cached(self, mock_client):
+        """Yazar isteği başarısızsa ad önbelleğe yazılmaz"""
+        client = _mock_openlibrary(
+            mock_client,
+            editions={"/isbn/9781111111113": {"title": "Semaver", "authors": [{"key": "/authors/OL9A"}]}},
+            authors={},
+        )
+
+        info = self.library._fetch_book_from_api("9781111111113")
+
+        assert info["author"] == "Bilinmeyen Yazar"
+        assert self.library.authors.get("/authors/OL9A") is None
+        assert len(_author_calls(client)) == 1
+
+    @patch('models.httpx.Client')
+    def test_prefetch(self, mock_client):
+        """Bilinen anahtarlar atlanır, bilinmeyenler tek istemciyle çekilir"""
+        self.library.authors.put("/authors/OL1A", "Sait Faik")
+        client = _mock_openlibrary(mock_client, editions={},
+                                   authors={"/authors/OL2A": {"name": "Orhan Veli"}})
+
+        result = self.library.prefetch_authors(["/authors/OL1A", "/authors/OL2A", "/authors/OL3A", "/authors/OL2A", "x"])
+
+        assert result == {"requested": 3, "cached": 1, "fetched": 1, "failed": 1}
+        assert [url.rsplit("/", 1)[-1] for url in _author_calls(client)] == ["OL2A.json", "OL3A.json"]
+        assert self.library.authors.get("/authors/OL2A") == "Orhan Veli"
+
+    def test_manual_author_change_clears_reference(self):
+        """Yazar adı elle değiştirilince referans silinir, yalnızca başlık değişince korunur"""
+        self.library.add_book(Book("Semaver", "Sait Faik", "9781111111113"), author_key="/authors/OL1A")
+
+        self.library.update_book("9781111111113", title="Semaver (2. baskı)")
+        assert self._author_key("9781111111113") == "/authors/OL1A"
+        self.library.update_book("9781111111113", author="Başka Yazar")
+        assert self._author_key("9781111111113") is None
+
+    def test_books_by_author_uses_index(self):
+        """Yazara göre sorgu başlık sırasıyla döner ve indeks kullanır"""
+        self.library.add_book(Book("Son Kuşlar", "Sait Faik", "9781111111113"))
+        self.library.add_book(Book("Alemdağ'da Var Bir Yılan", "Sait Faik", "9782222222224"))
+        self.library.add_book(Book("Kuyucaklı Yusuf", "Sabahattin Ali", "9783333333335"))
+
+        titles = [book.title for book in self.library.books_by_author(" Sait Faik ")]
+        with sqlite3.connect(self.db_path) as conn:
+            plan = " ".join(row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT title, author, isbn FROM books WHERE author = ? ORDER BY title", ("x",)))
+
+        assert titles == ["Alemdağ'da Var Bir Yılan", "Son Kuşlar"]
+        assert "idx_books_author" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_migrates_existing_books_table(self):
+        """author_key sütunu olmayan eski veritabanına sütun eklenir"""
+        self.library.storage.close()
+        old_db = os.path.join(self.temp_dir, "old.db")
+        with sqlite3.connect(old_db) as conn:
+            conn.execute("CREATE TABLE books (isbn TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL)")
+            conn.execute("INSERT INTO books VALUES ('9781111111113', 'Semaver', 'Sait Faik')")
+
+        self.library = Library(os.path.join(self.temp_dir, "old.json"), db_path=old_db)
+
+        assert [b.isbn for b in self.library.books_by_author("Sait Faik")] == ["9781111111113"]
+
+
+class TestAuthorEndpoints:
+    """GET /authors/{name}/books ve POST /admin/authors/prefetch testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.library = Library(os.path.join(self.temp_dir, "library.json"),
+                               db_path=os.path.join(self.temp_dir, "app.db"))
+        self.library.add_book(Book("Kuyucaklı Yusuf", "Sabahattin Ali", "9783333333335"))
+        self.patcher = patch("api.library", self.library)
+        self.patcher.start()
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        app.dependency_overrides = {}
+        self.patcher.stop()
+        self.library.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_author_books(self):
+        """Yazarın kitapları döner, bilinmeyen yazar 404"""
+        response = self.client.get("/authors/Sabahattin Ali/books")
+
+        assert response.status_code == 200
+        assert response.json() == [{"title": "Kuyucaklı Yusuf", "author": "Sabahattin Ali", "isbn": "9783333333335"}]
+        assert self.client.get("/authors/Bilinmeyen/books").status_code == 404
+
+    def test_prefetch_requires_admin(self):
+        """Önbellek doldurma admin yetkisi ister"""
+        assert self.client.post("/admin/authors/prefetch", json={"keys": []}).status_code == 401
+
+    def test_prefetch(self):
+        """Admin anahtar listesini önbelleğe yükletir"""
+        app.dependency_overrides[require_admin] = lambda: "admin"
+        self.library.authors.put("/authors/OL1A", "Sait Faik")
+
+        response = self.client.post("/admin/authors/prefetch", json={"keys": ["/authors/OL1A"]})
+
+        assert response.status_code == 200
+        assert response.json()["cached"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
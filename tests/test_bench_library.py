@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: benchmarks/bench_library.py için testler
+"""
+
+import pytest
+import json
+from benchmarks.bench_library import run, check_regressions, DEFAULT_THRESHOLDS
+
+
+OPS = {"load", "add_book", "update_book", "find_book", "list_books", "remove_book",
+       "list_user_books", "mark_user_book_read"}
+
+
+def _entry(op: str, median_ms: float) -> dict:
+    return {"backend": "sqlite", "size": 1000, "op": op, "iterations": 1,
+            "mean_ms": median_ms, "median_ms": median_ms, "p95_ms": median_ms, "max_ms": median_ms}
+
+
+class TestBenchLibrary:
+    """Performans ölçüm aracı testleri"""
+
+    def test_run_covers_all_operations(self):
+        """Her iki depolama modunda tüm işlemler ölçülür"""
+        report = run(sizes=(200,), iterations=3, write_iterations=2, heavy_iterations=1, reading_list=50)
+
+        for backend in ("json", "sqlite"):
+            ops = {e["op"] for e in report["results"] if e["backend"] == backend}
+            assert ops == OPS
+        assert json.loads(json.dumps(report)) == report
+
+    def test_threshold_violation(self):
+        """Mutlak eşiği aşan işlem raporlanır"""
+        report = {"results": [_entry("find_book", 2.0)]}
+
+        failures = check_regressions(report, thresholds={"sqlite/find_book/1000": {"median_ms": 1.0}})
+        assert len(failures) == 1
+        assert check_regressions(report, thresholds={"sqlite/find_book/1000": {"median_ms": 5.0}}) == []
+
+    def test_baseline_regression(self):
+        """Önceki çalıştırmaya göre izin verilenden fazla yavaşlama raporlanır"""
+        baseline = {"results": [_entry("list_books", 10.0), _entry("find_book", 0.01)]}
+        report = {"results": [_entry("list_books", 14.0), _entry("find_book", 0.03)]}
+
+        failures = check_regressions(report, baseline=baseline, max_regression=0.25)
+        assert len(failures) == 1
+        assert failures[0].startswith("sqlite/list_books/1000")
+
+    def test_default_thresholds_valid(self):
+        """Depodaki eşik dosyası bilinen işlemlere ait anahtarlar içerir"""
+        with open(DEFAULT_THRESHOLDS, "r", encoding="utf-8") as f:
+            thresholds = json.load(f)
+
+        for key, limits in thresholds.items():
+            backend, op, size = key.split("/")
+            assert backend in ("json", "sqlite")
+            assert op in OPS
+            assert int(size) > 0
+            assert limits
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: catalog_store.py ve Library sütun tabanlı katalog entegrasyonu için testler
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+import threading
+from catalog_store import ColumnarCatalog, encode_isbn, decode_isbn
+from models import Library, Book
+
+
+ROWS = [
+    ("Zeta", "Yazar A", "0123456789"),
+    ("Alfa", "Yazar B", "080442957X"),
+    ("Orta", "Yazar A", "9780140328721"),
+]
+
+
+class TestIsbnPacking:
+    """ISBN paketleme testleri"""
+
+    def test_roundtrip(self):
+        """Baştaki sıfırlar ve sondaki X korunur"""
+        for isbn in ("0000000001", "080442957X", "9780140328721"):
+            assert decode_isbn(encode_isbn(isbn)) == isbn
+
+    def test_unpackable(self):
+        """Rakam dışı veya çok uzun değerler paketlenmez"""
+        assert encode_isbn("ABC") is None
+        assert encode_isbn("") is None
+        assert encode_isbn("1" * 16) is None
+
+
+class TestColumnarCatalog:
+    """ColumnarCatalog testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "catalog.bin")
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_find_and_title_order(self):
+        """ISBN ile ikili arama yapılır; listeleme başlık sırasındadır"""
+        catalog = ColumnarCatalog.build(ROWS)
+
+        assert catalog.find("080442957X") == ("Alfa", "Yazar B", "080442957X")
+        assert catalog.find("1111111111") is None
+        assert [row[0] for row in catalog.iter_by_title()] == ["Alfa", "Orta", "Zeta"]
+
+    def test_save_and_mmap_open(self):
+        """Kaydedilen dosya mmap ile açılır ve aynı sonuçları verir"""
+        ColumnarCatalog.build(ROWS, version=7).save(self.path)
+        catalog = ColumnarCatalog.open(self.path)
+        try:
+            assert len(catalog) == 3
+            assert catalog.version == 7
+            assert catalog.find("9780140328721") == ("Orta", "Yazar A", "9780140328721")
+            assert catalog.to_dicts()[0] == {"title": "Alfa", "author": "Yazar B", "isbn": "080442957X"}
+        finally:
+            catalog.close()
+
+    def test_concurrent_saves_stay_valid(self):
+        """Aynı yola eşzamanlı kayıtlar ayrı geçici dosyalar kullanır; sonuç bozulmaz"""
+        catalogs = [ColumnarCatalog.build(ROWS, version=v) for v in range(1, 9)]
+        threads = [threading.Thread(target=c.save, args=(self.path,)) for c in catalogs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        catalog = ColumnarCatalog.open(self.path)
+        try:
+            assert len(catalog) == 3
+            assert catalog.find("080442957X") == ("Alfa", "Yazar B", "080442957X")
+        finally:
+            catalog.close()
+        assert os.listdir(self.temp_dir) == ["catalog.bin"]
+
+    def test_invalid_file_rejected(self):
+        """Geçersiz dosya ValueError ile reddedilir"""
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 256)
+
+        with pytest.raises(ValueError):
+            ColumnarCatalog.open(self.path)
+
+    def test_unpackable_isbn_rejected(self):
+        """Paketlenemeyen ISBN ile katalog oluşturulmaz"""
+        with pytest.raises(ValueError):
+            ColumnarCatalog.build([("Kitap", "Yazar", "ISBN-YOK")])
+
+
+class TestLibraryCatalogStore:
+    """Library'nin sütun tabanlı katalogdan okuması"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+        self.catalog_path = os.path.join(self.temp_dir, "catalog.bin")
+        seed = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        for title, author, isbn in ROWS:
+            seed.add_book(Book(title, author, isbn))
+        seed.close()
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _library(self) -> Library:
+        return Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path,
+                       catalog_path=self.catalog_path)
+
+    def test_serves_reads_from_catalog(self):
+        """find_book ve listeleme katalogdan karşılanır; bellekte satır listesi tutulmaz"""
+        library = self._library()
+        try:
+            assert library.catalog is not None
+            assert library._books == []
+            assert [b.title for b in library.books] == ["Alfa", "Orta", "Zeta"]
+            assert library.find_book("080-442-957X").title == "Alfa"
+            assert [b.title for b in library.list_books()] == ["Alfa", "Orta", "Zeta"]
+            assert library.get_books_as_dicts()[2]["isbn"] == "9780123456786"
+        finally:
+            library.close()
+
+    def _wait_rebuild(self, library: Library):
+        thread = library._catalog_thread
+        if thread is not None:
+            thread.join(timeout=10)
+
+    def test_write_falls_back_to_sqlite(self):
+        """Yazma sonrası okuma SQLite'tan yapılır; katalog arka planda tazelenir"""
+        library = self._library()
+        try:
+            library.add_book(Book("Beta", "Yazar C", "9781111111113"))
+
+            assert library.find_book("9781111111113").title == "Beta"
+            assert library.count_books() == 4
+            self._wait_rebuild(library)
+            assert library.catalog.version == library.catalog_version()
+            assert library.catalog.find("9781111111113") is not None
+            assert library.catalog_status()["active"] is True
+        finally:
+            library.close()
+
+    def test_write_from_other_process_detected(self):
+        """Başka bir bağlantının (işçi / CLI) yazması eski katalogdan okunmaz"""
+        library = self._library()
+        writer = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        try:
+            writer.remove_book("0123456789")
+            writer.add_book(Book("Beta", "Yazar C", "9781111111113"))
+
+            assert library.find_book("0123456789") is None
+            assert [b.title for b in library.list_books()] == ["Alfa", "Beta", "Orta"]
+            self._wait_rebuild(library)
+            assert library.find_book("9781111111113").title == "Beta"
+            assert len(library.catalog) == 3
+        finally:
+            writer.close()
+            library.close()
+
+    def test_close_waits_for_rebuild(self):
+        """close() arka plandaki oluşturmayı bekler; sonra yeni oluşturma başlatılmaz"""
+        library = self._library()
+        library.add_book(Book("Beta", "Yazar C", "9781111111113"))
+        library.find_book("9781111111113")
+        thread = library._catalog_thread
+
+        library.close()
+
+        assert thread is not None and not thread.is_alive()
+        assert library.catalog is None
+        library._schedule_catalog_rebuild(12345)
+        assert library._catalog_thread is thread
+
+    def test_snapshot_version_matches_rows(self):
+        """books_snapshot sürümü dönen satırların sürümüdür (katalog ya da SQLite)"""
+        library = self._library()
+        try:
+            version, books = library.books_snapshot()
+            assert version == library.catalog.version
+            library.add_book(Book("Beta", "Yazar C", "9781111111113"))
+            version, books = library.books_snapshot()
+            assert version == library.catalog_version()
+            assert len(books) == 4
+        finally:
+            library.close()
+
+    def test_stale_file_rebuilt_on_open(self):
+        """Dosya sürümü veritabanından eskiyse açılışta yeniden oluşturulur"""
+        self._library().close()
+        writer = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        writer.remove_book("0123456789")
+        writer.close()
+
+        library = self._library()
+        try:
+            assert library.catalog.version == library.catalog_version()
+            assert library.find_book("0123456789") is None
+        finally:
+            library.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
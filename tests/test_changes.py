@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: katalog değişiklik günlüğü (GET /books/changes) için testler
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from api import app, require_admin
+from models import Book, Library
+
+
+class TestChangeLog:
+    """Library.changes_since / compact_changes testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_inserts_updates_and_tombstones(self):
+        """Ekleme, güncelleme ve silme sürüm sırasıyla döner"""
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+        self.library.add_book(Book("Kitap B", "Yazar B", "9782222222224"))
+        since = self.library.catalog_version()
+        self.library.update_book("9781111111113", title="Kitap A2")
+        self.library.remove_book("9782222222224")
+        self.library.add_book(Book("Kitap C", "Yazar C", "9783333333335"))
+
+        result = self.library.changes_since(since)
+
+        assert result["reset"] is False
+        assert result["version"] == self.library.catalog_version()
+        assert [(c["op"], c["isbn"]) for c in result["changes"]] == [
+            ("update", "9781111111113"), ("delete", "9782222222224"), ("insert", "9783333333335"),
+        ]
+        assert result["changes"][0]["title"] == "Kitap A2"
+        assert "title" not in result["changes"][1]
+        assert self.library.changes_since(result["version"])["changes"] == []
+
+    def test_changes_compacted_per_isbn(self):
+        """Aynı ISBN'in ardışık değişikliklerinden yalnızca sonuncusu döner"""
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+        for i in range(5):
+            self.library.update_book("9781111111113", title=f"Başlık {i}")
+
+        changes = self.library.changes_since(0)["changes"]
+
+        assert len(changes) == 1
+        assert changes[0]["title"] == "Başlık 4"
+
+    def test_paging(self):
+        """limit aşılırsa has_more ve devam sürümü döner"""
+        for i in range(5):
+            self.library.add_book(Book(f"Kitap {i}", "Yazar", f"978000000000{i}"))
+
+        first = self.library.changes_since(0, limit=3)
+        rest = self.library.changes_since(first["version"], limit=3)
+
+        assert first["has_more"] is True and len(first["changes"]) == 3
+        assert rest["has_more"] is False and len(rest["changes"]) == 2
+        assert rest["version"] == self.library.catalog_version()
+
+    def test_compaction_forces_reset_for_stale_clients(self):
+        """Silinen mezar taşlarından eski istemciler reset alır, yeniler etkilenmez"""
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+        stale = self.library.catalog_version()
+        self.library.remove_book("9781111111113")
+        current = self.library.catalog_version()
+
+        result = self.library.compact_changes(retain=0)
+
+        assert result == {"removed": 1, "compacted_version": current}
+        assert self.library.changes_since(stale)["reset"] is True
+        assert self.library.changes_since(current)["reset"] is False
+        assert self.library.changes_since(current + 100)["reset"] is True
+
+    def test_compaction_without_tombstones_keeps_history(self):
+        """Silme kaydı yoksa sıkıştırma istemcileri sıfırlamaz"""
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+
+        assert self.library.compact_changes(retain=0)["removed"] == 0
+        assert self.library.changes_since(0)["reset"] is False
+
+    def test_existing_catalog_backfilled(self):
+        """Günlükten önce oluşturulmuş veritabanındaki kitaplar günlüğe eklenir"""
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+        self.library.storage.close()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP TABLE book_changes")
+            conn.execute("DROP TABLE book_changes_state")
+
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+
+        assert [c["isbn"] for c in self.library.changes_since(0)["changes"]] == ["9781111111113"]
+
+    def test_json_mode_requires_full_sync(self):
+        """JSON modunda günlük yoktur; sürüm değiştiyse reset döner"""
+        library = Library(os.path.join(self.temp_dir, "books.json"))
+        library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+        version = library.catalog_version()
+
+        assert library.changes_since(0)["reset"] is True
+        assert library.changes_since(version) == {"version": version, "reset": False, "has_more": False, "changes": []}
+
+
+class TestChangesEndpoint:
+    """GET /books/changes uç noktası testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.library = Library(os.path.join(self.temp_dir, "library.json"),
+                               db_path=os.path.join(self.temp_dir, "app.db"))
+        self.patcher = patch("api.library", self.library)
+        self.patcher.start()
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        app.dependency_overrides = {}
+        self.patcher.stop()
+        self.library.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sync_from_books_etag(self):
+        """GET /books ETag'indeki sürümden itibaren yalnızca yeni değişiklikler döner"""
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+        since = int(self.client.get("/books").headers["etag"].strip('"c'))
+        self.library.add_book(Book("Kitap B", "Yazar B", "9782222222224"))
+
+        response = self.client.get(f"/books/changes?since={since}")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [c["isbn"] for c in body["changes"]] == ["9782222222224"]
+        assert body["version"] == since + 1
+
+    def test_compact_requires_admin(self):
+        """Sıkıştırma uç noktası admin yetkisi ister"""
+        assert self.client.post("/admin/books/changes/compact").status_code == 401
+        app.dependency_overrides[require_admin] = lambda: "admin"
+
+        response = self.client.post("/admin/books/changes/compact?retain=0")
+
+        assert response.status_code == 200
+        assert response.json()["removed"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: events.py (SSE yayını) için testler
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+
+from admission import AdmissionController
+import api
+from api import app
+from events import EventBroadcaster, encode_event
+from models import Book, Library, UserManager
+
+
+def _parse(chunk: bytes) -> dict:
+    fields = {}
+    for line in chunk.decode("utf-8").strip().splitlines():
+        key, _, value = line.partition(": ")
+        fields[key] = value
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+class TestEventBroadcaster:
+    """EventBroadcaster testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=db_path)
+        self.users = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=db_path, library=self.library)
+        self.library.add_book(Book("Kitap A", "Yazar A", "9781111111113"))
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        self.users.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_encode_event(self):
+        """Olay id, tür ve JSON veri satırları ile kodlanır"""
+        chunk = encode_event("book", {"isbn": "1"}, 7)
+
+        assert chunk == b'id: 7\nevent: book\ndata: {"isbn": "1"}\n\n'
+
+    def test_replay_since_version(self):
+        """since verilirse kaçırılan değişiklikler önce gönderilir"""
+        since = self.library.catalog_version()
+        self.library.add_book(Book("Kitap B", "Yazar B", "9782222222224"))
+        self.library.remove_book("9781111111113")
+        broadcaster = EventBroadcaster(self.library, self.users)
+
+        async def scenario():
+            stream = broadcaster.stream(since=since)
+            chunks = [await stream.__anext__() for _ in range(3)]
+            await stream.aclose()
+            return chunks
+
+        chunks = asyncio.run(scenario())
+
+        assert chunks[0].startswith(b"retry:")
+        events = [_parse(c) for c in chunks[1:]]
+        assert [(e["event"], e["data"]["op"], e["data"]["isbn"]) for e in events] == [
+            ("book", "insert", "9782222222224"), ("book", "delete", "9781111111113"),
+        ]
+        assert events[-1]["id"] == str(self.library.catalog_version())
+        assert broadcaster.subscriber_count == 0
+
+    def test_poll_fans_out_once(self):
+        """Bir değişiklik tek yoklamada tüm abonelere dağıtılır"""
+        broadcaster = EventBroadcaster(self.library, self.users)
+
+        async def scenario():
+            streams = [broadcaster.stream() for _ in range(3)]
+            for stream in streams:
+                await stream.__anext__()
+            await asyncio.to_thread(self.library.update_book, "9781111111113", "Yeni Başlık")
+            await broadcaster.poll()
+            chunks = [await stream.__anext__() for stream in streams]
+            for stream in streams:
+                await stream.aclose()
+            return chunks
+
+        chunks = asyncio.run(scenario())
+
+        assert len(set(chunks)) == 1
+        event = _parse(chunks[0])
+        assert event["event"] == "book"
+        assert event["data"]["title"] == "Yeni Başlık"
+        assert broadcaster.events_sent == 1
+
+    def test_user_list_events(self):
+        """Kullanıcı bağlantıları önce güncel listeyi, sonra değişiklikleri alır"""
+        broadcaster = EventBroadcaster(self.library, self.users)
+
+        async def scenario():
+            stream = broadcaster.stream(username="demo")
+            await stream.__anext__()
+            initial = await stream.__anext__()
+            await asyncio.to_thread(self.users.add_book_to_user_by_isbn, "demo", "9781111111113")
+            await broadcaster.poll()
+            update = await stream.__anext__()
+            await stream.aclose()
+            return initial, update
+
+        initial, update = (_parse(c) for c in asyncio.run(scenario()))
+
+        assert initial["event"] == "list" and initial["data"]["books"] == []
+        assert update["event"] == "list"
+        assert [b["isbn"] for b in update["data"]["books"]] == ["9781111111113"]
+        assert "id" not in update
+
+    def test_slow_subscriber_dropped(self):
+        """Kuyruğu dolan bağlantı kapatılır"""
+        broadcaster = EventBroadcaster(self.library, self.users, queue_size=1)
+
+        async def scenario():
+            stream = broadcaster.stream()
+            await stream.__anext__()
+            broadcaster._publish(broadcaster._subscribers, None, b": ping\n\n")
+            broadcaster._publish(broadcaster._subscribers, None, b": ping\n\n")
+            with pytest.raises(StopAsyncIteration):
+                await stream.__anext__()
+
+        asyncio.run(scenario())
+
+        assert broadcaster.dropped_count == 1
+        assert broadcaster.subscriber_count == 0
+
+
+class TestEventsEndpoint:
+    """GET /events uç noktası testleri"""
+
+    def test_exempt_from_admission(self):
+        """SSE akışı kabul kontrolü slotu tutmaz"""
+        assert AdmissionController().classify("GET", "/events") is None
+
+    def test_invalid_ticket_rejected(self):
+        """Geçersiz bilet ile kullanıcı olaylarına abone olunamaz"""
+        client = TestClient(app)
+
+        assert client.get("/events?ticket=yok").status_code == 401
+
+    def test_ticket_requires_login(self):
+        """Bilet yalnızca oturum token'ı ile (Authorization başlığı) alınır"""
+        assert TestClient(app).post("/events/ticket").status_code == 401
+
+    def test_ticket_single_use_and_expires(self):
+        """Bilet kullanıcıyı akışa bağlar, bir kez kullanılabilir ve süresi dolunca reddedilir"""
+        streamed = []
+
+        async def stream(username, since):
+            streamed.append(username)
+            yield b": ok\n\n"
+
+        fake_events = Mock(subscriber_count=0, max_subscribers=10, stream=stream)
+        client = TestClient(app)
+        api.active_tokens["sse-test-token"] = "demo"
+        try:
+            with patch("api.events", fake_events):
+                headers = {"Authorization": "Bearer sse-test-token"}
+                ticket = client.post("/events/ticket", headers=headers).json()["ticket"]
+                assert "sse-test-token" not in ticket
+                assert client.get(f"/events?ticket={ticket}").status_code == 200
+                assert streamed == ["demo"]
+                assert client.get(f"/events?ticket={ticket}").status_code == 401
+
+                with patch("api.SSE_TICKET_TTL", -1.0):
+                    expired = client.post("/events/ticket", headers=headers).json()["ticket"]
+                assert client.get(f"/events?ticket={expired}").status_code == 401
+        finally:
+            api.active_tokens.pop("sse-test-token", None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: export.py (akış halinde dışa aktarım) için testler
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from api import app, require_admin
+from export import export_stream, iter_chunks
+from models import Library, UserManager
+
+
+class TestExportStream:
+    """export_stream / iter_chunks testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=db_path)
+        self.users = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=db_path, library=self.library)
+        with self.library._get_conn() as conn:
+            conn.executemany(
+                "INSERT INTO books (isbn, title, author) VALUES (?, ?, ?)",
+                ((str(9780000000000 + i), f"Kitap, {i}", f"Yazar \"{i % 3}\"") for i in range(25)),
+            )
+        with self.users._get_conn() as conn:
+            conn.execute(
+                "INSERT INTO user_books (username, isbn, title, author, is_read) VALUES ('demo', '9780000000001', 'Kitap, 1', 'Yazar', 1)"
+            )
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        self.users.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_chunks_are_bounded(self):
+        """Satırlar chunk_size boyutunu aşmayan parçalarla okunur"""
+        chunks = list(iter_chunks(self.library.storage, "books", chunk_size=10))
+
+        assert [len(c) for c in chunks] == [10, 10, 5]
+
+    def test_ndjson(self):
+        """NDJSON her satırda bir JSON nesnesi üretir; is_read bool olur"""
+        lines = b"".join(export_stream(self.library.storage, "books", "ndjson", 7)).decode("utf-8").splitlines()
+        user_books = b"".join(export_stream(self.users.storage, "user_books")).decode("utf-8")
+
+        assert len(lines) == 25
+        assert json.loads(lines[0]) == {"isbn": "9780000000000", "title": "Kitap, 0", "author": 'Yazar "0"'}
+        assert json.loads(user_books)["is_read"] is True
+
+    def test_csv_round_trip(self):
+        """CSV başlık satırı ile başlar, virgül ve tırnaklar doğru kaçırılır"""
+        body = b"".join(export_stream(self.library.storage, "books", "csv", 4)).decode("utf-8")
+
+        rows = list(csv.DictReader(io.StringIO(body)))
+
+        assert len(rows) == 25
+        assert rows[1] == {"isbn": "9780000000001", "title": "Kitap, 1", "author": 'Yazar "1"'}
+
+    def test_users_export_omits_password_hash(self):
+        """Kullanıcı dışa aktarımı parola özetlerini içermez"""
+        body = b"".join(export_stream(self.users.storage, "users")).decode("utf-8")
+
+        assert "password_hash" not in body
+        assert {json.loads(line)["username"] for line in body.splitlines()} == {"admin", "demo"}
+
+    def test_snapshot_is_consistent(self):
+        """Akış sürerken yapılan yazmalar devam eden dışa aktarımı etkilemez"""
+        stream = export_stream(self.library.storage, "books", "ndjson", 10)
+        first = next(stream)
+        with self.library._get_conn() as conn:
+            conn.execute("INSERT INTO books (isbn, title, author) VALUES ('9799999999999', 'Son', 'Yazar')")
+
+        body = first + b"".join(stream)
+
+        assert len(body.splitlines()) == 25
+
+    def test_unknown_table(self):
+        """Bilinmeyen tablo adı reddedilir"""
+        with pytest.raises(ValueError):
+            next(export_stream(self.library.storage, "sessions"))
+
+
+class TestExportEndpoint:
+    """GET /admin/export/{table} uç noktası testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=db_path)
+        self.users = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=db_path, library=self.library)
+        self.patches = [patch("api.library", self.library), patch("api.user_manager", self.users)]
+        for p in self.patches:
+            p.start()
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        app.dependency_overrides = {}
+        for p in self.patches:
+            p.stop()
+        self.library.storage.close()
+        self.users.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_requires_admin(self):
+        """Dışa aktarım admin yetkisi ister"""
+        assert self.client.get("/admin/export/books").status_code == 401
+
+    def test_csv_download(self):
+        """CSV yanıtı ek olarak indirilir"""
+        app.dependency_overrides[require_admin] = lambda: "admin"
+
+        response = self.client.get("/admin/export/users?format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="users.csv"' in response.headers["content-disposition"]
+        assert response.text.splitlines()[0] == "username,role"
+
+    def test_unknown_table(self):
+        """Bilinmeyen tablo 404 döner"""
+        app.dependency_overrides[require_admin] = lambda: "admin"
+
+        assert self.client.get("/admin/export/sessions").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: importer.py (toplu içe aktarım) için testler
+"""
+
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+import importer
+from api import app, require_admin
+from models import Book, Library
+
+
+def _isbn(n: int) -> str:
+    """n'inci geçerli ISBN-13 (978 + 9 basamak + kontrol basamağı)"""
+    body = f"978{n:09d}"
+    return body + str(-sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(body)) % 10)
+
+
+class TestBulkImport:
+    """bulk_import testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _import(self, text: str, fmt: str = "csv", **kwargs) -> dict:
+        return importer.bulk_import(self.library, io.StringIO(text), fmt, **kwargs)
+
+    def test_csv_with_header_and_validation(self):
+        """ISBN'ler normalize edilir, geçersiz satırlar raporlanır"""
+        report = self._import(
+            "title,author,isbn\n"
+            "Kitap A,Yazar A,978-0-19-953567-5\n"
+            "Kitap B,Yazar B,0-306-40615-2\n"
+            "Eksik,,9780804429573\n"
+            "Bozuk,Yazar,12345\n"
+            "Kontrol,Yazar,9780199535676\n"
+        )
+
+        assert report["inserted"] == 2
+        assert report["invalid"] == 3
+        assert [e.split(":")[0] for e in report["errors"]] == ["satır 4", "satır 5", "satır 6"]
+        assert self.library.find_book("9780199535675").title == "Kitap A"
+        assert self.library.find_book("0306406152").isbn == "9780306406157"
+
+    def test_isbn10_and_isbn13_merge(self):
+        """Aynı kitabın ISBN-10 ve ISBN-13 satırları tek kayıt olur"""
+        report = self._import("0-306-40615-2,Eski Baskı,Yazar\n978-0-306-40615-7,Yeni Baskı,Yazar\n")
+
+        assert (report["inserted"], report["duplicates"]) == (1, 1)
+        assert self.library.find_book("0306406152").title == "Yeni Baskı"
+
+    def test_upsert_and_duplicates(self):
+        """Var olan kitaplar güncellenir, aynı olanlar atlanır, dosyadaki son tekrar kazanır"""
+        self.library.add_book(Book("Eski", "Yazar", _isbn(1)))
+        self.library.add_book(Book("Aynı", "Yazar", _isbn(2)))
+
+        report = self._import(
+            f"{_isbn(1)},Ara,Yazar\n"
+            f"{_isbn(1)},Yeni,Yazar\n"
+            f"{_isbn(2)},Aynı,Yazar\n"
+            f"{_isbn(3)},Ek,Yazar\n"
+        )
+
+        assert (report["inserted"], report["updated"], report["unchanged"], report["duplicates"]) == (1, 1, 1, 1)
+        assert self.library.find_book(_isbn(1)).title == "Yeni"
+
+    def test_ndjson(self):
+        """NDJSON satırları okunur, bozuk JSON satırı geçersiz sayılır"""
+        report = self._import(f'{{"isbn": "{_isbn(1)}", "title": "A", "author": "B"}}\n{{bozuk\n', "ndjson")
+
+        assert report["inserted"] == 1
+        assert report["invalid"] == 1
+
+    def test_change_log_and_triggers_preserved(self):
+        """Parça başına bir sürüm yazılır ve tetikleyiciler yeniden oluşturulur"""
+        before = self.library.catalog_version()
+
+        self._import("".join(f"{_isbn(i)},Kitap {i},Yazar\n" for i in range(5)), batch_size=2)
+
+        changes = self.library.changes_since(before)["changes"]
+        assert len(changes) == 5
+        assert self.library.catalog_version() == before + 3
+        self.library.add_book(Book("Sonra", "Yazar", _isbn(99)))
+        assert self.library.changes_since(before + 3)["changes"][0]["isbn"] == _isbn(99)
+        with sqlite3.connect(self.db_path) as conn:
+            triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        assert {"books_changes_insert", "books_changes_update", "books_changes_delete"} <= triggers
+
+    def test_index_rebuilt_after_large_import(self):
+        """Büyük içe aktarımlarda başlık indeksi sonda yeniden kurulur"""
+        with patch.object(importer, "DEFER_INDEX_THRESHOLD", 3):
+            report = self._import("".join(f"{_isbn(i)},Kitap {i},Yazar\n" for i in range(5)))
+
+        assert "index_rebuild_s" in report
+        with sqlite3.connect(self.db_path) as conn:
+            assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_books_title'").fetchone()
+
+    def test_index_visible_to_readers_during_large_import(self):
+        """Büyük içe aktarım sürerken diğer bağlantılar indeksi görür; hata olursa indeks kalır"""
+        seen = []
+        original = importer._merge_rows
+
+        def merge_rows(library, conn, low, high, dry_run=False):
+            with sqlite3.connect(self.db_path) as reader:
+                seen.append(reader.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'idx_books_title'").fetchone() is not None)
+            return original(library, conn, low, high, dry_run)
+
+        rows = "".join(f"{_isbn(i)},Kitap {i},Yazar\n" for i in range(5))
+        with patch.object(importer, "DEFER_INDEX_THRESHOLD", 3), patch.object(importer, "_merge_rows", merge_rows):
+            report = self._import(rows, batch_size=2)
+        assert seen == [True, True, True]
+        assert report["inserted"] == 5 and report["batches"] == 3
+
+        def failing(library, conn, low, high, dry_run=False):
+            raise RuntimeError("kesildi")
+
+        with patch.object(importer, "DEFER_INDEX_THRESHOLD", 3), patch.object(importer, "_merge_rows", failing):
+            with pytest.raises(RuntimeError):
+                self._import(rows.replace("Kitap", "Roman"))
+        with sqlite3.connect(self.db_path) as conn:
+            assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_books_title'").fetchone()
+        assert self.library.find_book(_isbn(0)).title == "Kitap 0"
+
+    def test_dry_run_writes_nothing(self):
+        """dry_run yalnızca sayar"""
+        report = self._import(f"{_isbn(1)},A,B\n", dry_run=True)
+
+        assert report["inserted"] == 1
+        assert self.library.find_book(_isbn(1)) is None
+
+
+class TestImportEndpoint:
+    """POST /admin/import uç noktası testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.library = Library(os.path.join(self.temp_dir, "library.json"),
+                               db_path=os.path.join(self.temp_dir, "app.db"))
+        self.patcher = patch("api.library", self.library)
+        self.patcher.start()
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        app.dependency_overrides = {}
+        self.patcher.stop()
+        self.library.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_requires_admin(self):
+        """İçe aktarım admin yetkisi ister"""
+        assert self.client.post("/admin/import", content=b"").status_code == 401
+
+    def test_upload_csv(self):
+        """Gövdedeki CSV içe aktarılır ve rapor döner"""
+        app.dependency_overrides[require_admin] = lambda: "admin"
+
+        response = self.client.post("/admin/import?format=csv",
+                                    content=f"isbn,title,author\n{_isbn(1)},Çalıkuşu,Reşat Nuri\n".encode("utf-8"))
+
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 1
+        assert self.library.find_book(_isbn(1)).author == "Reşat Nuri"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: isbn_validation.py ve ISBN-13 standart biçimine geçiş için testler
+"""
+
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+from unittest.mock import Mock, patch
+
+from isbn_validation import canonicalize, canonicalize_many, normalize
+from models import Library, UserManager
+from resolver import BookResolver, MetadataCache
+
+
+class TestCanonicalize:
+    """Kontrol basamağı doğrulaması ve ISBN-13'e çevirme testleri"""
+
+    def test_known_values(self):
+        """ISBN-10 ve ISBN-13 aynı standart biçime çevrilir"""
+        assert canonicalize("0-306-40615-2") == "9780306406157"
+        assert canonicalize("978-0-306-40615-7") == "9780306406157"
+        assert canonicalize("080442957x") == "9780804429573"
+        assert canonicalize("979-10-90636-07-1") == "9791090636071"
+
+    def test_invalid_values(self):
+        """Kontrol basamağı, önek veya karakterler hatalıysa None"""
+        for value in ("1234567890", "9780306406158", "9770306406157", "X306406152", "03064061X2",
+                      "٠٣٠٦٤٠٦١٥٢", "", "123", None):
+            assert canonicalize(value) is None, value
+
+    def test_normalize_keeps_legacy_values(self):
+        """normalize geçersiz değeri yalnızca temizler"""
+        assert normalize("0-306-40615-2") == "9780306406157"
+        assert normalize("123-456-7890") == "1234567890"
+
+    def test_batch_matches_single(self):
+        """canonicalize_many tekil doğrulamayla aynı sonucu verir"""
+        rng = random.Random(7)
+        values = []
+        for _ in range(5000):
+            digits = "".join(rng.choice("0123456789") for _ in range(12))
+            values.append(rng.choice([digits[:9] + rng.choice("0123456789X"), "978" + digits[:10],
+                                      "979" + digits[:10], digits[:3] + "-" + digits[3:]]))
+
+        result = canonicalize_many(values)
+
+        assert result == [canonicalize(value) for value in values]
+        assert any(result) and not all(result)
+
+
+class TestIsbn13Migration:
+    """Kayıtlı ISBN-10 anahtarlarının ISBN-13'e geçişi"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE books (isbn TEXT PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL)")
+            conn.executemany("INSERT INTO books VALUES (?, ?, ?)", [
+                ("0306406152", "On", "Yazar"),
+                ("080442957X", "Çift", "Yazar"),
+                ("9780804429573", "Çift", "Yazar"),
+                ("1234567890", "Eski Geçersiz", "Yazar"),
+            ])
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_books_migrated_once(self):
+        """ISBN-10 satırları çevrilir, çift kayıt silinir, geçersiz kayıt korunur"""
+        library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        try:
+            isbns = sorted(b.isbn for b in library.list_books())
+            version = library.catalog_version()
+            assert isbns == ["1234567890", "9780306406157", "9780804429573"]
+            assert library.find_book("0-306-40615-2").title == "On"
+            assert library.find_book("1234567890").title == "Eski Geçersiz"
+        finally:
+            library.storage.close()
+
+        reopened = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        try:
+            assert reopened.catalog_version() == version
+        finally:
+            reopened.storage.close()
+
+    def test_user_books_migrated(self):
+        """Kullanıcı listelerindeki ISBN-10 kayıtları da çevrilir"""
+        manager = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=self.db_path)
+        manager.storage.close()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM isbn_migrations WHERE name = 'user_books'")
+            conn.execute("INSERT INTO user_books (username, isbn, title, author) VALUES ('demo', '0306406152', 'On', 'Yazar')")
+
+        manager = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=self.db_path)
+        try:
+            assert [b["isbn"] for b in manager.list_user_books("demo")] == ["9780306406157"]
+            assert manager.remove_user_book("demo", "0-306-40615-2")
+        finally:
+            manager.storage.close()
+
+    def test_json_mode_canonicalized_on_load(self):
+        """JSON modunda eski ISBN-10 kayıtları yüklenirken çevrilir"""
+        filename = os.path.join(self.temp_dir, "library.json")
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump([{"title": "On", "author": "Yazar", "isbn": "0306406152"},
+                       {"title": "On", "author": "Yazar", "isbn": "9780306406157"}], f)
+
+        library = Library(filename)
+
+        assert [b.isbn for b in library.books] == ["9780306406157"]
+
+
+class TestNoNetworkForInvalidIsbn:
+    """Kontrol basamağı tutmayan ISBN'ler için ağ çağrısı yapılmaz"""
+
+    def test_library(self):
+        """add_book_by_isbn geçersiz ISBN'i ağa göndermez"""
+        library = Library(os.path.join(tempfile.mkdtemp(), "library.json"))
+        with patch.object(library, "_fetch_book_from_api") as mock_fetch:
+            assert library.add_book_by_isbn("123-456-7890") is None
+
+            mock_fetch.assert_not_called()
+
+    def test_resolver(self):
+        """Çözümleyici geçersiz ISBN'i ıskalama sayar"""
+        fetcher = Mock(return_value={"title": "A", "author": "B"})
+        resolver = BookResolver(fetcher, cache=MetadataCache())
+
+        assert resolver.resolve("1234567890") == (None, None)
+        assert resolver.stats["miss"] == 1
+        fetcher.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
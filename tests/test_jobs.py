@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: jobs.py ve asenkron ISBN ekleme için testler
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+import time
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from jobs import JobQueue, JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING
+from storage import SQLiteStorage
+from models import Library, Book
+
+
+class TestJobQueue:
+    """JobQueue sınıfı için testler"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "jobs.db")
+        self.storage = SQLiteStorage(self.db_path)
+        self.queue = JobQueue(self.storage, workers=1)
+        self.queue.register("echo", lambda payload: {"value": payload["value"]})
+        self.queue.register("none", lambda payload: None)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.queue.stop()
+        self.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _insert_pending(self, kind: str, payload: str = '{"value": 1}') -> str:
+        # Worker başlatmadan doğrudan bekleyen iş ekler
+        with self.storage.write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                ("j-" + kind, kind, payload, JOB_PENDING, time.time(), time.time())
+            )
+        return "j-" + kind
+
+    def test_run_pending_done_and_failed(self):
+        """Handler sonucu done, None sonucu failed olarak kaydedilir"""
+        done_id = self._insert_pending("echo", '{"value": 42}')
+        failed_id = self._insert_pending("none")
+
+        assert self.queue.run_pending() == 2
+        assert self.queue.get(done_id)["status"] == JOB_DONE
+        assert self.queue.get(done_id)["result"] == {"value": 42}
+        assert self.queue.get(failed_id)["status"] == JOB_FAILED
+        assert self.queue.counts()[JOB_DONE] == 1
+
+    def test_unknown_kind_rejected(self):
+        """Kayıtlı olmayan iş türü kuyruğa alınamaz"""
+        with pytest.raises(ValueError):
+            self.queue.enqueue("bilinmeyen", {})
+
+    def test_enqueue_processed_by_worker(self):
+        """Kuyruğa alınan iş worker thread tarafından işlenir"""
+        job_id = self.queue.enqueue("echo", {"value": "x"})
+
+        deadline = time.time() + 5
+        while time.time() < deadline and self.queue.get(job_id)["status"] != JOB_DONE:
+            time.sleep(0.01)
+        assert self.queue.get(job_id)["status"] == JOB_DONE
+
+    def test_survives_restart(self):
+        """Yarım kalan işler yeni kuyruk örneğinde yeniden işlenir"""
+        job_id = self._insert_pending("echo")
+        with self.storage.write() as conn:
+            conn.execute("UPDATE jobs SET status = ?, updated_at = 0 WHERE id = ?", (JOB_RUNNING, job_id))
+
+        restarted = JobQueue(SQLiteStorage(self.db_path), workers=1)
+        restarted.register("echo", lambda payload: {"ok": True})
+        restarted._recover_stale()
+        assert restarted.run_pending() == 1
+        assert restarted.get(job_id)["status"] == JOB_DONE
+        restarted.storage.close()
+
+
+class TestAsyncAddEndpoints:
+    """?async=true ile 202 Accepted akışı"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        from api import app
+        self.client = TestClient(app)
+        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
+        self.temp_file.write('[]')
+        self.temp_file.close()
+        self.test_library = Library(self.temp_file.name)
+        # api.job_queue varsayılan kütüphanenin app.db'sini kullanır; testler geçici kuyrukla çalışır
+        import api
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(os.path.join(self.temp_dir, "jobs.db"))
+        self.queue = JobQueue(self.storage, workers=1)
+        self.queue.register("library_add", api._run_library_add_job)
+        self.queue.register("user_add", api._run_user_add_job)
+        self.queue_patcher = patch('api.job_queue', self.queue)
+        self.queue_patcher.start()
+        self.tokens_patcher = patch.dict(api.active_tokens, {"jobs-token": "demo", "other-token": "baska"})
+        self.tokens_patcher.start()
+        self.headers = {"Authorization": "Bearer jobs-token"}
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.tokens_patcher.stop()
+        self.queue_patcher.stop()
+        self.queue.stop()
+        self.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        if os.path.exists(self.temp_file.name):
+            os.unlink(self.temp_file.name)
+
+    def _wait_for(self, job_id: str) -> dict:
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            data = self.client.get(f"/jobs/{job_id}", headers=self.headers).json()
+            if data["status"] in (JOB_DONE, JOB_FAILED):
+                return data
+            time.sleep(0.01)
+        return data
+
+    def test_post_books_async(self):
+        """POST /books?async=true 202 döner ve iş kitabı ekler"""
+        with patch('api.library', self.test_library):
+            with patch.object(self.test_library, '_fetch_book_from_api') as mock_fetch:
+                mock_fetch.return_value = {"title": "Test Kitap", "author": "Test Yazar"}
+
+                response = self.client.post("/books?async=true", json={"isbn": "0306406152"},
+                                            headers=self.headers)
+                assert response.status_code == 202
+                job_id = response.json()["job_id"]
+                assert response.headers["location"] == f"/jobs/{job_id}"
+
+                job = self._wait_for(job_id)
+                assert job["status"] == JOB_DONE
+                assert job["result"]["title"] == "Test Kitap"
+                assert self.test_library.find_book("0306406152") is not None
+
+    def test_async_duplicate_rejected_synchronously(self):
+        """Katalogda zaten olan ISBN için iş oluşturulmaz"""
+        self.test_library.add_book(Book("Test Kitap", "Test Yazar", "0306406152"))
+        with patch('api.library', self.test_library):
+            response = self.client.post("/books?async=true", json={"isbn": "0306406152"})
+
+            assert response.status_code == 409
+
+    def test_async_requires_login(self):
+        """Anonim async istek iş oluşturmaz"""
+        with patch('api.library', self.test_library):
+            response = self.client.post("/books?async=true", json={"isbn": "0306406152"})
+
+            assert response.status_code == 401
+            assert self.queue.counts()[JOB_PENDING] == 0
+
+    def test_unknown_job(self):
+        """Olmayan iş için 404, token olmadan 401"""
+        assert self.client.get("/jobs/yok", headers=self.headers).status_code == 404
+        assert self.client.get("/jobs/yok").status_code == 401
+
+    def test_other_users_job_hidden(self):
+        """Başka kullanıcının işi 404 döner"""
+        # Worker başlatmamak için iş doğrudan yazılır
+        job_id = "j-demo"
+        with self.storage.write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, "user_add", '{"username": "demo", "isbn": "0306406152"}', JOB_PENDING, time.time(), time.time())
+            )
+        assert self.client.get(f"/jobs/{job_id}", headers=self.headers).status_code == 200
+
+        response = self.client.get(f"/jobs/{job_id}", headers={"Authorization": "Bearer other-token"})
+
+        assert response.status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: benchmarks/openlibrary_stub.py ve benchmarks/loadtest.py için testler
+"""
+
+import pytest
+import asyncio
+import random
+import httpx
+from unittest.mock import patch
+from benchmarks.openlibrary_stub import StubConfig, start_in_thread
+from benchmarks.loadtest import run_step, summarize, random_isbn13
+from models import Library
+
+
+class TestOpenLibraryStub:
+    """Taklit Open Library sunucusu testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.servers = []
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def _start(self, **config) -> str:
+        server, base_url = start_in_thread(StubConfig(seed=1, **config))
+        self.servers.append(server)
+        return base_url
+
+    def test_isbn_and_author_endpoints(self):
+        """ISBN ve yazar uçları Open Library biçiminde yanıt verir"""
+        base_url = self._start()
+        book = httpx.get(f"{base_url}/isbn/9780140328721.json").json()
+        author = httpx.get(f"{base_url}{book['authors'][0]['key']}.json").json()
+
+        assert book["title"] == "Taklit Kitap 9780140328721"
+        assert author["name"].startswith("Taklit Yazar")
+
+    def test_error_and_not_found_rates(self):
+        """Hata ve bulunamadı oranları uygulanır"""
+        assert httpx.get(f"{self._start(error_rate=1.0)}/isbn/1234567890.json").status_code == 503
+        assert httpx.get(f"{self._start(not_found_rate=1.0)}/isbn/1234567890.json").status_code == 404
+
+    def test_library_fetch_through_stub(self):
+        """Library dış çağrı yolu taklit sunucuya yönlendirilebilir"""
+        base_url = self._start(latency_ms=5)
+        with patch("models.OPENLIBRARY_URL", base_url):
+            info = Library()._fetch_book_from_api("978-0140328721")
+
+        assert info["title"] == "Taklit Kitap 9780140328721"
+        assert info["author"].startswith("Taklit Yazar")
+
+
+class TestLoadTest:
+    """Yük testi aracı testleri"""
+
+    def test_random_isbn13_checksum(self):
+        """Üretilen ISBN-13 değerlerinin kontrol basamağı geçerlidir"""
+        rng = random.Random(3)
+        for _ in range(20):
+            isbn = random_isbn13(rng)
+            assert len(isbn) == 13
+            assert sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(isbn)) % 10 == 0
+
+    def test_summarize(self):
+        """Verim, yüzdelikler ve hata sayısı hesaplanır"""
+        result = summarize("get_books", 4, [0.001 * i for i in range(1, 101)], {"200": 98, "503": 2}, 2.0)
+
+        assert result["throughput_rps"] == 50.0
+        assert result["p50_ms"] == pytest.approx(50.0, abs=1.0)
+        assert result["p99_ms"] == pytest.approx(99.0, abs=1.0)
+        assert result["errors"] == 2
+
+    def test_run_step_in_process(self):
+        """Senaryo uygulamaya ASGI üzerinden çalıştırılabilir"""
+        from api import app
+        transport = httpx.ASGITransport(app=app)
+
+        result = asyncio.run(run_step("http://test", "me_books", 2, 0.2, transport=transport))
+        assert result["requests"] > 0
+        assert result["errors"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -4,6 +4,7 @@ Test dosyası: main.py için testler
 """
 
 import pytest
+import json
 import tempfile
 import os
 from unittest.mock import patch, Mock
@@ -208,5 +209,161 @@ class TestMainFunctions:
         mock_print.assert_any_call("ISBN numarası boş olamaz!")
 
 
+
+class TestBatchCli:
+    """main.py alt komutları (etkileşimsiz kullanım) için testler"""
+
+    BOOKS = {
+        "9780306406157": {"title": "Kitap A", "author": "Yazar A", "author_key": "/authors/OL1A"},
+        "9781111111113": {"title": "Kitap B", "author": "Yazar B", "author_key": None},
+        "9782222222224": {"title": "Kitap C", "author": "Yazar A", "author_key": "/authors/OL1A"},
+    }
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = os.path.join(self.temp_dir, "cli.db")
+        self.json_file = os.path.join(self.temp_dir, "cli.json")
+        self.lookups = []
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _lookup(self, library, isbn):
+        self.lookups.append(isbn)
+        return self.BOOKS.get(isbn)
+
+    def _run(self, *argv, stdin=""):
+        """main() çalıştırır; (çıkış kodu, stdout) döndürür"""
+        import io
+        from main import main
+        out = io.StringIO()
+        with patch.object(Library, "lookup_isbn", lambda library, isbn: self._lookup(library, isbn)), \
+                patch("sys.stdin", io.StringIO(stdin)), patch("sys.stdout", out):
+            code = main(["--file", self.json_file, "--db", self.db, *argv])
+        return code, out.getvalue()
+
+    def _catalog(self):
+        library = Library(self.json_file, db_path=self.db)
+        try:
+            return {book.isbn: book for book in library.list_books()}
+        finally:
+            library.storage.close()
+
+    def test_add_from_stdin_json(self):
+        """stdin'den ekleme: geçersiz, tekrar ve bulunamayan ISBN'ler raporlanır"""
+        stdin = "# liste\n0-306-40615-2  Kitap A\n\n9780306406157\n9781111111113\n1234567890\n9783333333335\n"
+        code, out = self._run("--json", "add", "--from", "-", "--no-progress", stdin=stdin)
+        report = json.loads(out)
+
+        assert code == 1
+        assert [book["isbn"] for book in report["added"]] == ["9780306406157", "9781111111113"]
+        assert report["requested"] == 5
+        assert report["invalid"] == ["1234567890"]
+        assert report["duplicates"] == 1
+        assert report["not_found"] == ["9783333333335"]
+        assert set(self._catalog()) == {"9780306406157", "9781111111113"}
+
+    def test_add_skips_existing_and_writes_per_batch(self):
+        """Var olan ISBN'ler çözümlenmez; her parça tek yazmada eklenir"""
+        self._run("add", "9780306406157", "--no-progress")
+        self.lookups.clear()
+        isbn_file = os.path.join(self.temp_dir, "isbnler.txt")
+        with open(isbn_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.BOOKS) + "\n")
+
+        with patch.object(Library, "add_books", autospec=True, side_effect=Library.add_books) as mock_add:
+            code, out = self._run("--json", "add", "--from", isbn_file, "--batch-size", "1", "--workers", "2",
+                                  "--no-progress")
+        report = json.loads(out)
+
+        assert code == 0
+        assert report["existing"] == ["9780306406157"]
+        assert sorted(self.lookups) == ["9781111111113", "9782222222224"]
+        assert mock_add.call_count == 2
+        assert self._catalog()["9782222222224"].author == "Yazar A"
+
+    def test_remove_find_and_list(self):
+        """remove / find / list alt komutları ve çıkış kodları"""
+        self._run("add", *self.BOOKS, "--no-progress")
+
+        code, out = self._run("--json", "list", "--author", "Yazar A")
+        assert code == 0
+        assert [book["title"] for book in json.loads(out)] == ["Kitap A", "Kitap C"]
+
+        code, out = self._run("--json", "remove", "0306406152", "9789999999991")
+        assert code == 1
+        assert json.loads(out) == {"removed": ["9780306406157"], "not_found": ["9789999999991"]}
+
+        code, out = self._run("find", "9781111111113")
+        assert code == 0
+        assert "Kitap B" in out
+        code, _ = self._run("find", "9780306406157")
+        assert code == 1
+
+    def test_import_and_export(self):
+        """import CSV'yi ağ sorgusu olmadan yükler, export aynı satırları dosyaya yazar"""
+        source = os.path.join(self.temp_dir, "kitaplar.csv")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("isbn,title,author\n9780306406157,Kitap A,Yazar A\n123,Bozuk,X\n")
+        code, out = self._run("--json", "import", source)
+        assert code == 1
+        assert json.loads(out)["inserted"] == 1
+        assert self.lookups == []
+
+        target = os.path.join(self.temp_dir, "cikti.ndjson")
+        code, out = self._run("--json", "export", "books", "--output", target)
+        assert code == 0
+        assert json.loads(out)["output"] == target
+        with open(target, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert [row["isbn"] for row in rows] == ["9780306406157"]
+
+    def test_import_requires_sqlite(self):
+        """JSON modunda import / export kullanım hatası (2) döndürür"""
+        import io
+        from main import main
+        with patch("sys.stderr", io.StringIO()) as err:
+            assert main(["--file", self.json_file, "import", "yok.csv"]) == 2
+        assert "--db" in err.getvalue()
+
+    def test_add_json_mode_single_save(self):
+        """JSON modunda toplu ekleme dosyayı bir kez yazar"""
+        from main import main
+        with patch.object(Library, "lookup_isbn", lambda library, isbn: self.BOOKS.get(isbn)), \
+                patch.object(Library, "save_books", autospec=True) as mock_save, patch("builtins.print"):
+            code = main(["--file", self.json_file, "add", *self.BOOKS, "--no-progress"])
+        assert code == 0
+        assert mock_save.call_count == 1
+
+    def test_progress_bar(self):
+        """İlerleme çubuğu etkinse stderr'e yazar, değilse sessiz kalır"""
+        import io
+        from main import Progress
+        stream = io.StringIO()
+        progress = Progress(4, "Çözümleniyor", enabled=True, stream=stream)
+        for _ in range(4):
+            progress.advance()
+        progress.close()
+        assert "4/4" in stream.getvalue()
+        assert "#" * 30 in stream.getvalue()
+
+        silent = io.StringIO()
+        progress = Progress(4, "Çözümleniyor", stream=silent)
+        progress.advance(4)
+        progress.close()
+        assert silent.getvalue() == ""
+
+    def test_read_isbns(self):
+        """Dosya satırlarından ilk sözcük alınır; boş satır ve açıklamalar atlanır"""
+        import io
+        from main import read_isbns
+        stdin = io.StringIO("9780306406157, Kitap A\n  # açıklama\n\n978-1-11-111111-3 # Kitap B\n")
+        assert read_isbns(["0306406152"], ["-"], stdin=stdin) == [
+            "0306406152", "9780306406157", "978-1-11-111111-3"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
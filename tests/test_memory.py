@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: memory.py ve /admin/memory endpoint'leri için testler
+"""
+
+import pytest
+import sys
+from fastapi.testclient import TestClient
+from memory import deep_sizeof, MemoryAccountant, SnapshotTracker
+from models import Book
+
+
+class _Slotted:
+    __slots__ = ("a", "b")
+
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+
+class TestDeepSizeof:
+    """deep_sizeof testleri"""
+
+    def test_counts_nested_objects(self):
+        """Liste içindeki nesneler ve alanları ölçüme dahil edilir"""
+        books = [Book(f"Kitap {i}", "Yazar", f"{i:010d}") for i in range(10)]
+
+        assert deep_sizeof(books) > sys.getsizeof(books) + 10 * sys.getsizeof(books[0])
+
+    def test_shared_objects_counted_once(self):
+        """Aynı nesneye yapılan tekrar referanslar bir kez sayılır"""
+        author = "Paylaşılan Yazar" * 10
+        shared = [author] * 100
+        separate = ["Paylaşılan Yazar" * 10 + str(i) for i in range(100)]
+
+        assert deep_sizeof(shared) < deep_sizeof(separate)
+
+    def test_slots_supported(self):
+        """__slots__ kullanan nesnelerin alanları da ölçülür"""
+        payload = "x" * 1000
+
+        assert deep_sizeof(_Slotted(payload, 1)) >= sys.getsizeof(payload)
+
+
+class TestMemoryAccountant:
+    """MemoryAccountant testleri"""
+
+    def test_measure_reports_items(self):
+        """Kayıtlı yapılar boyut ve eleman sayısı ile raporlanır"""
+        accountant = MemoryAccountant()
+        accountant.register("catalog", lambda: [1, 2, 3])
+
+        entry = accountant.measure()[0]
+        assert entry["name"] == "catalog"
+        assert entry["items"] == 3
+        assert entry["bytes"] > 0
+        assert entry["over_budget"] is False
+
+    def test_register_measured(self):
+        """Boyutunu kendisi bildiren yapılar olduğu gibi raporlanır"""
+        accountant = MemoryAccountant({"catalog": 100})
+        accountant.register_measured("catalog", lambda: (4096, 12))
+
+        entry = accountant.measure()[0]
+        assert (entry["bytes"], entry["items"]) == (4096, 12)
+        assert entry["over_budget"] is True
+
+    def test_budget_warning_printed_once(self, capsys):
+        """Bütçe aşımı bir kez uyarı olarak yazılır; tekrar ölçümde yinelenmez"""
+        accountant = MemoryAccountant({"catalog": 10})
+        accountant.register("catalog", lambda: list(range(100)))
+
+        assert accountant.measure()[0]["over_budget"] is True
+        accountant.measure()
+        assert capsys.readouterr().out.count("bellek bütçesini aştı") == 1
+
+    def test_budgets_from_env(self, monkeypatch):
+        """Bütçeler MB cinsinden ortam değişkenlerinden okunur"""
+        monkeypatch.setenv("KUTUPHANE_MEMORY_BUDGET_CATALOG_MB", "2")
+
+        assert MemoryAccountant.from_env().budgets["catalog"] == 2 * 1024 * 1024
+
+
+class TestSnapshotTracker:
+    """SnapshotTracker testleri"""
+
+    def test_diff_shows_growth(self):
+        """İlk görüntü taban olur; sonraki görüntü büyüyen konumları gösterir"""
+        tracker = SnapshotTracker()
+        try:
+            assert tracker.snapshot()["baseline"] is True
+            retained = [bytearray(1024) for _ in range(200)]
+            result = tracker.snapshot(limit=5)
+
+            assert result["baseline"] is False
+            assert any(entry["size_diff_bytes"] >= 100 * 1024 for entry in result["top"])
+            assert retained
+        finally:
+            tracker.stop()
+        assert tracker.tracing is False
+
+
+class TestMemoryEndpoint:
+    """/admin/memory endpoint testleri"""
+
+    def test_requires_admin(self):
+        """Yetkisiz erişim reddedilir"""
+        from api import app
+        client = TestClient(app)
+
+        assert client.get("/admin/memory").status_code == 401
+
+    def test_memory_report(self):
+        """Rapor süreç RSS değerini ve tüm kayıtlı yapıları içerir"""
+        from api import app, require_admin
+        app.dependency_overrides[require_admin] = lambda: "admin"
+        try:
+            data = TestClient(app).get("/admin/memory").json()
+        finally:
+            app.dependency_overrides.clear()
+
+        names = {entry["name"] for entry in data["structures"]}
+        assert {"catalog", "users", "metadata_cache", "query_log", "tokens"} <= names
+        assert "rss_bytes" in data["process"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
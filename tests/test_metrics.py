@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: metrics.py ve /metrics endpoint'i için testler
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from fastapi.testclient import TestClient
+from metrics import Registry, Histogram, statement_label, SQLITE_STATEMENT_DURATION
+from storage import SQLiteStorage
+
+
+class TestMetricTypes:
+    """Counter, Gauge ve Histogram için testler"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.registry = Registry()
+
+    def test_counter_render(self):
+        """Sayaç etiketleriyle birlikte yazdırılır"""
+        counter = self.registry.counter("test_total", "Test sayacı", ("kind",))
+        counter.inc(labels=("a",))
+        counter.inc(2, labels=("a",))
+
+        text = self.registry.render()
+        assert "# TYPE test_total counter" in text
+        assert 'test_total{kind="a"} 3' in text
+
+    def test_histogram_buckets_cumulative(self):
+        """Histogram kovaları kümülatif olarak yazdırılır"""
+        histogram = self.registry.histogram("lat_seconds", "Gecikme", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        text = self.registry.render()
+        assert 'lat_seconds_bucket{le="0.1"} 1' in text
+        assert 'lat_seconds_bucket{le="1"} 2' in text
+        assert 'lat_seconds_bucket{le="+Inf"} 3' in text
+        assert "lat_seconds_count 3" in text
+        assert histogram.count() == 3
+
+    def test_collector(self):
+        """Collector'lar scrape anında çağrılır; hata veren collector atlanır"""
+        self.registry.register_collector("ok", lambda: [("g", "gauge", "Gauge", [({"x": "1"}, 7)])])
+        self.registry.register_collector("bozuk", lambda: 1 / 0)
+
+        assert 'g{x="1"} 7' in self.registry.render()
+
+    def test_label_escaping(self):
+        """Etiket değerlerindeki tırnaklar kaçırılır"""
+        gauge = self.registry.gauge("g2", "Gauge", ("name",))
+        gauge.set(1, labels=('a"b',))
+
+        assert 'g2{name="a\\"b"} 1' in self.registry.render()
+
+
+class TestStatementLabels:
+    """SQL etiketleme testleri"""
+
+    def test_labels(self):
+        """SQL metni fiil + tablo etiketine indirgenir"""
+        assert statement_label("SELECT title FROM books WHERE isbn = ?") == "SELECT books"
+        assert statement_label("INSERT INTO user_books (a) VALUES (?)") == "INSERT user_books"
+        assert statement_label("UPDATE users SET role = ?") == "UPDATE users"
+        assert statement_label("CREATE TABLE IF NOT EXISTS books (isbn TEXT)") == "CREATE books"
+
+    def test_storage_records_statements(self):
+        """SQLiteStorage üzerinden çalışan ifadeler ölçülür"""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteStorage(os.path.join(temp_dir, "m.db"))
+        try:
+            before = SQLITE_STATEMENT_DURATION.count(("SELECT metrik_tablo",))
+            with storage.write() as conn:
+                conn.execute("CREATE TABLE metrik_tablo (x INTEGER)")
+            with storage.read() as conn:
+                conn.execute("SELECT x FROM metrik_tablo").fetchall()
+
+            assert SQLITE_STATEMENT_DURATION.count(("SELECT metrik_tablo",)) == before + 1
+        finally:
+            storage.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestMetricsEndpoint:
+    """GET /metrics testi"""
+
+    def test_metrics_endpoint(self):
+        """Rota şablonu bazlı HTTP metrikleri ve çalışma anı metrikleri döner"""
+        from api import app
+        client = TestClient(app)
+        client.get("/books/9999999999")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/books/{isbn}"' in response.text
+        assert "sqlite_statement_duration_seconds_bucket" in response.text
+        assert "resolver_lookups_total" in response.text
+        assert "admission_shed_total" in response.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
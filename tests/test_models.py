@@ -8,7 +8,7 @@ import json
 import tempfile
 import os
 from unittest.mock import patch, Mock
-from models import Book, Library
+from models import Book, Library, UserBook, User
 
 
 class TestBook:
@@ -55,6 +55,53 @@ class TestBook:
         assert book.isbn == "1234567890"
 
 
+class TestCompactModels:
+    """__slots__ tabanlı kompakt model temsilleri için testler"""
+
+    def test_no_instance_dict(self):
+        """Book, UserBook ve User örnek başına __dict__ taşımaz"""
+        book = Book("Test Kitap", "Test Yazar", "1234567890")
+
+        for obj in (book, UserBook(book), User("demo", "hash")):
+            assert not hasattr(obj, "__dict__")
+
+    def test_author_interned(self):
+        """Aynı yazar adı farklı kaynaklardan gelse de tek bir string paylaşılır"""
+        first = Book.from_dict(json.loads('{"title": "A", "author": "Ortak Yazar", "isbn": "1"}'))
+        second = Book.from_dict(json.loads('{"title": "B", "author": "Ortak Yazar", "isbn": "2"}'))
+        second.author = "".join(["Ortak ", "Yazar"])
+
+        assert first.author is second.author
+
+    def test_user_book_roundtrip(self):
+        """UserBook sözlük API'si ve book görünümü değişmeden çalışır"""
+        data = {"title": "Test Kitap", "author": "Test Yazar", "isbn": "1234567890", "is_read": True}
+        user_book = UserBook.from_dict(data)
+
+        assert user_book.to_dict() == data
+        assert user_book.book.to_dict() == Book.from_dict(data).to_dict()
+
+    def test_user_book_book_is_reference(self):
+        """book özelliği üzerinden yapılan değişiklikler kaybolmaz"""
+        book = Book("Test Kitap", "Test Yazar", "1234567890")
+        user_book = UserBook(book)
+
+        user_book.book.title = "Yeni Başlık"
+        user_book.isbn = "9780306406157"
+
+        assert user_book.book is book
+        assert user_book.to_dict()["title"] == "Yeni Başlık"
+        assert book.isbn == "9780306406157"
+
+    def test_memory_benchmark(self):
+        """Kompakt temsil kitap başına daha az bellek kullanır"""
+        from benchmarks.bench_memory import run
+        per_book = run(count=3000, authors=100)["bytes_per_book"]
+
+        assert per_book["book_compact"] < per_book["book_legacy"]
+        assert per_book["user_book_compact"] < per_book["user_book_legacy"]
+
+
 class TestLibrary:
     """Library sınıfı için testler"""
     
@@ -217,12 +264,12 @@ class TestLibrary:
                 "author": "Test Yazar"
             }
             
-            result = self.library.add_book_by_isbn("1234567890")
+            result = self.library.add_book_by_isbn("0-306-40615-2")
             
             assert result is not None
             assert result.title == "Test Kitap"
             assert result.author == "Test Yazar"
-            assert result.isbn == "1234567890"
+            assert result.isbn == "9780306406157"
             assert len(self.library.books) == 1
     
     def test_add_book_by_isbn_api_failure(self):
@@ -230,7 +277,7 @@ class TestLibrary:
         with patch.object(self.library, '_fetch_book_from_api') as mock_fetch:
             mock_fetch.return_value = None
             
-            result = self.library.add_book_by_isbn("1234567890")
+            result = self.library.add_book_by_isbn("9780306406157")
             
             assert result is None
             assert len(self.library.books) == 0
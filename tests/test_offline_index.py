@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: offline_index.py (çevrimdışı Open Library indeksi) için testler
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from unittest.mock import Mock
+
+from models import Library
+from offline_index import OfflineIndex, _ol_id, iter_dump, main, open_dump
+from resolver import TIER_OFFLINE, BookResolver, MetadataCache
+
+
+def _line(kind: str, key: str, last_modified: str, record: dict) -> str:
+    return f"{kind}\t{key}\t1\t{last_modified}\t{json.dumps(record)}\n"
+
+
+EDITIONS = [
+    _line("/type/edition", "/books/OL1M", "2024-01-01T00:00:00", {
+        "title": "Kürk Mantolu Madonna", "isbn_13": ["978-975-08-0619-3"], "isbn_10": ["9750806190"],
+        "authors": [{"key": "/authors/OL10A"}],
+    }),
+    _line("/type/edition", "/books/OL2M", "2024-02-01T00:00:00", {
+        "title": "Yazarsız Kitap", "isbn_10": ["0-19-953567-1"],
+    }),
+    _line("/type/edition", "/books/OL3M", "2024-03-01T00:00:00", {"title": "ISBN'siz Kitap"}),
+    "bozuk satır\n",
+]
+AUTHORS = [_line("/type/author", "/authors/OL10A", "2024-01-01T00:00:00", {"name": "Sabahattin Ali"})]
+
+
+class TestOfflineIndex:
+    """OfflineIndex oluşturma ve arama testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.temp_dir, "openlibrary.db")
+        self.editions_path = os.path.join(self.temp_dir, "editions.txt.gz")
+        self.authors_path = os.path.join(self.temp_dir, "authors.txt")
+        with gzip.open(self.editions_path, "wt", encoding="utf-8") as f:
+            f.writelines(EDITIONS)
+        with open(self.authors_path, "w", encoding="utf-8") as f:
+            f.writelines(AUTHORS)
+        self.index = OfflineIndex(self.index_path)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.index.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _build(self):
+        with open_dump(self.authors_path) as stream:
+            self.index.ingest_authors(stream)
+        with open_dump(self.editions_path) as stream:
+            return self.index.ingest_editions(stream)
+
+    def test_ol_id(self):
+        """OL anahtarları tamsayıya çevrilir"""
+        assert _ol_id("/books/OL7353617M") == 7353617
+        assert _ol_id("/authors/OL45A") == 45
+        assert _ol_id("/books/abc") is None
+
+    def test_lookup_isbn10_and_isbn13(self):
+        """Aynı baskı ISBN-10 ve ISBN-13 ile bulunur; yazar adı yazar dökümünden gelir"""
+        result = self._build()
+
+        assert (result["applied"], result["removed"], result["skipped"]) == (2, 1, 0)
+        expected = {"title": "Kürk Mantolu Madonna", "author": "Sabahattin Ali", "author_key": "/authors/OL10A"}
+        assert self.index.lookup("9789750806193") == expected
+        assert self.index.lookup("9750806190") == expected
+        assert self.index.lookup("9780199535675") == {"title": "Yazarsız Kitap", "author": "Bilinmeyen Yazar",
+                                                   "author_key": None}
+        assert self.index.lookup("9780000000000") is None
+
+    def test_incremental_rebuild(self):
+        """Aynı döküm yeniden uygulanınca hiçbir şey yazılmaz; yalnızca yeni kayıtlar işlenir"""
+        self._build()
+
+        with open_dump(self.editions_path) as stream:
+            assert self.index.ingest_editions(stream)["applied"] == 0
+        newer = _line("/type/edition", "/books/OL1M", "2024-05-01T00:00:00",
+                      {"title": "Kürk Mantolu Madonna (Yeni Baskı)", "isbn_13": ["9789750806193"]})
+        result = self.index.ingest_editions(iter([EDITIONS[0], newer]))
+
+        assert result["applied"] == 1
+        assert result["last_modified"] == "2024-05-01T00:00:00"
+        assert self.index.lookup("9789750806193")["title"] == "Kürk Mantolu Madonna (Yeni Baskı)"
+        assert self.index.status()["editions"] == 2
+
+    def test_removed_isbns_and_editions_dropped(self):
+        """Yeniden gelen baskının çıkarılan ISBN'leri, silinen / yönlendirilen ve ISBN'ini
+        yitiren baskılar indeksten kaldırılır"""
+        self._build()
+        updates = [
+            _line("/type/edition", "/books/OL1M", "2024-05-01T00:00:00",
+                  {"title": "Kürk Mantolu Madonna", "isbn_13": ["9780306406157"]}),
+            _line("/type/delete", "/books/OL2M", "2024-05-02T00:00:00", {"key": "/books/OL2M"}),
+        ]
+        result = self.index.ingest_editions(iter(updates))
+
+        assert (result["applied"], result["removed"]) == (1, 1)
+        assert self.index.lookup("9780306406157")["title"] == "Kürk Mantolu Madonna"
+        assert self.index.lookup("9789750806193") is None
+        assert self.index.lookup("9780199535675") is None
+        assert self.index.status()["editions"] == 1
+
+        self.index.ingest_editions(iter([
+            _line("/type/edition", "/books/OL1M", "2024-06-01T00:00:00", {"title": "Kürk Mantolu Madonna"}),
+        ]))
+        assert self.index.lookup("9780306406157") is None
+        assert self.index.status()["isbns"] == 0
+
+    def test_redirect_removes_edition(self):
+        """Yönlendirilen baskı kaldırılır; ISBN başka baskıya taşındıysa o eşleme korunur"""
+        self._build()
+        self.index.ingest_editions(iter([
+            _line("/type/edition", "/books/OL5M", "2024-05-01T00:00:00",
+                  {"title": "Birleşik Baskı", "isbn_10": ["0-19-953567-1"]}),
+            _line("/type/redirect", "/books/OL2M", "2024-05-01T00:00:00", {"location": "/books/OL5M"}),
+        ]))
+
+        assert self.index.lookup("9780199535675")["title"] == "Birleşik Baskı"
+        assert self.index.status()["editions"] == 2
+
+    def test_iter_dump_skips_old_records_without_parsing(self):
+        """newer_than'dan eski satırların JSON'u çözülmez"""
+        lines = ["/type/edition\t/books/OL1M\t1\t2020-01-01T00:00:00\t{bozuk\n", EDITIONS[1]]
+
+        assert [key for _, key, _, _ in iter_dump(lines, "2023-01-01")] == ["/books/OL2M"]
+
+    def test_open_missing_returns_none(self):
+        """Var olmayan indeks dosyası açılmaz"""
+        assert OfflineIndex.open(os.path.join(self.temp_dir, "yok.db")) is None
+
+    def test_cli(self, capsys):
+        """Komut satırı indeksi oluşturur ve arama yapar"""
+        self.index.close()
+
+        assert main(["--index", self.index_path, "--editions", self.editions_path,
+                     "--authors", self.authors_path, "--lookup", "978-975-08-0619-3"]) == 0
+        assert '"Sabahattin Ali"' in capsys.readouterr().out
+        self.index = OfflineIndex(self.index_path)
+
+
+class TestOfflineResolution:
+    """Çözümleme katmanlarında çevrimdışı indeks testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = OfflineIndex(os.path.join(self.temp_dir, "openlibrary.db"))
+        self.index.ingest_authors(iter(AUTHORS))
+        self.index.ingest_editions(iter(EDITIONS))
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.index.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resolver_uses_offline_before_network(self):
+        """Cache'te olmayan ISBN ağa gitmeden çevrimdışı indeksten çözülür"""
+        fetcher = Mock(return_value=None)
+        resolver = BookResolver(fetcher, cache=MetadataCache(), offline=self.index)
+
+        info, tier = resolver.resolve("9789750806193")
+
+        assert tier == TIER_OFFLINE
+        assert info["author"] == "Sabahattin Ali"
+        assert resolver.stats[TIER_OFFLINE] == 1
+        fetcher.assert_not_called()
+
+    def test_resolver_falls_back_to_network(self):
+        """İndekste olmayan ISBN için ağa gidilir"""
+        fetcher = Mock(return_value={"title": "Ağ", "author": "Yazar"})
+        resolver = BookResolver(fetcher, cache=MetadataCache(), offline=self.index)
+
+        assert resolver.resolve("9780306406157")[1] == "network"
+        fetcher.assert_called_once_with("9780306406157")
+
+    def test_library_add_by_isbn_without_network(self):
+        """Library.add_book_by_isbn indeksteki kitabı ağ sorgusu yapmadan ekler"""
+        library = Library(os.path.join(self.temp_dir, "library.json"), db_path=os.path.join(self.temp_dir, "app.db"),
+                          offline_index=self.index)
+        library._fetch_book_from_api = Mock(return_value=None)
+        try:
+            book = library.add_book_by_isbn("975-08-0619-0")
+        finally:
+            library.storage.close()
+
+        assert book.title == "Kürk Mantolu Madonna"
+        library._fetch_book_from_api.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: outbound.py için testler
+"""
+
+import pytest
+import tempfile
+import os
+import time
+from unittest.mock import patch, Mock
+from outbound import (
+    TokenBucket, CircuitBreaker, OutboundGuard,
+    CircuitOpenError, RateLimitedError, DeadlineExceededError,
+)
+from models import Library
+
+
+class TestTokenBucket:
+    """TokenBucket sınıfı için testler"""
+
+    def test_burst_then_limited(self):
+        """Kova dolu başlar, boşaldığında bekleme süresi döner"""
+        bucket = TokenBucket(rate=1.0, burst=2)
+
+        assert bucket.try_acquire() == 0
+        assert bucket.try_acquire() == 0
+        assert bucket.try_acquire() > 0
+        assert bucket.acquire(timeout=0.01) is False
+
+    def test_refill(self):
+        """Zaman geçtikçe token yenilenir"""
+        bucket = TokenBucket(rate=100.0, burst=1)
+        bucket.try_acquire()
+
+        assert bucket.acquire(timeout=0.5) is True
+
+
+class TestCircuitBreaker:
+    """CircuitBreaker sınıfı için testler"""
+
+    def test_opens_on_failure_rate(self):
+        """Hata oranı eşiği aşılınca devre açılır ve çağrılar reddedilir"""
+        breaker = CircuitBreaker(min_calls=4, failure_rate=0.5, reset_timeout=60)
+        for ok in (True, False, True, False):
+            breaker.record(ok, 0.01)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is False
+        assert breaker.snapshot()["rejected_count"] == 1
+
+    def test_opens_on_slow_calls(self):
+        """Yavaş çağrılar da devreyi açar"""
+        breaker = CircuitBreaker(min_calls=2, slow_call_threshold=0.1, slow_call_rate=1.0)
+        breaker.record(True, 0.5)
+        breaker.record(True, 0.5)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probe(self):
+        """Süre dolunca tek deneme çağrısına izin verilir; başarılıysa devre kapanır"""
+        breaker = CircuitBreaker(min_calls=1, failure_rate=0.5, reset_timeout=0.01)
+        breaker.record(False, 0.01)
+        time.sleep(0.02)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+        breaker.record(True, 0.01)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestOutboundGuard:
+    """OutboundGuard sınıfı için testler"""
+
+    def test_circuit_open_rejects(self):
+        """Devre açıkken çağrı ağa gitmeden reddedilir"""
+        guard = OutboundGuard(breaker=CircuitBreaker(min_calls=1, reset_timeout=60))
+        guard.breaker.record(False, 0.01)
+
+        with pytest.raises(CircuitOpenError):
+            with guard.call():
+                pass
+
+    def test_rate_limited(self):
+        """Token kalmadığında ve süre sınırı içinde yenilenmediğinde reddedilir"""
+        guard = OutboundGuard(rate=0.001, burst=1, deadline=0.01)
+        with guard.call():
+            pass
+
+        with pytest.raises(RateLimitedError):
+            with guard.call():
+                pass
+
+    def test_concurrency_cap(self):
+        """Eşzamanlılık sınırı doluyken yeni çağrı reddedilir"""
+        guard = OutboundGuard(max_concurrency=1, deadline=0.01)
+        with guard.call():
+            assert guard.snapshot()["in_flight"] == 1
+            with pytest.raises(RateLimitedError):
+                with guard.call():
+                    pass
+
+    def test_deadline(self):
+        """Kalan süre dolduğunda timeout() hata fırlatır"""
+        guard = OutboundGuard(deadline=0.0)
+        with pytest.raises(DeadlineExceededError):
+            with guard.call() as call:
+                call.timeout()
+
+    def test_failure_recorded(self):
+        """İstisna ve mark_failure hata olarak kaydedilir"""
+        guard = OutboundGuard()
+        with guard.call() as call:
+            call.mark_failure()
+        with pytest.raises(ValueError):
+            with guard.call():
+                raise ValueError("hata")
+
+        assert guard.snapshot()["breaker"]["recent_failures"] == 2
+
+
+class TestLibraryOutbound:
+    """Library._fetch_book_from_api koruma entegrasyonu"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
+        self.temp_file.write('[]')
+        self.temp_file.close()
+        self.library = Library(self.temp_file.name)
+        self.library.outbound = OutboundGuard(breaker=CircuitBreaker(min_calls=2, failure_rate=0.5, reset_timeout=60))
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        if os.path.exists(self.temp_file.name):
+            os.unlink(self.temp_file.name)
+
+    @patch('models.httpx.Client')
+    def test_server_errors_open_breaker(self, mock_client):
+        """5xx yanıtları devreyi açar, sonraki çağrılar ağa gitmez"""
+        mock_response = Mock()
+        mock_response.status_code = 503
+        mock_client_instance = Mock()
+        mock_client_instance.get.return_value = mock_response
+        mock_client.return_value.__enter__.return_value = mock_client_instance
+
+        assert self.library._fetch_book_from_api("1234567890") is None
+        assert self.library._fetch_book_from_api("1234567890") is None
+        assert self.library.outbound.breaker.state == CircuitBreaker.OPEN
+
+        mock_client_instance.get.reset_mock()
+        assert self.library._fetch_book_from_api("1234567890") is None
+        mock_client_instance.get.assert_not_called()
+
+    @patch('models.httpx.Client')
+    def test_not_found_is_not_failure(self, mock_client):
+        """404 yanıtı devre kesici için hata sayılmaz"""
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_client_instance = Mock()
+        mock_client_instance.get.return_value = mock_response
+        mock_client.return_value.__enter__.return_value = mock_client_instance
+
+        for _ in range(3):
+            assert self.library._fetch_book_from_api("9999999999") is None
+        assert self.library.outbound.breaker.state == CircuitBreaker.CLOSED
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: profiling.py ve /admin/profile endpoint'leri için testler
+"""
+
+import pytest
+import asyncio
+import io
+import marshal
+import pstats
+import threading
+import tempfile
+import os
+import shutil
+from fastapi.testclient import TestClient
+from starlette.concurrency import run_in_threadpool
+from profiling import RequestProfiler, ProfilingMiddleware, sample_stacks, collapsed_text
+
+
+def _busy_handler():
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+
+async def _app(scope, receive, send):
+    _busy_handler()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _threaded_work():
+    return _busy_handler()
+
+
+async def _threadpool_app(scope, receive, send):
+    await run_in_threadpool(_threaded_work)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _noop_send(message):
+    pass
+
+
+def _call(middleware, path="/books"):
+    scope = {"type": "http", "method": "GET", "path": path}
+    asyncio.run(middleware(scope, None, _noop_send))
+
+
+class TestRequestProfiler:
+    """RequestProfiler ve ProfilingMiddleware testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.profiler = RequestProfiler()
+        self.middleware = ProfilingMiddleware(_app, self.profiler)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.profiler.arm(0)
+
+    def test_disabled_by_default(self):
+        """Kurulmadıkça hiçbir istek profillenmez"""
+        _call(self.middleware)
+
+        assert self.profiler.status()["completed"] == 0
+        assert self.profiler.pstats_bytes() == b""
+
+    def test_profiles_next_n_requests(self):
+        """Yalnızca sonraki N istek profillenir ve sonuç birleştirilir"""
+        self.profiler.arm(2)
+        for _ in range(3):
+            _call(self.middleware)
+
+        status = self.profiler.status()
+        assert status["completed"] == 2
+        assert status["remaining"] == 0
+        assert status["ready"] is True
+        assert "_busy_handler" in self.profiler.text_report()
+
+    def test_pstats_artifact_loadable(self):
+        """pstats çıktısı standart pstats ile okunabilir"""
+        self.profiler.arm(1)
+        _call(self.middleware)
+
+        data = self.profiler.pstats_bytes()
+        assert any(func[2] == "_busy_handler" for func in marshal.loads(data))
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "requests.pstats")
+            with open(path, "wb") as f:
+                f.write(data)
+            assert pstats.Stats(path, stream=io.StringIO()).total_calls > 0
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_threadpool_work_profiled(self):
+        """İsteğin thread havuzunda çalıştırdığı iş de profile girer; diğer isteklerinki girmez"""
+        self.profiler.arm(1)
+        _call(ProfilingMiddleware(_threadpool_app, self.profiler))
+        _call(ProfilingMiddleware(_threadpool_app, self.profiler))
+
+        report = self.profiler.text_report()
+        assert "_threaded_work" in report
+        assert self.profiler.status()["scope"]
+        functions = marshal.loads(self.profiler.pstats_bytes())
+        assert [calls[1] for func, calls in functions.items() if func[2] == "_threaded_work"] == [1]
+
+    def test_threadpool_hook_only_during_session(self):
+        """Thread havuzu kancası oturum boyunca kurulur, son istekten sonra kaldırılır"""
+        import anyio.to_thread
+        original = anyio.to_thread.run_sync
+
+        self.profiler.arm(1)
+        assert anyio.to_thread.run_sync is not original
+        _call(ProfilingMiddleware(_threadpool_app, self.profiler))
+        assert anyio.to_thread.run_sync is original
+
+        self.profiler.arm(3)
+        self.profiler.arm(0)
+        assert anyio.to_thread.run_sync is original
+
+    def test_profile_endpoints_not_profiled(self):
+        """Profil endpoint'lerine yapılan istekler sayıma dahil edilmez"""
+        self.profiler.arm(1)
+        _call(self.middleware, "/admin/profile/requests")
+
+        assert self.profiler.status()["remaining"] == 1
+
+
+class TestStackSampler:
+    """sample_stacks testleri"""
+
+    def test_samples_busy_thread(self):
+        """Meşgul thread'in yığını collapsed-stack olarak yakalanır"""
+        stop = threading.Event()
+
+        def spin():
+            while not stop.is_set():
+                _busy_handler()
+
+        worker = threading.Thread(target=spin, name="mesgul")
+        worker.start()
+        try:
+            counts = sample_stacks(0.2, interval=0.005)
+        finally:
+            stop.set()
+            worker.join()
+
+        busy = [stack for stack in counts if stack.startswith("mesgul;")]
+        assert busy
+        assert any("_busy_handler" in stack for stack in busy)
+        text = collapsed_text(counts)
+        assert text.splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+class TestProfileEndpoints:
+    """/admin/profile endpoint testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        from api import app, require_admin
+        self.app = app
+        self.app.dependency_overrides[require_admin] = lambda: "admin"
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.app.dependency_overrides.clear()
+
+    def test_requires_admin(self):
+        """Yetkisiz erişim reddedilir"""
+        self.app.dependency_overrides.clear()
+
+        assert self.client.post("/admin/profile/requests").status_code == 401
+        assert self.client.get("/admin/profile/sample").status_code == 401
+
+    def test_request_profile_roundtrip(self):
+        """Kurulan profil sonraki isteği yakalar ve pstats olarak indirilebilir"""
+        assert self.client.post("/admin/profile/requests?count=1").json()["remaining"] == 1
+        self.client.get("/health")
+
+        result = self.client.get("/admin/profile/requests").json()
+        assert result["ready"] is True
+        assert "health_check" in result["report"]
+        download = self.client.get("/admin/profile/requests?format=pstats")
+        assert download.status_code == 200
+        assert download.headers["content-type"] == "application/octet-stream"
+
+    def test_sample_endpoint(self):
+        """Örnekleme endpoint'i collapsed-stack metni döndürür"""
+        response = self.client.get("/admin/profile/sample?seconds=0.1&interval_ms=5")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: querylog.py için testler (sık kullanılan sorguların indeks kullanımı dahil)
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+import sqlite3
+import time
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from querylog import QueryLog, analyze_plan, explain
+from models import Library, UserManager, Book
+from storage import InstrumentedConnection
+
+
+class TestPlanAnalysis:
+    """analyze_plan testleri"""
+
+    def test_full_scan_detected(self):
+        """İndekssiz SCAN tam tarama olarak işaretlenir"""
+        result = analyze_plan(["SCAN books", "USE TEMP B-TREE FOR ORDER BY"])
+
+        assert result["full_scans"] == ["books"]
+        assert result["temp_btree"] is True
+        assert result["uses_index"] is False
+
+    def test_index_scan_not_flagged(self):
+        """İndeks üzerinden yapılan tarama ve aramalar tam tarama sayılmaz"""
+        result = analyze_plan([
+            "SCAN books USING INDEX idx_books_title",
+            "SEARCH user_books USING INDEX sqlite_autoindex_user_books_1 (username=?)",
+        ])
+
+        assert result["full_scans"] == []
+        assert result["uses_index"] is True
+
+
+class TestQueryLog:
+    """QueryLog testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        self.manager = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=self.db_path)
+        self.library.add_book(Book("Test Kitap", "Test Yazar", "1234567890"))
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        self.manager.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _plan(self, sql: str, params=()) -> dict:
+        with self.library._get_read_conn() as conn:
+            return analyze_plan(explain(conn, sql, params))
+
+    def test_hot_queries_use_indexes(self):
+        """Sık çalışan sorgular tam tablo taraması veya geçici sıralama yapmaz"""
+        hot_queries = [
+            ("SELECT title, author, isbn FROM books ORDER BY title", ()),
+            ("SELECT title, author, isbn FROM books WHERE isbn = ?", ("1234567890",)),
+            ("SELECT title, author, isbn, is_read FROM user_books WHERE username = ?", ("demo",)),
+            ("SELECT title, author, isbn, is_read FROM user_books WHERE username = ? AND is_read = 1", ("demo",)),
+            ("SELECT username, password_hash, role FROM users WHERE username = ?", ("demo",)),
+        ]
+        for sql, params in hot_queries:
+            plan = self._plan(sql, params)
+            assert plan["full_scans"] == [], (sql, plan["plan"])
+            assert plan["temp_btree"] is False, (sql, plan["plan"])
+
+    def test_slow_query_captured_with_plan(self):
+        """Eşiği aşan sorgular planları ile kaydedilir"""
+        log = QueryLog(slow_threshold_ms=0)
+        with patch("storage.QUERY_LOG", log):
+            self.library.list_books()
+            self.manager.list_user_read_books("demo")
+
+        slow = {entry["sql"]: entry for entry in log.slow()}
+        entry = slow["SELECT title, author, isbn FROM books ORDER BY title"]
+        assert entry["full_scans"] == []
+        assert entry["plan"]
+
+    def test_released_cursor_plan_uses_separate_connection(self):
+        """Serbest bırakılan imlecin planı paylaşılan bağlantıda değil, sonradan ayrı bağlantıda çıkarılır"""
+        log = QueryLog(slow_threshold_ms=0)
+        used = []
+
+        def spy(conn, sql, params=()):
+            used.append(conn)
+            return explain(conn, sql, params)
+
+        with patch("storage.QUERY_LOG", log), patch("querylog.explain", spy):
+            with self.library._get_conn() as conn:
+                assert conn.execute("SELECT title FROM books WHERE author = ?", ("Test Yazar",)).fetchone()
+                shared = conn
+            assert used == []
+
+            slow = {entry["sql"]: entry for entry in log.slow()}
+        entry = slow["SELECT title FROM books WHERE author = ?"]
+        assert entry["plan"]
+        assert used and all(c is not shared for c in used)
+
+    def test_top_statements(self):
+        """En pahalı ifadeler toplam süreye göre sıralanır"""
+        log = QueryLog(slow_threshold_ms=10_000)
+        with patch("storage.QUERY_LOG", log):
+            for _ in range(3):
+                self.library.find_book("1234567890")
+
+        top = log.top(50)
+        entry = next(e for e in top if e["sql"].startswith("SELECT title, author, isbn FROM books WHERE isbn"))
+        assert entry["count"] == 3
+        assert top == sorted(top, key=lambda e: e["total_ms"], reverse=True)
+        assert log.slow() == []
+
+
+    def test_fetch_time_counted(self):
+        """Satırlar çekilirken geçen süre ifadenin süresine eklenir ve yavaş sorgu eşiğine uygulanır"""
+        log = QueryLog(slow_threshold_ms=20)
+        conn = sqlite3.connect(":memory:", factory=InstrumentedConnection)
+        conn.create_function("yavas", 1, lambda x: time.sleep(0.002) or x)
+        try:
+            with patch("storage.QUERY_LOG", log):
+                conn.execute("CREATE TABLE t (a)")
+                conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(20)])
+                assert len(conn.execute("SELECT yavas(a) FROM t").fetchall()) == 20
+                assert sum(1 for _ in conn.execute("SELECT yavas(a) FROM t")) == 20
+                # Tüketilmeden bırakılan imleç serbest bırakılırken kaydedilir
+                assert conn.execute("SELECT yavas(a) FROM t").fetchone() == (0,)
+        finally:
+            conn.close()
+
+        entry = next(e for e in log.top(10) if e["sql"] == "SELECT yavas(a) FROM t")
+        assert entry["count"] == 3
+        slow = [e for e in log.slow() if e["sql"] == "SELECT yavas(a) FROM t"]
+        assert len(slow) == 2
+        assert all(e["duration_ms"] >= 40 for e in slow)
+
+class TestQueriesEndpoint:
+    """GET /admin/queries testi"""
+
+    def test_requires_admin(self):
+        """Yetkisiz erişim reddedilir"""
+        from api import app
+        client = TestClient(app)
+
+        assert client.get("/admin/queries").status_code == 401
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
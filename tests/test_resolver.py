@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: resolver.py için testler
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from unittest.mock import Mock, patch
+from models import Book, Library, UserManager
+from resolver import BookResolver, MetadataCache, TIER_CATALOG, TIER_CACHE, TIER_NETWORK
+from storage import SQLiteStorage
+
+
+class TestBookResolver:
+    """BookResolver sınıfı için testler"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.library = Library(os.path.join(self.temp_dir, "library.json"))
+        self.library.add_book(Book("Katalog Kitap", "Katalog Yazar", "9781111111113"))
+        self.fetcher = Mock(return_value={"title": "Ağ Kitap", "author": "Ağ Yazar"})
+        self.resolver = BookResolver(fetcher=self.fetcher, library=self.library)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_catalog_tier(self):
+        """Katalogda olan ISBN ağa gitmeden çözülür"""
+        info, tier = self.resolver.resolve("9781111111113")
+
+        assert tier == TIER_CATALOG
+        assert info["title"] == "Katalog Kitap"
+        self.fetcher.assert_not_called()
+
+    def test_network_then_cache_tier(self):
+        """İlk istek ağdan, sonraki istek cache'ten karşılanır"""
+        info, tier = self.resolver.resolve("9782222222224")
+        assert tier == TIER_NETWORK
+        assert info["author"] == "Ağ Yazar"
+
+        info, tier = self.resolver.resolve("9782222222224")
+        assert tier == TIER_CACHE
+        assert self.fetcher.call_count == 1
+        assert self.resolver.stats[TIER_NETWORK] == 1
+        assert self.resolver.stats[TIER_CACHE] == 1
+
+    def test_miss(self):
+        """Hiçbir katmanda bulunamayan ISBN"""
+        self.fetcher.return_value = None
+
+        assert self.resolver.resolve("9783333333335") == (None, None)
+        assert self.resolver.stats["miss"] == 1
+
+    def test_persistent_cache(self):
+        """SQLite cache yeniden açıldığında kayıtlar korunur"""
+        db_path = os.path.join(self.temp_dir, "cache.db")
+        storage = SQLiteStorage(db_path)
+        MetadataCache(storage).put("9784444444446", {"title": "T", "author": "A"})
+        storage.close()
+
+        storage = SQLiteStorage(db_path)
+        cache = MetadataCache(storage)
+        assert cache.get("9784444444446") == {"title": "T", "author": "A"}
+        assert len(cache) == 1
+        storage.close()
+
+
+class TestUserManagerResolution:
+    """UserManager'ın katalog öncelikli çözümlemesi"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.temp_dir, "app.db")
+        self.library = Library(os.path.join(self.temp_dir, "library.json"), db_path=db_path)
+        self.library.add_book(Book("Katalog Kitap", "Katalog Yazar", "9781111111113"))
+        self.manager = UserManager(os.path.join(self.temp_dir, "users.json"), db_path=db_path, library=self.library)
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.library.storage.close()
+        self.manager.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_add_from_catalog_without_network(self):
+        """Katalogdaki kitap kullanıcı listesine ağ çağrısı olmadan eklenir"""
+        with patch.object(self.manager._library_helper, '_fetch_book_from_api') as mock_fetch:
+            added = self.manager.add_book_to_user_by_isbn("demo", "111-111-1111")
+
+            mock_fetch.assert_not_called()
+        assert added["source"] == TIER_CATALOG
+        assert added["title"] == "Katalog Kitap"
+        assert self.manager.list_user_books("demo")[0]["isbn"] == "9781111111113"
+
+    def test_add_from_network(self):
+        """Katalogda olmayan kitap ağdan çözülür"""
+        with patch.object(self.manager._library_helper, '_fetch_book_from_api') as mock_fetch:
+            mock_fetch.return_value = {"title": "Ağ Kitap", "author": "Ağ Yazar"}
+            added = self.manager.add_book_to_user_by_isbn("demo", "9789999999991")
+
+        assert added["source"] == TIER_NETWORK
+        assert self.manager.resolver.cache.get("9789999999991")["title"] == "Ağ Kitap"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: lazy.py (tembel başlatma) ve benchmarks/bench_startup.py için testler
+"""
+
+import pytest
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+from benchmarks.bench_startup import (
+    DEFAULT_BUDGET, PHASES, check_budget, parse_importtime, run, summarize_importtime,
+)
+from lazy import LazyComponent, warm_up
+from models import Book, Library
+
+
+class _Target:
+    def __init__(self):
+        self.value = 42
+        self._private = "gizli"
+
+    def double(self) -> int:
+        return self.value * 2
+
+
+class TestLazyComponent:
+    """LazyComponent vekili testleri"""
+
+    def test_created_on_first_access(self):
+        """Nesne ilk öznitelik erişiminde oluşturulur, öznitelikler iletilir"""
+        created = []
+        component = LazyComponent("hedef", lambda: created.append(1) or _Target())
+
+        assert not component.loaded
+        assert component.load_seconds is None
+        assert created == []
+        assert component.double() == 84
+        assert component._private == "gizli"
+        assert component.loaded
+        assert component.load_seconds >= 0
+        assert isinstance(component.load(), _Target)
+        assert created == [1]
+
+    def test_concurrent_load_creates_once(self):
+        """Eşzamanlı ilk erişimlerde factory bir kez çalışır, diğerleri bekler"""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return _Target()
+
+        component = LazyComponent("hedef", factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(component.load())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [1]
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+
+    def test_failed_factory_retried(self):
+        """factory hata verirse bileşen yüklenmemiş kalır ve sonraki erişimde tekrar denenir"""
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("veritabanı kilitli")
+            return _Target()
+
+        component = LazyComponent("hedef", factory)
+        with pytest.raises(RuntimeError):
+            component.value
+        assert not component.loaded
+        assert component.value == 42
+        assert len(attempts) == 2
+
+    def test_warm_up_chains(self):
+        """Zincirler paralel, zincir içindeki adımlar sırayla çalışır; hata zinciri durdurur"""
+        order = []
+        gate = threading.Event()
+
+        def fail():
+            raise ValueError("bozuk")
+
+        with patch("builtins.print") as mock_print:
+            threads = warm_up(
+                (lambda: gate.wait(1), lambda: order.append("a2")),
+                (lambda: order.append("b1"), gate.set),
+                (fail, lambda: order.append("c2")),
+            )
+            for thread in threads:
+                thread.join(2)
+
+        assert order == ["b1", "a2"]
+        assert all(thread.daemon for thread in threads)
+        assert "bozuk" in mock_print.call_args[0][0]
+
+
+class TestLazySqliteLibrary:
+    """SQLite modunda Library açılışta kataloğu belleğe almaz"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_no_eager_load(self):
+        """Açılışta satır okunmaz; okuma yolları ve sayım veritabanından karşılanır"""
+        library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        library.add_books([(Book("Beta", "Yazar", "9780306406157"), None),
+                           (Book("Alfa", "Yazar", "9781111111113"), None)])
+        library.storage.close()
+
+        reopened = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        try:
+            assert reopened._books == []
+            assert reopened.count_books() == 2
+            assert reopened.find_book("0-306-40615-2").title == "Beta"
+            assert [b.title for b in reopened.list_books()] == ["Alfa", "Beta"]
+        finally:
+            reopened.storage.close()
+
+
+    def test_writes_do_not_fill_books(self):
+        """SQLite modunda yazmalar bellek listesi tutmaz; bellek raporu veritabanı sayısını verir"""
+        library = Library(os.path.join(self.temp_dir, "library.json"), db_path=self.db_path)
+        try:
+            library.add_book(Book("Gama", "Yazar", "9780306406157"))
+            library.add_books([(Book("Alfa", "Yazar", "9781111111113"), None)])
+            library.list_books()
+            assert library.update_book("9780306406157", title="Gama 2").title == "Gama 2"
+            library.remove_books(["9781111111113"])
+
+            assert library._books == []
+            assert [b.title for b in library.books] == ["Gama 2"]
+            assert library.memory_usage() == (0, 1)
+        finally:
+            library.storage.close()
+
+class TestBenchStartup:
+    """Başlangıç ölçüm aracı ve bütçe testleri"""
+
+    IMPORTTIME = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     pydantic",
+        "import time:      3000 |       3100 |   fastapi",
+        "import time:       500 |        500 |   models",
+        "import time:      2000 |       5600 | api",
+        "import time:        50 |         50 | lazy",
+    ]
+
+    def _report(self, **overrides) -> dict:
+        report = {phase: {"median": 10.0, "min": 10.0, "max": 10.0} for phase in PHASES}
+        report.update(status=200, watched_modules=[], db_opened_on_import=False)
+        report.update(overrides)
+        return report
+
+    def test_parse_importtime(self):
+        """Satırlar modül, derinlik ve milisaniye sürelerine ayrıştırılır"""
+        entries = parse_importtime(self.IMPORTTIME)
+
+        assert [(e["module"], e["depth"]) for e in entries] == [
+            ("pydantic", 2), ("fastapi", 1), ("models", 1), ("api", 0), ("lazy", 0)]
+        assert entries[3]["cumulative_ms"] == 5.6
+
+    def test_summarize_direct_imports(self):
+        """Yalnızca kök modülün alt ağacı raporlanır"""
+        summary = summarize_importtime(parse_importtime(self.IMPORTTIME), "api")
+
+        assert summary["cumulative_ms"] == 5.6
+        assert [e["module"] for e in summary["direct"]] == ["fastapi", "models"]
+        assert summary["top_self"][0]["module"] == "fastapi"
+
+    def test_check_budget(self):
+        """Süre aşımı, yasak modül ve içe aktarımda açılan veritabanı raporlanır"""
+        budget = {"import_ms": 20, "forbidden_modules": ["httpx"], "db_opened_on_import": False}
+
+        assert check_budget(self._report(), budget) == []
+        failures = check_budget(self._report(import_ms={"median": 30.0, "min": 30.0, "max": 30.0},
+                                             watched_modules=["httpx", "uvicorn"], db_opened_on_import=True),
+                                budget)
+        assert len(failures) == 3
+        assert failures[0].startswith("import_ms")
+
+    def test_default_budget_valid(self):
+        """Depodaki bütçe dosyası bilinen aşamalara ait sınırlar içerir"""
+        with open(DEFAULT_BUDGET, "r", encoding="utf-8") as f:
+            budget = json.load(f)
+
+        for key, limit in budget.items():
+            assert key in PHASES or key in ("forbidden_modules", "db_opened_on_import")
+        assert "httpx" in budget["forbidden_modules"]
+
+    def test_api_startup_within_budget(self):
+        """import api ağır modülleri yüklemez, veritabanını açmaz ve bütçe içinde hazır olur"""
+        with open(DEFAULT_BUDGET, "r", encoding="utf-8") as f:
+            budget = json.load(f)
+
+        report = run(runs=1, books=200)
+
+        assert check_budget(report, budget) == []
+        assert report["components"]["library"] is not None
+        assert report["importtime"]["cumulative_ms"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
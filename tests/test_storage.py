@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: storage.py için testler
+"""
+
+import pytest
+import sqlite3
+import tempfile
+import os
+import shutil
+from storage import SQLiteStorage, StorageProfile
+from models import Library, UserManager, Book
+
+
+class TestStorageProfile:
+    """StorageProfile sınıfı için testler"""
+
+    def test_default_profile(self):
+        """Varsayılan profil WAL ve NORMAL kullanır"""
+        profile = StorageProfile()
+
+        assert profile.journal_mode == "WAL"
+        assert profile.synchronous == "NORMAL"
+        assert profile.is_wal
+
+    def test_from_env(self, monkeypatch):
+        """Ortam değişkenlerinden profil okuma testi"""
+        monkeypatch.setenv("KUTUPHANE_SQLITE_JOURNAL_MODE", "delete")
+        monkeypatch.setenv("KUTUPHANE_SQLITE_BUSY_TIMEOUT_MS", "1234")
+        monkeypatch.setenv("KUTUPHANE_SQLITE_SPLIT_READ_CONNECTIONS", "false")
+        monkeypatch.setenv("KUTUPHANE_SQLITE_MMAP_SIZE", "gecersiz")
+
+        profile = StorageProfile.from_env()
+
+        assert profile.journal_mode == "DELETE"
+        assert profile.busy_timeout_ms == 1234
+        assert profile.split_read_connections is False
+        assert profile.mmap_size == StorageProfile().mmap_size
+
+
+class TestSQLiteStorage:
+    """SQLiteStorage sınıfı için testler"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "test.db")
+        self.storage = SQLiteStorage(self.db_path, StorageProfile(busy_timeout_ms=2500))
+        with self.storage.write() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        self.storage.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pragmas_applied(self):
+        """Yazma bağlantısına PRAGMA ayarlarının uygulanması"""
+        with self.storage.write() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 2500
+
+    def test_read_connection_is_read_only(self):
+        """Okuma bağlantısı ile yazma yapılamaz"""
+        with self.storage.read() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO t (x) VALUES (1)")
+
+    def test_reader_sees_committed_writes(self):
+        """Yazma commit edildikten sonra okuyucu yeni veriyi görür"""
+        with self.storage.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        with self.storage.write() as conn:
+            conn.execute("INSERT INTO t (x) VALUES (1)")
+        with self.storage.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+    def test_write_rollback_on_error(self):
+        """Hata durumunda yazma geri alınır"""
+        with pytest.raises(RuntimeError):
+            with self.storage.write() as conn:
+                conn.execute("INSERT INTO t (x) VALUES (1)")
+                raise RuntimeError("hata")
+        with self.storage.read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_periodic_checkpoint(self):
+        """checkpoint_interval dolduğunda yazma sonrası checkpoint çalışır"""
+        storage = SQLiteStorage(self.db_path, StorageProfile(checkpoint_interval=0.000001))
+        try:
+            with storage.write() as conn:
+                conn.execute("INSERT INTO t (x) VALUES (1)")
+            assert storage.checkpoint_count == 1
+        finally:
+            storage.close()
+
+    def test_read_path_checkpoint(self):
+        """Yalnızca okuyan süreçte de aralık dolunca checkpoint çalışır; yazıcı meşgulse atlanır"""
+        import threading
+        storage = SQLiteStorage(self.db_path, StorageProfile(checkpoint_interval=0.000001))
+        try:
+            with storage.read() as conn:
+                conn.execute("SELECT COUNT(*) FROM t").fetchone()
+            assert storage.checkpoint_count == 1
+
+            held = threading.Event()
+            release = threading.Event()
+
+            def hold():
+                with storage.write():
+                    held.set()
+                    release.wait(5)
+
+            holder = threading.Thread(target=hold)
+            holder.start()
+            held.wait(5)
+            with storage.read() as conn:
+                conn.execute("SELECT COUNT(*) FROM t").fetchone()
+            release.set()
+            holder.join()
+            assert storage.checkpoint_count == 2  # yalnızca yazıcının kendi checkpoint'i
+        finally:
+            storage.close()
+
+    def test_dead_thread_reader_closed(self):
+        """Sonlanan thread'in okuma bağlantısı kapatılır ve listeden çıkarılır"""
+        import gc
+        import threading
+        opened = []
+
+        def read():
+            with self.storage.read() as conn:
+                conn.execute("SELECT COUNT(*) FROM t").fetchone()
+                opened.append(conn)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gc.collect()
+
+        assert self.storage._readers == []
+        with pytest.raises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+
+    def test_lock_wait_recorded(self):
+        """Yazma kilidini bekleyen thread'in bekleme süresi kaydedilir"""
+        import threading
+        import time
+        acquired = threading.Event()
+
+        def hold():
+            with self.storage.write():
+                acquired.set()
+                time.sleep(0.05)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        acquired.wait()
+        with self.storage.write() as conn:
+            conn.execute("INSERT INTO t (x) VALUES (1)")
+        holder.join()
+
+        stats = self.storage.lock_stats()
+        assert stats["writes"] == 3
+        assert stats["wait_max_ms"] >= 30
+
+
+class TestSQLiteBackends:
+    """Library ve UserManager'ın SQLite modunda depolama profili ile çalışması"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "app.db")
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_library_uses_wal(self):
+        """Library SQLite modunda WAL ile açılır ve CRUD çalışır"""
+        library = Library(os.path.join(self.temp_dir, "yok.json"), db_path=self.db_path)
+
+        assert library.add_book(Book("Test Kitap", "Test Yazar", "123-456-7890")) is True
+        assert library.find_book("1234567890").title == "Test Kitap"
+        assert library.update_book("1234567890", title="Yeni").title == "Yeni"
+        assert library.remove_book("1234567890") is True
+        with library._get_read_conn() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        library.storage.close()
+
+    def test_user_manager_rollback_profile(self):
+        """UserManager farklı bir profil ile (DELETE modu) çalışabilir"""
+        profile = StorageProfile(journal_mode="DELETE", split_read_connections=False)
+        manager = UserManager(os.path.join(self.temp_dir, "yok.json"), db_path=self.db_path, storage_profile=profile)
+
+        assert manager.get_user("admin") is not None
+        assert manager.create_user("ali", "sifre") is True
+        assert manager.verify_user("ali", "sifre") is not None
+        with manager._get_conn() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        manager.storage.close()
+
+
+    def test_user_manager_shares_library_storage(self):
+        """Aynı veritabanındaki Library ile UserManager tek depo (tek yazıcı ve kilit) kullanır"""
+        library = Library(os.path.join(self.temp_dir, "yok.json"), db_path=self.db_path)
+        manager = UserManager(os.path.join(self.temp_dir, "yok.json"),
+                              db_path=os.path.join(self.temp_dir, ".", "app.db"), library=library)
+        other = UserManager(os.path.join(self.temp_dir, "yok.json"),
+                            db_path=os.path.join(self.temp_dir, "diger.db"), library=library)
+        try:
+            assert manager.storage is library.storage
+            assert other.storage is not library.storage
+            library.add_book(Book("Test Kitap", "Test Yazar", "1234567890"))
+            assert manager.add_book_to_user_by_isbn("demo", "1234567890")["source"] == "catalog"
+        finally:
+            other.storage.close()
+            library.storage.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: benchmarks/stress_sqlite.py için testler (eşzamanlı SQLite yazmaları)
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from benchmarks.stress_sqlite import run, seed, verify, failed
+
+
+class TestStressSqlite:
+    """SQLite yazma yolları stres testleri"""
+
+    def test_concurrent_threads_no_errors(self):
+        """Paylaşılan örnekler üzerinde eşzamanlı yazmalar hatasız ve kayıpsız tamamlanır"""
+        report = run(workers=4, ops=60, mode="threads")
+
+        assert report["ops_completed"] == 4 * 60
+        assert report["errors"] == {"locked": 0, "other": 0}, report["error_samples"]
+        assert report["lost_updates"] == 0, report["lost_samples"]
+        assert report["lock_wait"]["writes"] > 0
+        assert failed(report) is False
+
+    def test_concurrent_processes_no_errors(self):
+        """Ayrı süreçler (ayrı bağlantılar) aynı dosyaya hatasız yazar"""
+        report = run(workers=2, ops=40, mode="processes")
+
+        assert report["errors"] == {"locked": 0, "other": 0}, report["error_samples"]
+        assert report["lost_updates"] == 0, report["lost_samples"]
+
+    def test_verify_detects_lost_update(self):
+        """Onaylanıp son durumda görünmeyen yazmalar kayıp güncelleme sayılır"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            db_path = os.path.join(temp_dir, "app.db")
+            seed(db_path, 1)
+            result = {"worker": 0, "marks": {"9780000000000": True}, "added": ["9791111111111"],
+                      "user_added": [], "registered": []}
+
+            lost = verify(db_path, [result])
+            assert len(lost) == 2
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_ci_mode_fails_on_errors(self):
+        """CI modunda tek bir hata bile başarısızlık sayılır"""
+        report = {"errors": {"locked": 1, "other": 0}, "lost_updates": 0}
+
+        assert failed(report) is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
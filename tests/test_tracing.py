@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test dosyası: tracing.py için testler
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from tracing import Span, SlowRequestLog, TracingMiddleware, span, current_span, traced_route_class, _current_span
+
+
+class TestSpans:
+    """Span ağacı testleri"""
+
+    def test_span_noop_without_trace(self):
+        """Aktif iz yokken span hiçbir şey yapmaz"""
+        with span("sqlite") as s:
+            assert s is None
+        assert current_span() is None
+
+    def test_span_tree(self):
+        """İç içe span'ler ağaç oluşturur"""
+        root = Span("request")
+        token = _current_span.set(root)
+        try:
+            with span("handler"):
+                with span("sqlite", statement="SELECT books"):
+                    pass
+        finally:
+            _current_span.reset(token)
+        root.finish()
+
+        data = root.to_dict()
+        assert data["children"][0]["name"] == "handler"
+        assert data["children"][0]["children"][0]["attrs"]["statement"] == "SELECT books"
+        assert data["duration_ms"] >= data["children"][0]["duration_ms"]
+
+
+class TestSlowRequestLog:
+    """Yavaş istek günlüğü testleri"""
+
+    def setup_method(self):
+        """Her test öncesi çalışır"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "slow.jsonl")
+
+    def teardown_method(self):
+        """Her test sonrası çalışır"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_threshold(self):
+        """Yalnızca eşiği aşan istekler yazılır"""
+        log = SlowRequestLog(self.path, threshold_ms=10_000)
+        root = Span("request")
+        root.finish()
+
+        assert log.maybe_record(root) is False
+        assert log.tail() == []
+
+    def test_request_span_breakdown(self):
+        """API isteği handler, sqlite ve serialize span'leri ile günlüğe yazılır"""
+        import api
+        log = SlowRequestLog(self.path, threshold_ms=0)
+        with patch.object(api.slow_log, "path", self.path), patch.object(api.slow_log, "threshold_ms", 0):
+            client = TestClient(api.app)
+            response = client.get("/books")
+            assert response.status_code == 200
+
+        entries = log.tail()
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["attrs"]["route"] == "/books"
+        assert entry["attrs"]["status"] == 200
+        handler = next(c for c in entry["children"] if c["name"] == "handler")
+        assert any(c["name"] == "sqlite" for c in handler["children"])
+        assert any(c["name"] == "serialize" for c in entry["children"])
+
+    def test_route_class_traces_sync_endpoint(self):
+        """Rota sınıfı thread havuzunda çalışan sync endpoint'i de handler span'i ile ölçer"""
+        from fastapi import FastAPI
+        app = FastAPI()
+        app.router.route_class = traced_route_class()
+
+        @app.get("/sync")
+        def sync_endpoint():
+            with span("sqlite"):
+                pass
+            return {"ok": True}
+
+        log = SlowRequestLog(self.path, threshold_ms=0)
+        client = TestClient(TracingMiddleware(app, slow_log=log))
+        assert client.get("/sync").json() == {"ok": True}
+        # OpenAPI şeması özgün endpoint imzasından üretilir
+        assert "/sync" in app.openapi()["paths"]
+
+        entry = log.tail()[0]
+        handler = next(c for c in entry["children"] if c["name"] == "handler")
+        assert handler["attrs"]["endpoint"] == "sync_endpoint"
+        assert [c["name"] for c in handler["children"]] == ["sqlite"]
+        assert any(c["name"] == "serialize" for c in entry["children"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,210 @@
+"""
+Hafif istek izleme (tracing) - istek başına span ağacı ve yavaş istek günlüğü (JSONL)
+"""
+
+import asyncio
+import copy
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+
+_current_span: ContextVar[Optional['Span']] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """Zamanlanmış bir işlem; alt span'leri ile birlikte bir ağaç oluşturur"""
+
+    __slots__ = ("name", "attrs", "start", "end", "children")
+
+    def __init__(self, name: str, attrs: Optional[dict] = None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List['Span'] = []
+
+    def child(self, name: str, **attrs) -> 'Span':
+        span = Span(name, attrs)
+        self.children.append(span)
+        return span
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000.0
+
+    def to_dict(self, origin: Optional[float] = None) -> dict:
+        origin = self.start if origin is None else origin
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000.0, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "attrs": self.attrs,
+            "children": [c.to_dict(origin) for c in self.children],
+        }
+
+
+def current_span() -> Optional[Span]:
+    """Aktif span (izlenen bir istek yoksa None)"""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """Aktif bir iz varsa alt span açar; yoksa hiçbir şey yapmaz"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attrs)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+
+class SlowRequestLog:
+    """Eşik süresini aşan isteklerin span ağacını JSONL dosyasına yazar"""
+
+    def __init__(self, path: str = "slow_requests.jsonl", threshold_ms: float = 500.0):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        self.recorded_count = 0
+
+    @classmethod
+    def from_env(cls) -> 'SlowRequestLog':
+        try:
+            threshold = float(os.environ.get("KUTUPHANE_SLOW_REQUEST_MS", "500"))
+        except ValueError:
+            threshold = 500.0
+        return cls(os.environ.get("KUTUPHANE_SLOW_LOG", "slow_requests.jsonl"), threshold)
+
+    def maybe_record(self, root: Span) -> bool:
+        if root.duration_ms < self.threshold_ms:
+            return False
+        entry = {"ts": time.time(), **root.to_dict()}
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                print(f"Yavaş istek günlüğü yazılamadı: {e}")
+                return False
+            self.recorded_count += 1
+        return True
+
+    def tail(self, limit: int = 20) -> List[dict]:
+        """Günlükteki son kayıtlar"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()[-limit:]
+        except FileNotFoundError:
+            return []
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+class TracingMiddleware:
+    """ASGI middleware: her HTTP isteği için kök span açar ve yavaşsa günlüğe yazar"""
+
+    def __init__(self, app, slow_log: SlowRequestLog, enabled: bool = True, exclude_paths: tuple = ()):
+        self.app = app
+        self.slow_log = slow_log
+        self.enabled = enabled
+        # Uzun süre açık kalan akışlar (ör. SSE) yavaş istek sayılmaz
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        root = Span("request", {"method": scope["method"], "path": scope["path"]})
+        token = _current_span.set(root)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.attrs["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            root.finish()
+            _current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.attrs["route"] = getattr(route, "path", None)
+            self.slow_log.maybe_record(root)
+
+
+_traced_route_class = None
+
+
+def _traced_call(call):
+    """Endpoint fonksiyonunu "handler" span'i ile sarar (async / sync türü korunur)"""
+    name = getattr(call, "__name__", "?")
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def traced(*args, **kwargs):
+            with span("handler", endpoint=name):
+                return await call(*args, **kwargs)
+    else:
+        # Sync endpoint'ler thread havuzunda, kopyalanan bağlamla (aktif span dahil) çalışır
+        @functools.wraps(call)
+        def traced(*args, **kwargs):
+            with span("handler", endpoint=name):
+                return call(*args, **kwargs)
+    return traced
+
+
+def traced_route_class():
+    """Endpoint çalıştırma ve yanıt oluşturma adımlarını span'lerle ayıran APIRoute alt sınıfı
+
+    FastAPI'nin iç fonksiyonlarına dokunulmaz: rota işleyicisi oluşturulurken endpoint
+    "handler" span'i ile sarılır; endpoint bittikten sonra yanıtın serileştirilip
+    oluşturulduğu süre "serialize" span'i olarak eklenir. FastAPI yalnızca bu fonksiyon
+    çağrıldığında yüklenir. Kullanım: app.router.route_class = traced_route_class()
+    """
+    global _traced_route_class
+    if _traced_route_class is not None:
+        return _traced_route_class
+    from fastapi.routing import APIRoute
+
+    class TracedRoute(APIRoute):
+        def get_route_handler(self):
+            original = self.dependant
+            # Rotanın kendi dependant'ı (OpenAPI vb. için) değiştirilmez; işleyici kopyayı kullanır
+            self.dependant = copy.copy(original)
+            self.dependant.call = _traced_call(original.call)
+            try:
+                handler = super().get_route_handler()
+            finally:
+                self.dependant = original
+
+            async def traced_handler(request):
+                parent = current_span()
+                response = await handler(request)
+                if parent is not None:
+                    done = next((c for c in reversed(parent.children) if c.name == "handler"), None)
+                    if done is not None and done.end is not None:
+                        serialize = parent.child("serialize")
+                        serialize.start = done.end
+                        serialize.finish()
+                return response
+
+            return traced_handler
+
+    _traced_route_class = TracedRoute
+    return TracedRoute